@@ -0,0 +1,221 @@
+"""Backtest engine benchmarks
+
+Runs the engine on synthetic daily bars and reports wall time per mode.
+
+Usage:
+    python benchmarks/bench_backtest.py --years 10 --symbols 50
+    python benchmarks/bench_backtest.py --symbols 3000 --memory-budget 256
+    python benchmarks/bench_backtest.py --symbols 20 --intraday
+    python benchmarks/bench_backtest.py --symbols 50 --portfolio
+    python benchmarks/bench_backtest.py --symbols 20 --profile
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from alpacadesk_engine.backtest.bar_store import BarStore
+from alpacadesk_engine.backtest.engine import BacktestEngine
+from alpacadesk_engine.backtest.profiler import BacktestProfile
+from alpacadesk_engine.backtest.universe import UniverseData
+from alpacadesk_engine.strategies.bollinger import BollingerBandStrategy
+from alpacadesk_engine.strategies.dual_ma import DualMovingAverageStrategy
+from alpacadesk_engine.strategies.mean_reversion import MeanReversionRSIStrategy
+from alpacadesk_engine.strategies.momentum import MomentumBreakoutStrategy
+
+
+def make_market_data(
+    symbols: List[str], start: str, periods: int, seed: int = 7
+) -> Dict[str, pd.DataFrame]:
+    """Generate random-walk OHLCV bars for each symbol"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(start=start, periods=periods)
+    market_data = {}
+
+    for symbol in symbols:
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, periods)))
+        spread = np.abs(rng.normal(0, 0.01, periods)) * close
+        market_data[symbol] = pd.DataFrame(
+            {
+                "open": close + rng.normal(0, 0.005, periods) * close,
+                "high": close + spread,
+                "low": close - spread,
+                "close": close,
+                "volume": rng.integers(500_000, 5_000_000, periods).astype(float),
+            },
+            index=index,
+        )
+
+    return market_data
+
+
+def make_minute_bars(
+    symbols: List[str], start: str, days: int, seed: int = 7
+) -> Dict[str, pd.DataFrame]:
+    """Generate random-walk 1-minute bars over regular sessions (09:30-16:00 New York)"""
+    rng = np.random.default_rng(seed)
+    sessions = pd.bdate_range(start=start, periods=days).tz_localize("America/New_York")
+    minutes = pd.to_timedelta(np.arange(9 * 60 + 30, 16 * 60), unit="min")
+    index = pd.DatetimeIndex(np.concatenate([day + minutes for day in sessions])).tz_convert("UTC")
+    periods = len(index)
+    market_data = {}
+
+    for symbol in symbols:
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0, 0.0008, periods)))
+        spread = np.abs(rng.normal(0, 0.0005, periods)) * close
+        market_data[symbol] = pd.DataFrame(
+            {
+                "open": close,
+                "high": close + spread,
+                "low": close - spread,
+                "close": close,
+                "volume": rng.integers(100, 10_000, periods).astype(float),
+            },
+            index=index,
+        )
+
+    return market_data
+
+
+def time_intraday(symbols: List[str], days: int) -> tuple[int, float]:
+    """Return (rows, wall seconds) for a 1-minute run streamed from a temporary BarStore"""
+    with tempfile.TemporaryDirectory() as root:
+        store = BarStore(root)
+        rows = 0
+        for symbol, bars in make_minute_bars(symbols, "2024-01-01", days).items():
+            store.write(symbol, "1min", bars)
+            rows += len(bars)
+
+        strategy = MomentumBreakoutStrategy(symbols, {})
+        started = time.perf_counter()
+        BacktestEngine().run_intraday(
+            strategy, store, "1min", datetime(2024, 1, 1), datetime(2024, 1, 1) + pd.Timedelta(days=days * 1.5)
+        )
+        return rows, time.perf_counter() - started
+
+
+def time_run(engine: BacktestEngine, strategy, market_data, start_date, end_date) -> float:
+    """Return wall time in seconds for one engine run"""
+    started = time.perf_counter()
+    engine.run(strategy, market_data, start_date, end_date)
+    return time.perf_counter() - started
+
+
+def time_portfolio(symbols: List[str], market_data, start_date, end_date) -> Dict[str, float]:
+    """Return wall time in seconds for four strategies run separately and as one portfolio"""
+    strategies = make_strategies(symbols)
+    timings = {}
+
+    started = time.perf_counter()
+    for strategy in strategies.values():
+        BacktestEngine().run(strategy, market_data, start_date, end_date)
+    timings["4 separate runs"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    BacktestEngine().run_portfolio(strategies, market_data, start_date, end_date)
+    timings["4-strategy portfolio"] = time.perf_counter() - started
+
+    return timings
+
+
+def print_profile(label: str, profile: BacktestProfile):
+    """Print a run's phases, most expensive first"""
+    print(f"Profile ({label}, {profile.total_seconds:.3f}s):")
+    phases = sorted(profile.phases.items(), key=lambda item: item[1].seconds, reverse=True)
+    for name, stats in phases + [("other", None)]:
+        seconds = stats.seconds if stats is not None else profile.other_seconds
+        share = seconds / profile.total_seconds * 100 if profile.total_seconds else 0.0
+        detail = f"{stats.calls:>6} calls  {stats.allocated_bytes / 2**20:8.1f} MB" if stats else ""
+        print(f"  {name:<20} {seconds:8.3f}s  {share:5.1f}%  {detail}".rstrip())
+
+
+def make_strategies(symbols: List[str]) -> Dict[str, object]:
+    """One instance of each built-in strategy, with its default parameters"""
+    return {
+        "momentum": MomentumBreakoutStrategy(symbols, {}),
+        "mean_reversion": MeanReversionRSIStrategy(symbols, {}),
+        "dual_ma": DualMovingAverageStrategy(symbols, {"fast_ma": 10, "slow_ma": 50}),
+        "bollinger": BollingerBandStrategy(symbols, {}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BacktestEngine modes")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument(
+        "--memory-budget", type=float, default=None,
+        help="Also run the float32 universe mode with this budget in MB",
+    )
+    parser.add_argument(
+        "--intraday", action="store_true",
+        help="Also run one year of 1-minute bars streamed from a BarStore",
+    )
+    parser.add_argument(
+        "--portfolio", action="store_true",
+        help="Also run four strategies separately and as one shared-cash portfolio",
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Also print the per-phase profile of a day-by-day and a vectorized run",
+    )
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i:03d}" for i in range(args.symbols)]
+    market_data = make_market_data(symbols, "2015-01-01", args.years * 252)
+    first_index = next(iter(market_data.values())).index
+    start_date = first_index[0].to_pydatetime()
+    end_date = first_index[-1].to_pydatetime()
+
+    strategy = MomentumBreakoutStrategy(symbols, {})
+
+    print(f"{args.symbols} symbols x {len(first_index)} days")
+
+    # Whole runs, so the strategies' own per-day work is timed along with history slicing
+    modes = [
+        ("copy", dict(zero_copy=False, vectorized=False)),
+        ("zero-copy", dict(zero_copy=True, vectorized=False)),
+        ("vectorized", dict(vectorized=True)),
+    ]
+    print(f"Full run:{'':<15}" + "".join(f"{label:>12}" for label, _ in modes))
+    for name, each in make_strategies(symbols).items():
+        timings = [
+            time_run(BacktestEngine(**kwargs), each, market_data, start_date, end_date)
+            for _, kwargs in modes
+        ]
+        print(f"  {name:<22}" + "".join(f"{elapsed:11.3f}s" for elapsed in timings))
+
+    if args.memory_budget is not None:
+        universe = UniverseData.from_market_data(market_data)
+        engine = BacktestEngine(memory_budget_mb=args.memory_budget)
+
+        started = time.perf_counter()
+        engine.run_universe(strategy, universe, start_date, end_date)
+        elapsed = time.perf_counter() - started
+
+        stats = engine.universe_stats
+        peak = f"{stats.peak_rss_mb:.0f} MB" if stats.peak_rss_mb is not None else "n/a"
+        print(f"  {'float32 universe':<20} {elapsed:8.3f}s  ({stats.chunks} chunks, peak RSS {peak})")
+
+    if args.intraday:
+        rows, elapsed = time_intraday(symbols, 252)
+        print(f"  {'1min intraday':<20} {elapsed:8.3f}s  ({rows:,} bars)")
+
+    if args.portfolio:
+        for label, elapsed in time_portfolio(symbols, market_data, start_date, end_date).items():
+            print(f"  {label:<20} {elapsed:8.3f}s")
+
+    if args.profile:
+        for label, vectorized in [("day-by-day", False), ("vectorized", True)]:
+            engine = BacktestEngine(vectorized=vectorized, profile=True)
+            engine.run(strategy, market_data, start_date, end_date)
+            print_profile(label, engine.profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Batch analysis benchmarks
+
+Times one scheduler tick per strategy: analyze() looping over symbols
+against analyze_batch() on a (bars x symbols) panel, and checks that both
+produce the same signals on every tick. Some symbols get a shorter
+history, so the panel's NaN padding is exercised.
+
+Usage:
+    python benchmarks/bench_batch.py --symbols 500 --ticks 50
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from bench_backtest import make_market_data
+
+from alpacadesk_engine.strategies.bollinger import BollingerBandStrategy
+from alpacadesk_engine.strategies.dual_ma import DualMovingAverageStrategy
+from alpacadesk_engine.strategies.mean_reversion import MeanReversionRSIStrategy
+from alpacadesk_engine.strategies.momentum import MomentumBreakoutStrategy
+from alpacadesk_engine.strategies.panel import BarPanel
+
+
+def signal_keys(signals):
+    return [(s.symbol, s.action, s.quantity) for s in signals]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch strategy evaluation")
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--lookback", type=int, default=100, help="Bars of history per tick")
+    parser.add_argument("--ticks", type=int, default=50)
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i:04d}" for i in range(args.symbols)]
+    market_data = make_market_data(symbols, "2015-01-01", args.lookback + args.ticks)
+    # Every tenth symbol listed later, with a third of the history
+    short = {s: args.lookback // 3 for s in symbols[::10]}
+
+    strategies = [
+        MomentumBreakoutStrategy(symbols, {}),
+        MeanReversionRSIStrategy(symbols, {"ma_period": 50}),
+        MeanReversionRSIStrategy(symbols, {"ma_period": 20, "rsi_method": "wilder"}),
+        DualMovingAverageStrategy(symbols, {"fast_ma": 10, "slow_ma": 30, "trend_ma": 50}),
+        BollingerBandStrategy(symbols, {}),
+    ]
+
+    print(f"{args.symbols} symbols, {args.lookback} bars lookback, {args.ticks} ticks")
+    for strategy in strategies:
+        full_time = batch_time = 0.0
+        mismatches = signal_count = 0
+
+        for tick in range(args.lookback, args.lookback + args.ticks):
+            history = {
+                s: df.iloc[tick - short.get(s, args.lookback):tick] for s, df in market_data.items()
+            }
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                expected = strategy.analyze(history, 1_000_000.0)
+                full_time += time.perf_counter() - started
+
+                started = time.perf_counter()
+                signals = strategy.analyze_batch(BarPanel(history), 1_000_000.0)
+                batch_time += time.perf_counter() - started
+
+            mismatches += signal_keys(expected) != signal_keys(signals)
+            signal_count += len(expected)
+
+        per_tick = 1e3 / args.ticks
+        print(
+            f"  {strategy.name:<22} analyze {full_time * per_tick:7.1f}ms/tick"
+            f"  batch {batch_time * per_tick:6.1f}ms/tick  {full_time / batch_time:5.1f}x"
+            f"  signals {signal_count}  mismatched ticks: {mismatches}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Shared indicator cache benchmarks
+
+Runs one analyze() tick for a set of strategies on overlapping watchlists,
+with and without the shared indicator cache, and checks that every
+distinct indicator is computed once per bar.
+
+Usage:
+    python benchmarks/bench_indicator_cache.py --strategies 20 --symbols 100
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from bench_backtest import make_market_data
+
+from alpacadesk_engine.indicators.cache import indicator_cache
+from alpacadesk_engine.strategies.bollinger import BollingerBandStrategy
+from alpacadesk_engine.strategies.dual_ma import DualMovingAverageStrategy
+from alpacadesk_engine.strategies.mean_reversion import MeanReversionRSIStrategy
+from alpacadesk_engine.strategies.momentum import MomentumBreakoutStrategy
+
+# Strategy variants cycled through; several share moving averages of close
+VARIANTS = [
+    (DualMovingAverageStrategy, {"fast_ma": 10, "slow_ma": 50}),
+    (MeanReversionRSIStrategy, {"ma_period": 50}),
+    (BollingerBandStrategy, {}),
+    (DualMovingAverageStrategy, {"fast_ma": 20, "slow_ma": 50}),
+    (MomentumBreakoutStrategy, {}),
+]
+
+
+def signal_keys(signals):
+    return [(s.symbol, s.action, s.quantity) for s in signals]
+
+
+def run_tick(strategies, market_data, share=True):
+    """One analyze() per strategy; share=False clears the cache before each"""
+    signals = []
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for strategy in strategies:
+            if not share:
+                indicator_cache.clear()
+            signals.append(signal_keys(strategy.analyze(market_data, 1_000_000.0)))
+    return time.perf_counter() - started, signals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared indicator cache")
+    parser.add_argument("--strategies", type=int, default=20)
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--watchlist", type=int, default=60, help="Symbols per strategy")
+    parser.add_argument("--lookback", type=int, default=250)
+    args = parser.parse_args()
+
+    universe = [f"SYM{i:04d}" for i in range(args.symbols)]
+    market_data = make_market_data(universe, "2015-01-01", args.lookback)
+
+    strategies = []
+    for i in range(args.strategies):
+        strategy_class, parameters = VARIANTS[i % len(VARIANTS)]
+        # Overlapping watchlists: each strategy takes a rotated slice of the universe
+        offset = (i * 7) % args.symbols
+        watchlist = [universe[(offset + k) % args.symbols] for k in range(args.watchlist)]
+        strategies.append(strategy_class(watchlist, dict(parameters)))
+
+    unshared_time, expected = run_tick(strategies, market_data, share=False)
+
+    indicator_cache.clear()
+    before = indicator_cache.stats()
+    cached_time, signals = run_tick(strategies, market_data)
+    after = indicator_cache.stats()
+    repeat_time, _ = run_tick(strategies, market_data)
+
+    misses = after["misses"] - before["misses"]
+    hits = after["hits"] - before["hits"]
+    print(f"{args.strategies} strategies x {args.watchlist} symbols from {args.symbols}, {args.lookback} bars")
+    print(f"  unshared        {unshared_time * 1e3:8.1f}ms")
+    print(f"  cached (cold)   {cached_time * 1e3:8.1f}ms  computed {misses}, shared {hits}")
+    print(f"  cached (warm)   {repeat_time * 1e3:8.1f}ms")
+    print(f"  entries {after['entries']}  {after['size_bytes'] / 1024:.0f} KiB  signals match: {signals == expected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Indicator library benchmarks
+
+Times each NumPy indicator against the equivalent pandas expression on a
+synthetic random-walk series and reports the largest difference between
+the two (relative to the pandas value, or absolute below 1), so a speedup never comes at the cost of a silently different
+result.
+
+Long series show throughput; short ones (a strategy's lookback window)
+show the per-call overhead that analyze() pays on every bar.
+
+Usage:
+    python benchmarks/bench_indicators.py --bars 100000 --repeat 5
+    python benchmarks/bench_indicators.py --bars 250 --repeat 50
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from alpacadesk_engine.indicators import momentum, moving_averages, trend, volatility, volume
+from alpacadesk_engine.indicators.rolling import rolling_max
+
+
+def seeded_ewm(s: pd.Series, period: int, alpha: float) -> pd.Series:
+    """ewm(adjust=False) seeded with the SMA of the first period valid values"""
+    first = s.index.get_loc(s.first_valid_index())
+    seeded = s.copy()
+    seeded.iloc[:first + period - 1] = np.nan
+    seeded.iloc[first + period - 1] = s.iloc[first:first + period].mean()
+    return seeded.ewm(alpha=alpha, adjust=False).mean()
+
+
+def pandas_true_range(df: pd.DataFrame) -> pd.Series:
+    prev_close = df["close"].shift(1)
+    tr = pd.concat(
+        [df["high"] - df["low"], (df["high"] - prev_close).abs(), (df["low"] - prev_close).abs()],
+        axis=1,
+    ).max(axis=1)
+    tr.iloc[0] = np.nan
+    return tr
+
+
+def pandas_rsi(close: pd.Series, period: int) -> pd.Series:
+    delta = close.diff()
+    gain = seeded_ewm(delta.clip(lower=0).where(delta.notna()), period, 1 / period)
+    loss = seeded_ewm((-delta).clip(lower=0).where(delta.notna()), period, 1 / period)
+    return 100 - 100 / (1 + gain / loss)
+
+
+def pandas_adx(df: pd.DataFrame, period: int) -> pd.Series:
+    up = df["high"].diff()
+    down = -df["low"].diff()
+    plus_dm = up.where((up > down) & (up > 0), 0.0).where(up.notna())
+    minus_dm = down.where((down > up) & (down > 0), 0.0).where(down.notna())
+    tr = seeded_ewm(pandas_true_range(df), period, 1 / period)
+    plus_di = 100 * seeded_ewm(plus_dm, period, 1 / period) / tr
+    minus_di = 100 * seeded_ewm(minus_dm, period, 1 / period) / tr
+    dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
+    return seeded_ewm(dx, period, 1 / period)
+
+
+def pandas_mfi(df: pd.DataFrame, period: int) -> pd.Series:
+    typical = (df["high"] + df["low"] + df["close"]) / 3
+    flow = typical * df["volume"]
+    change = typical.diff()
+    positive = flow.where(change > 0, 0.0).where(change.notna()).rolling(period).sum()
+    negative = flow.where(change < 0, 0.0).where(change.notna()).rolling(period).sum()
+    return 100 - 100 / (1 + positive / negative)
+
+
+def pandas_aroon_up(high: pd.Series, period: int) -> pd.Series:
+    return high.rolling(period + 1).apply(
+        lambda w: 100 * (period - np.argmax(w[::-1])) / period, raw=True
+    )
+
+
+def benchmarks(df: pd.DataFrame):
+    """(name, numpy call, pandas call) for every indicator; pandas None if it has no equivalent"""
+    high, low, close, vol = (df[c].to_numpy() for c in ("high", "low", "close", "volume"))
+    weights = np.arange(1, 21, dtype=np.float64)
+
+    return [
+        ("SMA(20)", lambda: moving_averages.sma(close, 20), lambda: df["close"].rolling(20).mean()),
+        ("EMA(20)", lambda: moving_averages.ema(close, 20), lambda: seeded_ewm(df["close"], 20, 2 / 21)),
+        (
+            "WMA(20)",
+            lambda: moving_averages.wma(close, 20),
+            lambda: df["close"].rolling(20).apply(lambda w: w @ weights / weights.sum(), raw=True),
+        ),
+        ("RSI(14)", lambda: momentum.rsi(close, 14), lambda: pandas_rsi(df["close"], 14)),
+        (
+            "MACD(12,26,9)",
+            lambda: momentum.macd(close).signal,
+            lambda: seeded_ewm(
+                seeded_ewm(df["close"], 12, 2 / 13) - seeded_ewm(df["close"], 26, 2 / 27), 9, 2 / 10
+            ),
+        ),
+        (
+            "Stochastic(14,3)",
+            lambda: momentum.stochastic(high, low, close).d,
+            lambda: (
+                100 * (df["close"] - df["low"].rolling(14).min())
+                / (df["high"].rolling(14).max() - df["low"].rolling(14).min())
+            ).rolling(3).mean(),
+        ),
+        ("ROC(10)", lambda: momentum.roc(close, 10), lambda: 100 * df["close"].pct_change(10)),
+        ("MFI(14)", lambda: momentum.mfi(high, low, close, vol, 14), lambda: pandas_mfi(df, 14)),
+        (
+            "Bollinger(20,2)",
+            lambda: volatility.bollinger(close, 20, 2.0).upper,
+            lambda: df["close"].rolling(20).mean() + 2 * df["close"].rolling(20).std(),
+        ),
+        (
+            "ATR(14)",
+            lambda: volatility.atr(high, low, close, 14),
+            lambda: seeded_ewm(pandas_true_range(df), 14, 1 / 14),
+        ),
+        (
+            "Keltner(20,2,10)",
+            lambda: volatility.keltner(high, low, close).upper,
+            lambda: seeded_ewm(df["close"], 20, 2 / 21)
+            + 2 * seeded_ewm(pandas_true_range(df), 10, 1 / 10),
+        ),
+        (
+            "OBV",
+            lambda: volume.obv(close, vol),
+            lambda: (np.sign(df["close"].diff()).fillna(0) * df["volume"]).cumsum(),
+        ),
+        (
+            "VWAP(20)",
+            lambda: volume.vwap(high, low, close, vol, period=20),
+            lambda: ((df["high"] + df["low"] + df["close"]) / 3 * df["volume"]).rolling(20).sum()
+            / df["volume"].rolling(20).sum(),
+        ),
+        ("ADX(14)", lambda: trend.adx(high, low, close, 14).adx, lambda: pandas_adx(df, 14)),
+        ("Aroon(25)", lambda: trend.aroon(high, low, 25).up, lambda: pandas_aroon_up(df["high"], 25)),
+        ("Parabolic SAR", lambda: trend.parabolic_sar(high, low), None),
+        ("Rolling max(20)", lambda: rolling_max(high, 20), lambda: df["high"].rolling(20).max()),
+    ]
+
+
+def best_of(fn, repeat: int, budget: float = 2.0):
+    """Fastest of repeat calls, stopping early once budget seconds are spent (slow apply() references)"""
+    best, spent = float("inf"), 0.0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best, spent = min(best, elapsed), spent + elapsed
+        if spent > budget:
+            break
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NumPy indicators against pandas")
+    parser.add_argument("--bars", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0, 0.01, args.bars)))
+    spread = close * rng.uniform(0.001, 0.02, args.bars)
+    df = pd.DataFrame({
+        "high": close + spread * rng.random(args.bars),
+        "low": close - spread * rng.random(args.bars),
+        "close": close,
+        "volume": rng.integers(100_000, 5_000_000, args.bars).astype(np.float64),
+    })
+
+    print(f"{args.bars} bars, best of {args.repeat}")
+    print(f"  {'indicator':<18} {'numpy':>10} {'pandas':>10} {'speedup':>8} {'max diff':>10}")
+    for name, numpy_fn, pandas_fn in benchmarks(df):
+        numpy_time, result = best_of(numpy_fn, args.repeat)
+        if pandas_fn is None:
+            print(f"  {name:<18} {numpy_time * 1000:8.2f}ms {'-':>10} {'-':>8} {'-':>10}")
+            continue
+
+        pandas_time, expected = best_of(pandas_fn, args.repeat)
+        expected = np.asarray(expected, dtype=np.float64)
+        if not np.array_equal(np.isnan(result), np.isnan(expected)):
+            diff = "NaN mismatch"
+        else:
+            error = np.abs(result - expected) / np.maximum(np.abs(expected), 1.0)
+            diff = f"{np.nanmax(error):.1e}"
+        print(
+            f"  {name:<18} {numpy_time * 1000:8.2f}ms {pandas_time * 1000:8.2f}ms"
+            f" {pandas_time / numpy_time:7.1f}x {diff:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Live evaluation benchmarks
+
+Times one scheduler tick per strategy: analyze() over the full lookback
+against analyze_live() on streaming indicator state, and checks that
+both produce the same signals on every tick.
+
+Usage:
+    python benchmarks/bench_live.py --symbols 50 --ticks 200
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from bench_backtest import make_market_data
+
+from alpacadesk_engine.strategies.base import bars_from_frame
+from alpacadesk_engine.strategies.bollinger import BollingerBandStrategy
+from alpacadesk_engine.strategies.dual_ma import DualMovingAverageStrategy
+from alpacadesk_engine.strategies.mean_reversion import MeanReversionRSIStrategy
+from alpacadesk_engine.strategies.momentum import MomentumBreakoutStrategy
+
+
+def signal_keys(signals):
+    return [(s.symbol, s.action, s.quantity) for s in signals]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark live strategy evaluation")
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--lookback", type=int, default=250, help="Bars of history per tick")
+    parser.add_argument("--ticks", type=int, default=200)
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i:04d}" for i in range(args.symbols)]
+    market_data = make_market_data(symbols, "2015-01-01", args.lookback + args.ticks)
+    frames = {symbol: bars_from_frame(df) for symbol, df in market_data.items()}
+
+    strategies = [
+        MomentumBreakoutStrategy(symbols, {}),
+        MeanReversionRSIStrategy(symbols, {"ma_period": 50}),
+        DualMovingAverageStrategy(symbols, {"fast_ma": 10, "slow_ma": 50}),
+        BollingerBandStrategy(symbols, {}),
+    ]
+
+    print(f"{args.symbols} symbols, {args.lookback} bars lookback, {args.ticks} ticks")
+    for strategy in strategies:
+        strategy.seed_live({s: df.iloc[:args.lookback] for s, df in market_data.items()})
+        full_time = live_time = 0.0
+        mismatches = 0
+
+        for tick in range(args.lookback, args.lookback + args.ticks):
+            history = {s: df.iloc[tick - args.lookback + 1:tick + 1] for s, df in market_data.items()}
+            # The bar that closed since the last tick, then the one being evaluated
+            new_bars = {s: bars[tick - 1:tick + 1] for s, bars in frames.items()}
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                expected = strategy.analyze(history, 1_000_000.0)
+                full_time += time.perf_counter() - started
+
+                started = time.perf_counter()
+                signals = strategy.analyze_live(new_bars, 1_000_000.0)
+                live_time += time.perf_counter() - started
+
+            mismatches += signal_keys(expected) != signal_keys(signals)
+
+        per_symbol = 1e6 / (args.ticks * args.symbols)
+        print(
+            f"  {strategy.name:<22} analyze {full_time * per_symbol:8.1f}us/symbol"
+            f"  live {live_time * per_symbol:6.1f}us/symbol"
+            f"  {full_time / live_time:6.0f}x  mismatched ticks: {mismatches}"
+        )
+
+
+if __name__ == "__main__":
+    main()
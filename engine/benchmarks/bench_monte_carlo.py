@@ -0,0 +1,41 @@
+"""Monte Carlo resampling benchmarks
+
+Times both resamplers on synthetic trades and daily returns.
+
+Usage:
+    python benchmarks/bench_monte_carlo.py --trades 500 --resamples 10000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from alpacadesk_engine.backtest.monte_carlo import block_bootstrap, bootstrap_trades
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Monte Carlo resampling")
+    parser.add_argument("--trades", type=int, default=500)
+    parser.add_argument("--days", type=int, default=1260)
+    parser.add_argument("--resamples", type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    pnl = rng.normal(50, 800, args.trades)
+    daily_returns = rng.normal(0.0004, 0.01, args.days)
+
+    print(f"{args.resamples} resamples")
+
+    started = time.perf_counter()
+    bootstrap_trades(pnl, 100000.0, args.resamples)
+    print(f"  {f'{args.trades} trades':<20} {time.perf_counter() - started:8.3f}s")
+
+    started = time.perf_counter()
+    result = block_bootstrap(daily_returns, args.resamples)
+    label = f"{args.days} days (block {result.block_size})"
+    print(f"  {label:<20} {time.perf_counter() - started:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
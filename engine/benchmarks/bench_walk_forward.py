@@ -0,0 +1,79 @@
+"""Walk-forward optimization benchmarks
+
+Runs the same walk-forward optimization twice: from generate_signals()
+signals, and with the engine's vectorized path off, from analyze()
+signals recorded once per candidate. Both must see the same history in
+every window, so each window's winner and metrics, and the stitched
+result, have to be identical.
+
+Usage:
+    python benchmarks/bench_walk_forward.py --symbols 10 --days 1000
+"""
+
+import argparse
+import contextlib
+import io
+import time
+from dataclasses import asdict
+
+from bench_backtest import make_market_data
+
+from alpacadesk_engine.backtest.walk_forward import WalkForwardOptimizer
+from alpacadesk_engine.strategies.dual_ma import DualMovingAverageStrategy
+from alpacadesk_engine.strategies.mean_reversion import MeanReversionRSIStrategy
+
+CASES = [
+    (DualMovingAverageStrategy, {"fast_ma": [5, 10, 20], "slow_ma": [30, 50]}),
+    (MeanReversionRSIStrategy, {"rsi_oversold": [25, 30, 35], "rsi_period": [10, 14]}),
+]
+
+
+def window_keys(result):
+    return [
+        (w.best_parameters, asdict(w.in_sample_metrics), asdict(w.out_sample_metrics))
+        for w in result.windows
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark walk-forward optimization")
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--days", type=int, default=1000)
+    parser.add_argument("--in-sample", type=int, default=252)
+    parser.add_argument("--out-sample", type=int, default=63)
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i:03d}" for i in range(args.symbols)]
+    market_data = make_market_data(symbols, "2015-01-01", args.days)
+    dates = market_data[symbols[0]].index
+    start_date, end_date = dates[0].to_pydatetime(), dates[-1].to_pydatetime()
+
+    print(f"{args.symbols} symbols, {args.days} days, {args.in_sample}/{args.out_sample} day windows")
+    for strategy_class, param_grid in CASES:
+        results = {}
+        for vectorized in (True, False):
+            optimizer = WalkForwardOptimizer(
+                strategy_class, symbols, engine_kwargs={"vectorized": vectorized}
+            )
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                result = optimizer.run(
+                    market_data, start_date, end_date, param_grid, args.in_sample, args.out_sample
+                )
+                elapsed = time.perf_counter() - started
+            results[vectorized] = (result, elapsed)
+
+        (vectorized, vectorized_time), (recorded, recorded_time) = results[True], results[False]
+        identical = (
+            window_keys(vectorized) == window_keys(recorded)
+            and asdict(vectorized.metrics) == asdict(recorded.metrics)
+        )
+        print(
+            f"  {strategy_class.__name__:<28} {len(vectorized.windows)} windows"
+            f"  generate_signals {vectorized_time:6.2f}s  analyze {recorded_time:6.2f}s"
+            f"  trades {vectorized.metrics.total_trades}  identical: {identical}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,12 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
+from dataclasses import asdict
+import math
 
+from ..backtest.metrics import snapshot_stats, returns, rolling_sharpe
+from ..utils.database import get_db
+from ..utils.models import PortfolioSnapshot
 from .auth import get_current_client
 
 router = APIRouter()
@@ -92,3 +97,39 @@ async def get_account_history():
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get account history: {str(e)}")
+
+
+@router.get("/performance")
+async def get_account_performance(limit: int = 756, rolling_window: int = 63):
+    """
+    Performance statistics over stored daily portfolio snapshots
+
+    Uses the same metrics as backtests, so live and simulated results
+    are directly comparable.
+    """
+    try:
+        with get_db() as db:
+            rows = (
+                db.query(PortfolioSnapshot)
+                .order_by(PortfolioSnapshot.snapshot_at.desc())
+                .limit(limit)
+                .all()
+            )
+            rows.reverse()
+
+            stats = snapshot_stats(rows)
+            equity = [row.equity for row in rows]
+            sharpe = rolling_sharpe(returns(equity), rolling_window)
+
+            return {
+                "snapshots": len(rows),
+                "metrics": asdict(stats),
+                "rolling_sharpe": [
+                    {"date": row.snapshot_at.isoformat(), "sharpe_ratio": value}
+                    for row, value in zip(rows[1:], sharpe.tolist())
+                    if not math.isnan(value)  # Skip the warm-up window
+                ],
+            }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get account performance: {str(e)}")
@@ -1,18 +1,74 @@
 """Backtesting API endpoints"""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime, timedelta
+import asyncio
+import json
+import numpy as np
 import pandas as pd
 
-from ..backtest.engine import BacktestEngine
+from ..backtest.bar_store import BarStore, INTRADAY_TIMEFRAMES, sessions
+from ..backtest.downsample import downsample_records
+from ..backtest.metrics import TRADING_DAYS_PER_YEAR, returns
+from ..backtest.monte_carlo import block_bootstrap, bootstrap_trades
+from ..services.backtest_cache import BacktestCache
+from ..services.backtest_jobs import ANALYSIS_KINDS, BacktestJobQueue, BacktestJobSpec
+from ..utils.database import get_db
+from ..utils.models import AnalysisResult as AnalysisResultModel, BacktestResult as BacktestResultModel
 from ..strategies.momentum import MomentumBreakoutStrategy
 from ..strategies.mean_reversion import MeanReversionRSIStrategy
+from ..strategies.dual_ma import DualMovingAverageStrategy
+from ..strategies.bollinger import BollingerBandStrategy
+from ..strategies.builder import RuleStrategy
 from .auth import get_current_client
 
 router = APIRouter()
 
+STRATEGY_TYPES = {
+    "momentum_breakout": MomentumBreakoutStrategy,
+    "mean_reversion_rsi": MeanReversionRSIStrategy,
+    "dual_moving_average": DualMovingAverageStrategy,
+    "bollinger_band": BollingerBandStrategy,
+    "custom_rules": RuleStrategy,
+}
+
+# Upper bound on grid size accepted by /sweep
+MAX_SWEEP_COMBINATIONS = 5000
+
+# Upper bound on grid size accepted by /optimize (most combinations only see a short range)
+MAX_OPTIMIZE_COMBINATIONS = 50000
+
+# Upper bound on paths per method accepted by /monte-carlo
+MAX_MONTE_CARLO_RESAMPLES = 100000
+
+# Equity points returned with a result unless the request asks otherwise;
+# longer curves (mostly intraday) are downsampled to this many
+DEFAULT_MAX_POINTS = 5000
+
+# Upper bound on equity points per page of /jobs/{job_id}/equity and /results/{result_id}/equity
+MAX_EQUITY_PAGE = 50000
+
+# Global job queue instance
+_job_queue: BacktestJobQueue = None
+
+
+def get_job_queue() -> BacktestJobQueue:
+    """Get or create the backtest job queue"""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = BacktestJobQueue(cache=BacktestCache())
+    return _job_queue
+
+
+def shutdown_job_queue():
+    """Stop the job queue's worker processes, if started"""
+    global _job_queue
+    if _job_queue is not None:
+        _job_queue.shutdown()
+        _job_queue = None
+
 
 class BacktestRequest(BaseModel):
     strategy_type: str
@@ -21,6 +77,9 @@ class BacktestRequest(BaseModel):
     start_date: str
     end_date: str
     initial_capital: float = 100000.0
+    timeframe: str = "1day"  # Or an intraday timeframe, e.g. '1min', '5min'
+    profile: bool = False  # Return time and allocations per engine phase
+    max_points: Optional[int] = DEFAULT_MAX_POINTS  # Equity points to return (None: every point)
 
 
 class BacktestResult(BaseModel):
@@ -37,112 +96,658 @@ class BacktestResult(BaseModel):
     sharpe_ratio: float
     max_consecutive_wins: int
     max_consecutive_losses: int
+    annualized_return: float
+    max_drawdown_duration_days: int
+    sortino_ratio: float
+    calmar_ratio: float
+    exposure_pct: float
+    turnover: float
+    equity_curve: List[Dict[str, Any]]  # Downsampled to max_points
+    equity_points: int  # Points in the full-resolution curve
+    profile: Optional[Dict[str, Any]] = None  # BacktestProfile, when requested
+
+
+class MonteCarloRequest(BacktestRequest):
+    resamples: int = 10000
+    block_size: Optional[int] = None  # Days per block (default: cube root of the length)
+    seed: Optional[int] = None
+
+
+class MonteCarloResponse(BaseModel):
+    metrics: Dict[str, Any]  # The backtest being resampled
+    trades: Optional[Dict[str, Any]]  # None with fewer than two closed trades
+    block_bootstrap: Optional[Dict[str, Any]]  # None with fewer than three bars
+
+
+class SweepRequest(BaseModel):
+    strategy_type: str
+    symbols: List[str]
+    parameters: Dict[str, Any] = {}  # Fixed parameters shared by every run
+    param_grid: Dict[str, List[Any]]
+    start_date: str
+    end_date: str
+    initial_capital: float = 100000.0
+    rank_by: str = "sharpe_ratio"
+    top_n: int = 50
+    max_workers: Optional[int] = None
+
+
+class SweepResponse(BaseModel):
+    combinations: int
+    evaluated: int
+    rank_by: str
+    results: List[Dict[str, Any]]
+
+
+class OptimizeRequest(SweepRequest):
+    eta: int = 3  # Keep the best 1/eta of candidates per rung
+    min_days: int = 63  # Trading days of the shortest rung
+
+
+class OptimizeResponse(BaseModel):
+    combinations: int
+    candidates: int  # Combinations that passed validate_parameters()
+    rank_by: str
+    budget_pct: float  # Trading days simulated, as a percent of a full grid's
+    rungs: List[Dict[str, Any]]
+    results: List[Dict[str, Any]]
+
+
+class WalkForwardRequest(BaseModel):
+    strategy_type: str
+    symbols: List[str]
+    parameters: Dict[str, Any] = {}  # Fixed parameters shared by every run
+    param_grid: Dict[str, List[Any]]
+    start_date: str
+    end_date: str
+    initial_capital: float = 100000.0
+    in_sample_days: int = 252
+    out_sample_days: int = 63
+    step_days: Optional[int] = None  # Defaults to out_sample_days; smaller steps are rejected
+    rank_by: str = "sharpe_ratio"
+
+
+class WalkForwardResponse(BaseModel):
+    metrics: Dict[str, Any]
+    windows: List[Dict[str, Any]]
     equity_curve: List[Dict[str, Any]]
 
 
+# Result model of each analysis job kind, served by /jobs/{job_id}/analysis
+ANALYSIS_RESPONSES = {
+    "sweep": SweepResponse,
+    "optimize": OptimizeResponse,
+    "walk_forward": WalkForwardResponse,
+}
+
+
 @router.post("/run", response_model=BacktestResult)
 async def run_backtest(request: BacktestRequest):
     """
     Run a backtest on historical data with realistic execution simulation
+
+    The backtest runs as a job in a worker process; this endpoint waits
+    for it without blocking other requests. Use /jobs to submit without
+    waiting.
     """
+    _check_max_points(request.max_points)
+
     try:
-        # Get authenticated client
-        client = get_current_client()
-
-        # Parse dates
-        start_date = datetime.fromisoformat(request.start_date)
-        end_date = datetime.fromisoformat(request.end_date)
-
-        # Create strategy instance
-        strategy = _create_strategy(
-            request.strategy_type,
-            request.symbols,
-            request.parameters
-        )
+        queue = get_job_queue()
+        job = _submit_job(queue, request)
+        job = await queue.wait(job.id)
 
-        if strategy is None:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unknown strategy type: {request.strategy_type}"
-            )
+        if job.status != "completed":
+            raise HTTPException(status_code=500, detail=f"Backtest failed: {job.error or job.status}")
 
-        # Fetch historical data
-        market_data = {}
-        for symbol in request.symbols:
-            try:
-                bars = client.get_bars(
-                    symbol=symbol,
-                    timeframe="1day",
-                    start=start_date - timedelta(days=200),  # Extra data for indicators
-                    end=end_date
-                )
+        return _backtest_result(job.result, request.max_points)
 
-                if bars:
-                    df = pd.DataFrame(bars)
-                    df["timestamp"] = pd.to_datetime(df["timestamp"])
-                    df.set_index("timestamp", inplace=True)
-                    market_data[symbol] = df
-                else:
-                    raise Exception(f"No data available for {symbol}")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Backtest failed: {str(e)}")
 
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to fetch data for {symbol}: {str(e)}"
-                )
 
-        # Create backtest engine
-        engine = BacktestEngine(
-            initial_capital=request.initial_capital,
-            slippage_pct=0.05,  # 0.05% average slippage
-        )
+@router.post("/monte-carlo", response_model=MonteCarloResponse)
+async def run_monte_carlo(request: MonteCarloRequest):
+    """
+    Run a backtest, then resample it to gauge how much its result owes to luck
 
-        # Run backtest
-        metrics, equity_curve = engine.run(
-            strategy=strategy,
-            market_data=market_data,
-            start_date=start_date,
-            end_date=end_date
+    Returns distributions of total return, max drawdown and Sharpe over
+    request.resamples paths from each of two methods: reordering closed
+    trades with replacement, and a circular block bootstrap of daily
+    returns. The backtest itself is served from the cache when possible.
+    """
+    if not 1 <= request.resamples <= MAX_MONTE_CARLO_RESAMPLES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"resamples must be between 1 and {MAX_MONTE_CARLO_RESAMPLES}"
         )
 
-        # Format result
-        result = BacktestResult(
-            total_return=metrics.total_return,
-            buy_and_hold_return=metrics.buy_and_hold_return,
-            max_drawdown=metrics.max_drawdown,
-            win_rate=metrics.win_rate,
-            total_trades=metrics.total_trades,
-            winning_trades=metrics.winning_trades,
-            losing_trades=metrics.losing_trades,
-            avg_win=metrics.avg_win,
-            avg_loss=metrics.avg_loss,
-            avg_trade_duration_days=metrics.avg_trade_duration_days,
-            sharpe_ratio=metrics.sharpe_ratio,
-            max_consecutive_wins=metrics.max_consecutive_wins,
-            max_consecutive_losses=metrics.max_consecutive_losses,
-            equity_curve=equity_curve,
+    try:
+        queue = get_job_queue()
+        job = _submit_job(queue, request)
+        job = await queue.wait(job.id)
+
+        if job.status != "completed":
+            raise HTTPException(status_code=500, detail=f"Backtest failed: {job.error or job.status}")
+
+        return await asyncio.to_thread(_monte_carlo, request, job.result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Monte Carlo analysis failed: {str(e)}")
+
+
+@router.post("/jobs")
+async def submit_backtest_job(request: BacktestRequest):
+    """
+    Submit a backtest to run in the background
+
+    Returns the job id to poll with /jobs/{job_id}.
+    """
+    try:
+        job = _submit_job(get_job_queue(), request)
+        return job.to_dict()
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to submit backtest: {str(e)}")
+
+
+@router.get("/jobs")
+async def list_backtest_jobs():
+    """List queued, running and recently finished jobs"""
+    return {"jobs": [job.to_dict() for job in get_job_queue().all_jobs()]}
+
+
+@router.get("/jobs/{job_id}")
+async def get_backtest_job(job_id: str):
+    """Get the status of a job"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+    return job.to_dict()
+
+
+@router.websocket("/jobs/{job_id}/ws")
+async def stream_backtest_job(websocket: WebSocket, job_id: str):
+    """
+    Stream a job's progress
+
+    Sends {"type": "progress", percent, date, equity, total_return,
+    max_drawdown, total_trades, win_rate, equity_curve} at most every
+    progress interval, then one message with the final status
+    ("completed", "failed" or "cancelled") before closing.
+    """
+    await websocket.accept()
+
+    queue = get_job_queue()
+    if queue.get(job_id) is None:
+        await websocket.send_json({"type": "error", "message": f"Job not found: {job_id}"})
+        await websocket.close()
+        return
+
+    updates = queue.subscribe(job_id)
+    try:
+        while True:
+            message = await updates.get()
+            if message is None:
+                break
+            await websocket.send_json(message)
+
+        await websocket.close()
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        queue.unsubscribe(job_id, updates)
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_backtest_job(job_id: str):
+    """Cancel a job that has not finished"""
+    queue = get_job_queue()
+    job = queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+    if not queue.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
+
+    return {"success": True, "job_id": job_id}
+
+
+@router.get("/jobs/{job_id}/result", response_model=BacktestResult)
+async def get_backtest_job_result(job_id: str, max_points: Optional[int] = DEFAULT_MAX_POINTS):
+    """
+    Get the result of a completed job
+
+    The equity curve is downsampled to max_points; page through the full
+    resolution with /jobs/{job_id}/equity.
+    """
+    _check_max_points(max_points)
+    job = _completed_job(job_id)
+    return _backtest_result(job.result, max_points)
+
+
+@router.get("/jobs/{job_id}/equity")
+async def get_backtest_job_equity(job_id: str, offset: int = 0, limit: int = DEFAULT_MAX_POINTS):
+    """Page through the full-resolution equity curve of a completed job"""
+    job = _completed_job(job_id)
+    return _equity_page(job.result["equity_curve"], offset, limit)
+
+
+@router.get("/cache")
+def get_cache_stats():
+    """Backtest result cache size and hit counts"""
+    return get_job_queue().cache.stats()
+
+
+@router.delete("/cache")
+def clear_cache():
+    """Drop every cached backtest result"""
+    return {"success": True, "removed": get_job_queue().cache.clear()}
+
+
+@router.get("/results/{result_id}")
+def get_saved_result(result_id: int, max_points: Optional[int] = DEFAULT_MAX_POINTS):
+    """
+    Get a backtest persisted to the database
+
+    The equity curve is downsampled to max_points; page through the full
+    resolution with /results/{result_id}/equity.
+    """
+    _check_max_points(max_points)
+
+    with get_db() as db:
+        row = db.get(BacktestResultModel, result_id)
+        if row is None:
+            raise HTTPException(status_code=404, detail=f"Backtest result not found: {result_id}")
+
+        return {
+            "id": row.id,
+            "strategy_type": row.strategy_type,
+            "symbols": json.loads(row.symbols),
+            "start_date": row.start_date.isoformat(),
+            "end_date": row.end_date.isoformat(),
+            "initial_capital": row.initial_capital,
+            "total_return": row.total_return,
+            "buy_and_hold_return": row.buy_and_hold_return,
+            "max_drawdown": row.max_drawdown,
+            "sharpe_ratio": row.sharpe_ratio,
+            "win_rate": row.win_rate,
+            "total_trades": row.total_trades,
+            "winning_trades": row.winning_trades,
+            "losing_trades": row.losing_trades,
+            "avg_win": row.avg_win,
+            "avg_loss": row.avg_loss,
+            "avg_trade_duration_days": row.avg_trade_duration_days,
+            "max_consecutive_wins": row.max_consecutive_wins,
+            "max_consecutive_losses": row.max_consecutive_losses,
+            **_equity_curve(row.get_equity_curve_list(), max_points),
+            "profile": row.get_profile(),
+            "created_at": row.created_at.isoformat(),
+        }
+
+
+@router.get("/results/{result_id}/equity")
+def get_saved_result_equity(result_id: int, offset: int = 0, limit: int = DEFAULT_MAX_POINTS):
+    """Page through the full-resolution equity curve of a persisted backtest"""
+    with get_db() as db:
+        row = db.get(BacktestResultModel, result_id)
+        if row is None:
+            raise HTTPException(status_code=404, detail=f"Backtest result not found: {result_id}")
+
+        return _equity_page(row.get_equity_curve_list(), offset, limit)
+
+
+@router.post("/sweep")
+async def run_sweep(request: SweepRequest):
+    """
+    Backtest every combination of a parameter grid in parallel
+
+    Submits the sweep as a job and returns its id. Runs are spread over a
+    process pool sharing one copy of the market data; the results, ranked
+    by the requested metric, are at /jobs/{job_id}/analysis once done.
+    """
+    _check_grid_size(request.param_grid, MAX_SWEEP_COMBINATIONS)
+
+    try:
+        job = _submit_analysis(
+            get_job_queue(), "sweep", request, {"top_n": request.top_n, "max_workers": request.max_workers}
         )
+        return job.to_dict()
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to submit sweep: {str(e)}")
 
-        return result
+
+@router.post("/optimize")
+async def run_optimize(request: OptimizeRequest):
+    """
+    Search a parameter grid by successive halving
+
+    Submits the search as a job and returns its id. Every valid
+    combination is scored on a short recent range, and only the best
+    fraction is promoted to longer ranges; the survivors, with full-range
+    metrics and ranked, are at /jobs/{job_id}/analysis once done. Accepts
+    far larger grids than /sweep.
+    """
+    _check_grid_size(request.param_grid, MAX_OPTIMIZE_COMBINATIONS)
+
+    try:
+        job = _submit_analysis(get_job_queue(), "optimize", request, {
+            "top_n": request.top_n,
+            "max_workers": request.max_workers,
+            "eta": request.eta,
+            "min_days": request.min_days,
+        })
+        return job.to_dict()
 
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Backtest failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to submit optimization: {str(e)}")
+
+
+@router.post("/walk-forward")
+async def run_walk_forward(request: WalkForwardRequest):
+    """
+    Walk-forward optimization: optimize on rolling in-sample windows and
+    report the stitched out-of-sample performance
+
+    Submits the analysis as a job and returns its id; the result is at
+    /jobs/{job_id}/analysis once done.
+    """
+    try:
+        job = _submit_analysis(get_job_queue(), "walk_forward", request, {
+            "in_sample_days": request.in_sample_days,
+            "out_sample_days": request.out_sample_days,
+            "step_days": request.step_days,
+        })
+        return job.to_dict()
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to submit walk-forward: {str(e)}")
+
+
+@router.get("/jobs/{job_id}/analysis")
+async def get_analysis_job_result(job_id: str):
+    """Get the result of a completed sweep, optimization or walk-forward job"""
+    job = _completed_job(job_id, analysis=True)
+    return ANALYSIS_RESPONSES[job.spec.kind](**job.result)
+
+
+@router.get("/analyses/{analysis_id}")
+def get_saved_analysis(analysis_id: int):
+    """Get a sweep, optimization or walk-forward analysis persisted to the database"""
+    with get_db() as db:
+        row = db.get(AnalysisResultModel, analysis_id)
+        if row is None:
+            raise HTTPException(status_code=404, detail=f"Analysis not found: {analysis_id}")
+
+        return {
+            "id": row.id,
+            "kind": row.kind,
+            "strategy_type": row.strategy_type,
+            "symbols": json.loads(row.symbols),
+            "start_date": row.start_date.isoformat(),
+            "end_date": row.end_date.isoformat(),
+            "initial_capital": row.initial_capital,
+            "parameters": json.loads(row.parameters),
+            "options": json.loads(row.options),
+            "result": row.get_result_dict(),
+            "created_at": row.created_at.isoformat(),
+        }
+
+
+def _submit_job(queue: BacktestJobQueue, request: BacktestRequest):
+    """Validate a backtest request and queue it"""
+    strategy_class = STRATEGY_TYPES.get(request.strategy_type)
+    if strategy_class is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown strategy type: {request.strategy_type}"
+        )
+
+    intraday = request.timeframe in INTRADAY_TIMEFRAMES
+    if request.timeframe != "1day" and not intraday:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported timeframe: {request.timeframe}"
+        )
+
+    client = get_current_client()
+
+    end_date = datetime.fromisoformat(request.end_date)
+    if intraday and end_date.time() == datetime.min.time():
+        # A bare end date includes that day's bars
+        end_date += timedelta(days=1) - timedelta(microseconds=1)
+
+    spec = BacktestJobSpec(
+        strategy_type=request.strategy_type,
+        strategy_class=strategy_class,
+        symbols=request.symbols,
+        parameters=request.parameters,
+        start_date=datetime.fromisoformat(request.start_date),
+        end_date=end_date,
+        initial_capital=request.initial_capital,
+        slippage_pct=0.05,  # 0.05% average slippage
+        timeframe=request.timeframe,
+        profile=request.profile,
+    )
+
+    if intraday:
+        return queue.submit(
+            spec,
+            lambda: _sync_bar_store(client, spec.symbols, spec.timeframe, spec.start_date, spec.end_date),
+        )
 
+    return queue.submit(
+        spec,
+        lambda: _fetch_market_data(client, spec.symbols, spec.start_date, spec.end_date),
+    )
 
-def _create_strategy(strategy_type: str, symbols: List[str], parameters: Dict[str, Any]):
-    """Create strategy instance based on type"""
-    strategy_map = {
-        "momentum_breakout": MomentumBreakoutStrategy,
-        "mean_reversion_rsi": MeanReversionRSIStrategy,
+
+def _submit_analysis(
+    queue: BacktestJobQueue,
+    kind: str,
+    request: Union[SweepRequest, WalkForwardRequest],
+    options: Dict[str, Any],
+):
+    """Validate a sweep, optimization or walk-forward request and queue it"""
+    strategy_class = STRATEGY_TYPES.get(request.strategy_type)
+    if strategy_class is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown strategy type: {request.strategy_type}"
+        )
+
+    client = get_current_client()
+
+    spec = BacktestJobSpec(
+        strategy_type=request.strategy_type,
+        strategy_class=strategy_class,
+        symbols=request.symbols,
+        parameters=request.parameters,
+        start_date=datetime.fromisoformat(request.start_date),
+        end_date=datetime.fromisoformat(request.end_date),
+        initial_capital=request.initial_capital,
+        slippage_pct=0.05,  # 0.05% average slippage
+        kind=kind,
+        options={"param_grid": request.param_grid, "rank_by": request.rank_by, **options},
+    )
+
+    return queue.submit(
+        spec,
+        lambda: _fetch_market_data(client, spec.symbols, spec.start_date, spec.end_date),
+    )
+
+
+def _check_grid_size(param_grid: Dict[str, List[Any]], limit: int):
+    """Reject a parameter grid with more than limit combinations"""
+    combinations = 1
+    for values in param_grid.values():
+        combinations *= len(values)
+    if combinations > limit:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Parameter grid has {combinations} combinations (max {limit})"
+        )
+
+
+def _monte_carlo(request: MonteCarloRequest, result: Dict[str, Any]) -> MonteCarloResponse:
+    """Resample a completed backtest job's trades and equity curve"""
+    curve = result["equity_curve"]
+    equity = np.array([point["equity"] for point in curve], dtype=np.float64)
+
+    # Annualize as the engine does: by bars per session for intraday curves
+    periods_per_year = float(TRADING_DAYS_PER_YEAR)
+    if request.timeframe != "1day" and curve:
+        days = sessions(pd.DatetimeIndex([point["date"] for point in curve]))
+        periods_per_year *= len(curve) / max(days, 1)
+
+    trades = None
+    pnl = result.get("trade_pnl", [])
+    if len(pnl) >= 2:
+        years = len(curve) / periods_per_year
+        trades = bootstrap_trades(
+            pnl, request.initial_capital, request.resamples,
+            trades_per_year=len(pnl) / years, seed=request.seed,
+        ).to_dict()
+
+    blocks = None
+    if len(equity) >= 3:
+        blocks = block_bootstrap(
+            returns(equity), request.resamples, request.block_size, periods_per_year, request.seed
+        ).to_dict()
+
+    return MonteCarloResponse(metrics=result["metrics"], trades=trades, block_bootstrap=blocks)
+
+
+def _check_max_points(max_points: Optional[int]):
+    """Reject a max_points that LTTB cannot honour"""
+    if max_points is not None and max_points < 3:
+        raise HTTPException(status_code=400, detail="max_points must be at least 3")
+
+
+def _completed_job(job_id: str, analysis: bool = False):
+    """Look up a completed backtest (or analysis) job, or raise the matching HTTP error"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+
+    if (job.spec.kind in ANALYSIS_KINDS) != analysis:
+        raise HTTPException(status_code=409, detail=f"Job is a {job.spec.kind} job")
+
+    return job
+
+
+def _equity_curve(curve: List[Dict[str, Any]], max_points: Optional[int]) -> Dict[str, Any]:
+    """Response fields for an equity curve downsampled to max_points"""
+    return {
+        "equity_curve": curve if max_points is None else downsample_records(curve, max_points),
+        "equity_points": len(curve),
+    }
+
+
+def _backtest_result(result: Dict[str, Any], max_points: Optional[int]) -> BacktestResult:
+    """Response model of a completed backtest job's result"""
+    return BacktestResult(
+        **result["metrics"],
+        **_equity_curve(result["equity_curve"], max_points),
+        profile=result.get("profile"),
+    )
+
+
+def _equity_page(curve: List[Dict[str, Any]], offset: int, limit: int) -> Dict[str, Any]:
+    """One page of a full-resolution equity curve"""
+    if offset < 0 or not 1 <= limit <= MAX_EQUITY_PAGE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"offset must be at least 0 and limit between 1 and {MAX_EQUITY_PAGE}"
+        )
+
+    return {
+        "total": len(curve),
+        "offset": offset,
+        "limit": limit,
+        "equity_curve": curve[offset:offset + limit],
     }
 
-    strategy_class = strategy_map.get(strategy_type)
-    if strategy_class:
-        return strategy_class(symbols, parameters)
 
-    return None
+def _fetch_market_data(
+    client, symbols: List[str], start_date: datetime, end_date: datetime
+) -> Dict[str, pd.DataFrame]:
+    """Fetch daily bars for each symbol, with extra history for indicators"""
+    market_data = {}
+    for symbol in symbols:
+        try:
+            bars = client.get_bars(
+                symbol=symbol,
+                timeframe="1day",
+                start=start_date - timedelta(days=200),  # Extra data for indicators
+                end=end_date
+            )
+
+            if bars:
+                market_data[symbol] = _bars_frame(bars)
+            else:
+                raise Exception(f"No data available for {symbol}")
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to fetch data for {symbol}: {str(e)}"
+            )
+
+    return market_data
+
+
+def _sync_bar_store(
+    client, symbols: List[str], timeframe: str, start_date: datetime, end_date: datetime
+) -> BarStore:
+    """Download the months of intraday bars missing from the local bar store"""
+    store = BarStore()
+    for symbol in symbols:
+        for month in store.missing_months(symbol, timeframe, start_date, end_date):
+            month_start = datetime.strptime(month, "%Y-%m")
+            month_end = (month_start + timedelta(days=32)).replace(day=1)
+
+            try:
+                bars = client.get_bars(symbol=symbol, timeframe=timeframe, start=month_start, end=month_end)
+            except Exception as e:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to fetch data for {symbol}: {str(e)}"
+                )
+
+            if bars:
+                store.write(symbol, timeframe, _bars_frame(bars))
+
+        if not store.months(symbol, timeframe):
+            raise HTTPException(status_code=500, detail=f"No data available for {symbol}")
+
+    return store
+
+
+def _bars_frame(bars: List[Dict[str, Any]]) -> pd.DataFrame:
+    """OHLCV DataFrame indexed by timestamp from broker bar dicts"""
+    df = pd.DataFrame(bars)
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    df.set_index("timestamp", inplace=True)
+    return df
 
 
 @router.get("/templates")
@@ -38,6 +38,7 @@ class SchedulerStrategyRequest(BaseModel):
     symbols: List[str]
     parameters: Dict[str, Any]
     interval_seconds: int = 60
+    live: bool = True
 
 
 @router.post("/add-strategy")
@@ -54,6 +55,7 @@ async def add_strategy(request: SchedulerStrategyRequest):
             symbols=request.symbols,
             parameters=request.parameters,
             interval_seconds=request.interval_seconds,
+            live=request.live,
         )
 
         return {"success": True, "message": f"Strategy {request.strategy_id} added"}
@@ -161,6 +161,7 @@ async def list_strategy_templates():
                 "rsi_oversold": 30,
                 "rsi_overbought": 70,
                 "ma_period": 200,
+                "rsi_method": "sma",
                 "position_size_pct": 10,
             },
             "typical_trades_per_month": "10-25",
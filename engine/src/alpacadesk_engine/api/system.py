@@ -1,6 +1,7 @@
 """System and monitoring API endpoints"""
 
 from fastapi import APIRouter
+from ..indicators.cache import indicator_cache
 from ..utils.rate_limiter import rate_limiter
 
 router = APIRouter()
@@ -14,6 +15,22 @@ async def get_rate_limits():
     return rate_limiter.get_status()
 
 
+@router.get("/indicator-cache")
+async def get_indicator_cache_stats():
+    """
+    Get hit/miss statistics and memory use of the shared indicator cache
+    """
+    return indicator_cache.stats()
+
+
+@router.delete("/indicator-cache")
+async def clear_indicator_cache():
+    """
+    Drop all cached indicator results
+    """
+    return {"success": True, "removed": indicator_cache.clear()}
+
+
 @router.get("/health-detailed")
 async def get_detailed_health():
     """
@@ -31,4 +48,5 @@ async def get_detailed_health():
             "memory_percent": psutil.virtual_memory().percent,
         },
         "rate_limits": rate_limiter.get_status(),
+        "indicator_cache": indicator_cache.stats(),
     }
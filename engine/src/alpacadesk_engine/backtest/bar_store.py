@@ -0,0 +1,180 @@
+"""Date-partitioned local store of intraday bars"""
+
+import os
+import tempfile
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+# Timeframes served from the store rather than fetched whole
+INTRADAY_TIMEFRAMES = ("1min", "5min", "15min", "1hour")
+
+# Trading sessions are counted in exchange time
+MARKET_TZ = "America/New_York"
+
+
+class BarStore:
+    """
+    Bars on disk, one .npz partition per timeframe, symbol and month
+
+    Layout: <root>/<timeframe>/<SYMBOL>/<YYYY-MM>.npz, each holding an
+    int64 timestamp column (UTC nanoseconds) and float64 OHLCV columns.
+    Months are UTC months. Backtests read the store one month at a time,
+    so memory stays proportional to a single partition.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.path.join(os.path.expanduser("~"), ".alpacadesk", "bars")
+
+    def path(self, symbol: str, timeframe: str, month: str) -> str:
+        return os.path.join(self.root, timeframe, symbol, f"{month}.npz")
+
+    def months(self, symbol: str, timeframe: str) -> List[str]:
+        """Stored partitions of a symbol, oldest first"""
+        directory = os.path.join(self.root, timeframe, symbol)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(directory) if name.endswith(".npz"))
+
+    def missing_months(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_date: datetime,
+        end_date: datetime,
+        now: Optional[datetime] = None,
+    ) -> List[str]:
+        """Months in range that are not stored yet, plus the current month (still growing)"""
+        current = _utc(now or datetime.utcnow()).strftime("%Y-%m")
+        stored = set(self.months(symbol, timeframe))
+        return [m for m in month_range(start_date, end_date) if m not in stored or m == current]
+
+    def write(self, symbol: str, timeframe: str, bars: pd.DataFrame):
+        """
+        Merge OHLCV bars into the store
+
+        Bars replace stored bars with the same timestamp. A naive index is
+        taken to be UTC. Each partition is replaced atomically.
+        """
+        if bars.empty:
+            return
+
+        index = _utc_index(bars.index).as_unit("ns")
+        stamps = index.asi8
+        keys = index.year * 100 + index.month
+
+        for key in np.unique(keys):
+            rows = keys == key
+            month = f"{key // 100:04d}-{key % 100:02d}"
+            new = {"timestamp": stamps[rows]}
+            new.update({f: bars[f].to_numpy(dtype=np.float64)[rows] for f in FIELDS})
+
+            old = self._load(symbol, timeframe, month)
+            if old is not None:
+                keep = ~np.isin(old["timestamp"], new["timestamp"])
+                new = {f: np.concatenate([old[f][keep], new[f]]) for f in new}
+
+            order = np.argsort(new["timestamp"], kind="stable")
+            self._save(symbol, timeframe, month, {f: v[order] for f, v in new.items()})
+
+    def read(
+        self,
+        symbol: str,
+        timeframe: str,
+        month: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Optional[pd.DataFrame]:
+        """One partition's bars within [start_date, end_date], or None if absent or empty"""
+        columns = self._load(symbol, timeframe, month)
+        if columns is None:
+            return None
+
+        stamps = columns["timestamp"]
+        start = 0 if start_date is None else stamps.searchsorted(_utc(start_date).value, side="left")
+        end = len(stamps) if end_date is None else stamps.searchsorted(_utc(end_date).value, side="right")
+        if start >= end:
+            return None
+
+        index = pd.DatetimeIndex(stamps[start:end].astype("M8[ns]")).tz_localize("UTC")
+        return pd.DataFrame({f: columns[f][start:end] for f in FIELDS}, index=index)
+
+    def iter_chunks(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Iterator[Dict[str, pd.DataFrame]]:
+        """
+        Bars in [start_date, end_date] one month at a time
+
+        Yields:
+            Dict mapping symbol to that month's bars, for months in which
+            at least one symbol has bars
+        """
+        for month in month_range(start_date, end_date):
+            chunk = {}
+            for symbol in symbols:
+                bars = self.read(symbol, timeframe, month, start_date, end_date)
+                if bars is not None:
+                    chunk[symbol] = bars
+            if chunk:
+                yield chunk
+
+    def _load(self, symbol: str, timeframe: str, month: str) -> Optional[Dict[str, np.ndarray]]:
+        path = self.path(symbol, timeframe, month)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+
+    def _save(self, symbol: str, timeframe: str, month: str, columns: Dict[str, np.ndarray]):
+        """Write a partition to a temporary file, then rename it into place"""
+        path = self.path(symbol, timeframe, month)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(suffix=".npz", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **columns)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def month_range(start_date: datetime, end_date: datetime) -> List[str]:
+    """UTC months overlapping [start_date, end_date] as YYYY-MM strings"""
+    start, end = _utc(start_date), _utc(end_date)
+    if start > end:
+        return []
+
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def sessions(dates: pd.DatetimeIndex) -> int:
+    """Number of distinct trading days (in exchange time) covered by bar timestamps"""
+    if len(dates) == 0:
+        return 0
+    return len(_utc_index(dates).tz_convert(MARKET_TZ).normalize().unique())
+
+
+def _utc(value) -> pd.Timestamp:
+    """Timestamp in UTC; naive values are taken to be UTC"""
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def _utc_index(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(index)
+    return index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
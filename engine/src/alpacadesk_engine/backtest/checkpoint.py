@@ -0,0 +1,158 @@
+"""Binary checkpoints of unfinished backtests, for resuming after a crash or cancel"""
+
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from .positions import PositionBook
+from .results import EquityCurve, TradeLog
+from .snapshot import BacktestSnapshot, HoldingsCarry
+
+# Bump when the layout changes; older checkpoints are then rejected
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+@dataclass
+class Checkpoint:
+    """
+    State of a backtest part way through, written while it runs
+
+    snapshot holds the portfolio as of its end_date in the form produced
+    by BacktestEngine.snapshot(), so a day-by-day run continues with
+    BacktestEngine.resume(). Intraday runs continue with
+    run_intraday(checkpoint=...), which also needs run_state: the signal
+    warm-up tails and marks carried from one month to the next.
+    """
+    mode: str  # 'daily' or 'intraday'
+    end_date: datetime  # End date of the interrupted run
+    snapshot: BacktestSnapshot
+    run_state: Dict[str, Any] = field(default_factory=dict)
+
+
+def save_checkpoint(path: str, checkpoint: Checkpoint):
+    """
+    Write a checkpoint as one uncompressed .npz file
+
+    Arrays (positions, trades, equity curve, holdings carry) are stored as
+    they are; scalars and strategy state are pickled into a single byte
+    array. The file is written beside path and renamed into place, so a
+    crash mid-write leaves the previous checkpoint intact.
+    """
+    snapshot = checkpoint.snapshot
+    curve = snapshot.equity_curve
+    carry = snapshot.carry
+
+    arrays = {
+        "curve_dates": curve.dates.as_unit("ns").asi8,  # UTC for tz-aware calendars
+        "curve_equity": curve.equity,
+        "curve_cash": curve.cash,
+    }
+    arrays.update({f"positions_{name}": v for name, v in snapshot.positions.to_arrays().items()})
+    arrays.update({f"trades_{name}": v for name, v in snapshot.closed_trades.to_arrays().items()})
+    if carry is not None:
+        arrays.update({
+            "carry_symbols": np.array(carry.symbols, dtype=str),
+            "carry_held_qty": carry.held_qty,
+            "carry_held_cost": carry.held_cost,
+            "carry_qty": carry.qty,
+            "carry_cost": carry.cost,
+        })
+
+    state = {
+        "version": CHECKPOINT_FORMAT_VERSION,
+        "mode": checkpoint.mode,
+        "end_date": checkpoint.end_date,
+        "run_state": checkpoint.run_state,
+        "start_date": snapshot.start_date,
+        "snapshot_end_date": snapshot.end_date,
+        "initial_capital": snapshot.initial_capital,
+        "commission_per_trade": snapshot.commission_per_trade,
+        "slippage_pct": snapshot.slippage_pct,
+        "cash": snapshot.cash,
+        "equity": snapshot.equity,
+        "curve_tz": str(curve.dates.tz) if curve.dates.tz is not None else None,
+        "trades_tz": snapshot.closed_trades.tz,
+        "strategy_parameters": snapshot.strategy_parameters,
+        "strategy_state": snapshot.strategy_state,
+    }
+    arrays["state"] = np.frombuffer(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), dtype=np.uint8)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(suffix=".npz", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_checkpoint(path: str) -> Checkpoint:
+    """
+    Read a checkpoint written by save_checkpoint()
+
+    Checkpoints hold pickled strategy state, so only load files this
+    application wrote.
+
+    Raises:
+        ValueError: If the file is from another checkpoint format version
+    """
+    with np.load(path) as data:
+        arrays = {name: data[name] for name in data.files}
+
+    state = pickle.loads(arrays.pop("state").tobytes())
+    if state["version"] != CHECKPOINT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint format version: {state['version']}")
+
+    def columns(prefix: str) -> Dict[str, np.ndarray]:
+        return {
+            name[len(prefix) + 1:]: values for name, values in arrays.items() if name.startswith(f"{prefix}_")
+        }
+
+    dates = pd.DatetimeIndex(arrays["curve_dates"].view("datetime64[ns]"))
+    if state["curve_tz"] is not None:
+        dates = dates.tz_localize("UTC").tz_convert(state["curve_tz"])
+
+    carry = None
+    if "carry_symbols" in arrays:
+        carry = HoldingsCarry(
+            arrays["carry_symbols"].tolist(),
+            arrays["carry_held_qty"],
+            arrays["carry_held_cost"],
+            arrays["carry_qty"],
+            arrays["carry_cost"],
+        )
+
+    snapshot = BacktestSnapshot(
+        start_date=state["start_date"],
+        end_date=state["snapshot_end_date"],
+        initial_capital=state["initial_capital"],
+        commission_per_trade=state["commission_per_trade"],
+        slippage_pct=state["slippage_pct"],
+        cash=state["cash"],
+        equity=state["equity"],
+        positions=PositionBook.from_arrays(columns("positions")),
+        closed_trades=TradeLog.from_arrays(columns("trades"), tz=state["trades_tz"]),
+        equity_curve=EquityCurve(
+            dates, arrays["curve_equity"], arrays["curve_cash"], state["initial_capital"]
+        ),
+        strategy_parameters=state["strategy_parameters"],
+        strategy_state=state["strategy_state"],
+        carry=carry,
+    )
+
+    return Checkpoint(
+        mode=state["mode"],
+        end_date=state["end_date"],
+        snapshot=snapshot,
+        run_state=state["run_state"],
+    )
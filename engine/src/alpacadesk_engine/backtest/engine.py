@@ -1,6 +1,10 @@
 """Backtesting engine with realistic execution simulation"""
 
 from typing import List, Dict, Any, Optional
+from contextlib import contextmanager, nullcontext
+import copy
+import os
+import time
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 import pandas as pd
@@ -8,20 +12,44 @@ import numpy as np
 
 from ..strategies.base import BaseStrategy, Signal
 from ..brokers.alpaca import AlpacaBroker
+from .panel import PricePanel, select_range, union_calendar, _forward_fill
+from .portfolio import StrategyAttribution, merge_books
+from .positions import PositionBook
+from .profiler import BacktestProfile, BacktestProfiler
+from .bar_store import BarStore, month_range, sessions
+from .checkpoint import Checkpoint, save_checkpoint
+from .metrics import TRADING_DAYS_PER_YEAR, performance_stats, trade_stats, turnover
+from .progress import ProgressReporter
+from .results import EquityCurve, TradeLog
+from .snapshot import BacktestSnapshot, HoldingsCarry
+from .universe import UniverseData, UniverseRunStats, chunk_size_for_budget, peak_rss_mb
+
+# Stand-in for a profiler phase when profiling is off
+_NO_PHASE = nullcontext()
 
 
 @dataclass
-class BacktestOrder:
-    """Represents an order in the backtest"""
-    symbol: str
-    qty: float
-    side: str  # 'buy' or 'sell'
-    entry_price: float
-    entry_date: datetime
-    exit_price: Optional[float] = None
-    exit_date: Optional[datetime] = None
-    pnl: float = 0.0
-    pnl_pct: float = 0.0
+class SignalMatrix:
+    """Strategy signals aligned onto a price panel"""
+    panel: PricePanel
+    buys: np.ndarray  # (days x symbols) bool
+    sells: np.ndarray  # (days x symbols) bool
+
+    @property
+    def symbols(self) -> List[str]:
+        return self.panel.symbols
+
+    @property
+    def trading_days(self) -> List[datetime]:
+        return self.panel.trading_days
+
+    def slice(self, start: int, end: int) -> "SignalMatrix":
+        """Return the signals for trading days [start, end) without copying"""
+        return SignalMatrix(
+            panel=self.panel.slice(start, end),
+            buys=self.buys[start:end],
+            sells=self.sells[start:end],
+        )
 
 
 @dataclass
@@ -40,6 +68,12 @@ class BacktestMetrics:
     avg_trade_duration_days: float
     max_consecutive_wins: int
     max_consecutive_losses: int
+    annualized_return: float
+    max_drawdown_duration_days: int  # Trading days spent below a prior peak
+    sortino_ratio: float
+    calmar_ratio: float
+    exposure_pct: float
+    turnover: float  # Annualized, as a multiple of average equity
 
 
 class BacktestEngine:
@@ -48,9 +82,15 @@ class BacktestEngine:
 
     Features:
     - Simulates historical strategy execution
+    - Vectorized simulation for strategies with generate_signals()
+    - Chunked float32 runs over large universes within a memory budget
+    - Intraday bars streamed month by month from a local BarStore
+    - Multi-strategy portfolios with shared cash and per-strategy attribution
     - Models slippage and trading costs
     - Calculates comprehensive performance metrics
-    - Generates equity curve
+    - Generates equity curve and trade log as columnar arrays
+    - Opt-in profiling of time, calls and allocations per phase
+    - Periodic binary checkpoints of day-by-day and intraday runs
     """
 
     def __init__(
@@ -58,16 +98,39 @@ class BacktestEngine:
         initial_capital: float = 100000.0,
         commission_per_trade: float = 0.0,  # Alpaca is commission-free
         slippage_pct: float = 0.05,  # 0.05% average slippage
+        zero_copy: bool = True,  # Hand strategies views instead of per-day copies
+        vectorized: bool = True,  # Use generate_signals() when the strategy supports it
+        memory_budget_mb: Optional[float] = None,  # Cap for run_universe() arrays (None: unchunked)
+        profile: bool = False,  # Record a BacktestProfile of run() and run_portfolio()
+        profile_allocations: bool = True,  # Include tracemalloc allocation totals when profiling
+        checkpoint_path: Optional[str] = None,  # Checkpoint file for resuming interrupted runs
+        checkpoint_interval: float = 5.0,  # Minimum seconds between checkpoint writes
     ):
         self.initial_capital = initial_capital
         self.commission = commission_per_trade
         self.slippage_pct = slippage_pct
+        self.zero_copy = zero_copy
+        self.vectorized = vectorized
+        self.memory_budget_mb = memory_budget_mb
+        self.profiling = profile
+        self.profile_allocations = profile_allocations
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
 
         self.cash = initial_capital
         self.equity = initial_capital
-        self.positions: List[BacktestOrder] = []
-        self.closed_trades: List[BacktestOrder] = []
-        self.equity_curve: List[Dict[str, Any]] = []
+        self.positions = PositionBook()
+        self.closed_trades = TradeLog()
+        self.equity_curve = EquityCurve.empty(initial_capital)
+        self.panel: Optional[PricePanel] = None
+        self.start_date: Optional[datetime] = None
+        self.end_date: Optional[datetime] = None
+        self._carry: Optional[HoldingsCarry] = None
+        self._next_checkpoint = 0.0
+        self.universe_stats: Optional[UniverseRunStats] = None
+        self.attribution: Optional[List[StrategyAttribution]] = None
+        self.profile: Optional[BacktestProfile] = None
+        self._profiler: Optional[BacktestProfiler] = None
 
     def run(
         self,
@@ -75,78 +138,966 @@ class BacktestEngine:
         market_data: Dict[str, pd.DataFrame],
         start_date: datetime,
         end_date: datetime,
-    ) -> tuple[BacktestMetrics, List[Dict[str, Any]]]:
+        progress: Optional[ProgressReporter] = None,
+    ) -> tuple[BacktestMetrics, EquityCurve]:
         """
         Run backtest for a strategy
 
+        Strategies that implement generate_signals() are simulated in one
+        vectorized pass; all others are evaluated day by day via analyze().
+        Both paths produce the same trades and equity curve. Either way,
+        position sizes on each day come from the previous day's equity
+        (analyze() is passed it as portfolio_value), not from
+        initial_capital; a strategy that sizes against a missing
+        portfolio_value would otherwise never trade.
+
+        With profiling enabled, the run's time, call counts and
+        allocations per phase (and per strategy for signal generation and
+        analyze()) are left in self.profile.
+
+        With a checkpoint_path, the day-by-day path saves a Checkpoint at
+        most every checkpoint_interval seconds; an interrupted run
+        continues from it with resume(). The vectorized path is a single
+        pass and is not checkpointed. The file is removed once the run
+        completes.
+
         Args:
             strategy: Strategy to backtest
             market_data: Historical market data for all symbols
             start_date: Start date for backtest
             end_date: End date for backtest
+            progress: Optional reporter, updated after every day of the
+                day-by-day path and once at the end of either path
 
         Returns:
             Tuple of (metrics, equity_curve)
         """
-        # Reset state
+        self._reset()
+        self.start_date = start_date
+        self.end_date = end_date
+        self._start_profile()
+
+        try:
+            if self.vectorized and strategy.supports_vectorized():
+                signals = self.prepare_signals(strategy, market_data, start_date, end_date)
+                self._start(signals.panel)
+                with self._phase("simulation"):
+                    self._simulate(strategy, signals)
+            else:
+                with self._phase("panel"):
+                    self._start(PricePanel.from_market_data(market_data, start_date, end_date))
+                self._run_loop(strategy, market_data, start_date, progress)
+
+            if progress is not None:
+                with self._phase("progress"):
+                    progress.finish(self.equity_curve, self.closed_trades)
+
+            # Calculate metrics
+            with self._phase("metrics"):
+                metrics = self._calculate_metrics(market_data, start_date, end_date)
+
+        finally:
+            self._stop_profile()
+
+        self._clear_checkpoint()
+
+        return metrics, self.equity_curve
+
+    def run_universe(
+        self,
+        strategy: BaseStrategy,
+        universe: UniverseData,
+        start_date: datetime,
+        end_date: datetime,
+        progress: Optional[ProgressReporter] = None,
+    ) -> tuple[BacktestMetrics, EquityCurve]:
+        """
+        Run backtest over a large float32 universe within memory_budget_mb
+
+        Vectorized strategies are processed a block of symbols at a time:
+        signals, prices and marks are built per block and the equity curve
+        is rebuilt per block, with the block size derived from the budget.
+        Strategies that only implement analyze() need every symbol each
+        day, so they run unchunked through run() and the budget does not
+        apply. Resource usage, including peak RSS, is left in
+        universe_stats.
+
+        Args:
+            strategy: Strategy to backtest (its symbols select the universe rows)
+            universe: Bars for at least the strategy's symbols
+            start_date: Start date for backtest
+            end_date: End date for backtest
+            progress: Optional reporter (see run())
+
+        Returns:
+            Tuple of (metrics, equity_curve)
+
+        Raises:
+            ValueError: If memory_budget_mb cannot fit the run
+        """
+        symbols = [s for s in strategy.symbols if s in universe]
+        days = len(universe.dates[universe.rows(start_date, end_date)])
+        buy_hold_data = {symbols[0]: universe.frame(symbols[0], start_date, end_date)} if symbols else {}
+
+        if not (self.vectorized and strategy.supports_vectorized()):
+            market_data = universe.to_market_data(start_date, end_date, symbols)
+            metrics, curve = self.run(strategy, market_data, start_date, end_date, progress)
+            chunk_size = max(len(symbols), 1)
+        else:
+            budget = self.memory_budget_mb * 2 ** 20 if self.memory_budget_mb is not None else None
+            chunk_size = chunk_size_for_budget(days, len(symbols), budget, universe.resident_bytes)
+
+            self._reset()
+            self.start_date = start_date
+            self.end_date = end_date
+
+            signals = self.prepare_universe_signals(strategy, universe, start_date, end_date, chunk_size)
+            self._start(signals.panel)
+            self._simulate(strategy, signals, chunk_size=chunk_size)
+
+            if progress is not None:
+                progress.finish(self.equity_curve, self.closed_trades)
+
+            metrics = self._calculate_metrics(buy_hold_data, start_date, end_date)
+            curve = self.equity_curve
+
+        self.universe_stats = UniverseRunStats(
+            symbols=len(symbols),
+            days=days,
+            chunk_size=chunk_size,
+            chunks=-(-len(symbols) // chunk_size),
+            memory_budget_mb=self.memory_budget_mb,
+            peak_rss_mb=peak_rss_mb(),
+        )
+
+        return metrics, curve
+
+    def run_intraday(
+        self,
+        strategy: BaseStrategy,
+        store: BarStore,
+        timeframe: str,
+        start_date: datetime,
+        end_date: datetime,
+        progress: Optional[ProgressReporter] = None,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> tuple[BacktestMetrics, EquityCurve]:
+        """
+        Run backtest on intraday bars streamed from a BarStore
+
+        Bars are read one month partition at a time and strategies are
+        evaluated on bar close. Each symbol's signals are computed over the
+        month plus its last strategy.warmup_bars() earlier bars, and cash,
+        holdings and marks carry over from one month to the next, so only
+        one partition is held as DataFrames at a time. Ratios are
+        annualized by the number of bars per session in the data.
+
+        With a checkpoint_path, a Checkpoint is saved after a month at most
+        every checkpoint_interval seconds. Passing it back as checkpoint
+        continues after its last month with the same result as an
+        uninterrupted run.
+
+        Args:
+            strategy: Strategy to backtest (must implement generate_signals())
+            store: Local bar store holding the strategy's symbols
+            timeframe: Bar timeframe in the store (e.g. '1min', '5min')
+            start_date: First bar time to include (naive times are UTC)
+            end_date: Last bar time to include (naive times are UTC)
+            progress: Optional reporter, updated after each month
+            checkpoint: Intraday checkpoint of an interrupted run to continue
+
+        Returns:
+            Tuple of (metrics, equity_curve) with one row per bar
+
+        Raises:
+            ValueError: If the strategy only supports analyze(), or the
+                checkpoint does not match the run
+        """
+        if not strategy.supports_vectorized():
+            raise ValueError(f"{strategy.__class__.__name__} does not support intraday backtests")
+
+        symbols = [s for s in strategy.symbols if store.months(s, timeframe)]
+        total_months = len(month_range(start_date, end_date))
+        warmup = strategy.warmup_bars()
+
+        tails: Dict[str, pd.DataFrame] = {}
+        marks = np.full(len(symbols), np.nan)
+        curves = []
+        first_bar = last_bar = None  # (time, close) of the first symbol, for buy and hold
+        months_done = 0
+        read_from = start_date
+
+        if checkpoint is None:
+            self._reset()
+        else:
+            snapshot, state = checkpoint.snapshot, checkpoint.run_state
+            self._check_snapshot(strategy, snapshot)
+            if checkpoint.mode != "intraday" or state["symbols"] != symbols:
+                raise ValueError("Checkpoint is not of this intraday backtest")
+
+            self._restore(strategy, snapshot)
+            tails, marks = state["tails"], state["marks"]
+            first_bar, last_bar = state["first_bar"], state["last_bar"]
+            months_done = state["months"]
+            curves.append(snapshot.equity_curve)
+            read_from = snapshot.end_date + pd.Timedelta(1, "ns")
+
+        self.start_date = start_date
+        self.end_date = end_date
+        chunks = store.iter_chunks(symbols, timeframe, read_from, end_date)
+
+        for month, bars in enumerate(chunks, start=months_done + 1):
+            panel = PricePanel.continued(bars, symbols, marks)
+            buys = np.zeros(panel.close.shape, dtype=bool)
+            sells = np.zeros(panel.close.shape, dtype=bool)
+
+            for j, symbol in enumerate(symbols):
+                chunk = bars.get(symbol)
+                if chunk is None:
+                    continue
+
+                # Signals over the carried tail plus this month, kept for this month only
+                window = pd.concat([tails[symbol], chunk]) if symbol in tails else chunk
+                buy, sell = strategy.generate_signals(window)
+                tails[symbol] = window if warmup is None else window.iloc[-warmup:]
+
+                rows = panel.dates.get_indexer(chunk.index)
+                buys[rows, j] = buy[-len(chunk):]
+                sells[rows, j] = sell[-len(chunk):] & ~buy[-len(chunk):]
+
+            self._start(panel)
+            self._simulate(strategy, SignalMatrix(panel, buys, sells), carry=self._carry)
+            curves.append(self.equity_curve)
+            marks = panel.marks[-1]
+
+            if symbols and symbols[0] in bars:
+                closes = bars[symbols[0]]["close"]
+                first_bar = first_bar or (closes.index[0], closes.iloc[0])
+                last_bar = (closes.index[-1], closes.iloc[-1])
+
+            if self._checkpoint_due():
+                # Concatenating here also keeps later checkpoints from re-joining every month
+                curves = [EquityCurve.concatenate(curves, self.initial_capital)]
+                self._save_checkpoint(strategy, "intraday", curves[0], {
+                    "symbols": symbols,
+                    "tails": tails,
+                    "marks": marks,
+                    "first_bar": first_bar,
+                    "last_bar": last_bar,
+                    "months": month,
+                })
+
+            if progress is not None and progress.due():
+                curve = EquityCurve.concatenate(curves, self.initial_capital)
+                progress.report(curve, self.closed_trades, len(curve) * total_months // month)
+
+        self.equity_curve = EquityCurve.concatenate(curves, self.initial_capital)
+
+        if progress is not None:
+            progress.finish(self.equity_curve, self.closed_trades)
+
+        # Buy and hold of the first symbol from its first to its last bar
+        buy_hold_data, start, end = {}, start_date, end_date
+        if first_bar is not None and last_bar[0] > first_bar[0]:
+            (start, start_close), (end, end_close) = first_bar, last_bar
+            buy_hold_data = {symbols[0]: pd.DataFrame({"close": [start_close, end_close]}, index=[start, end])}
+
+        days = sessions(self.equity_curve.dates)
+        bars_per_day = len(self.equity_curve) / days if days else 1.0
+        metrics = self._calculate_metrics(buy_hold_data, start, end, bars_per_day)
+        self._clear_checkpoint()
+
+        return metrics, self.equity_curve
+
+    def run_portfolio(
+        self,
+        strategies: Dict[str, BaseStrategy],
+        market_data: Dict[str, pd.DataFrame],
+        start_date: datetime,
+        end_date: datetime,
+        progress: Optional[ProgressReporter] = None,
+    ) -> tuple[BacktestMetrics, EquityCurve]:
+        """
+        Run several strategies against one account, as StrategyScheduler does live
+
+        Bars are aligned once onto a panel of every strategy's symbols and
+        the strategies share cash in a single pass over it. Each day they
+        act in the order given, sizing against the portfolio's equity as of
+        the previous close, and a buy that the remaining cash cannot cover
+        is skipped. Each strategy's lots are kept apart, so a sell closes
+        only that strategy's own lots. Per-strategy P&L is left in
+        attribution, and with profiling enabled the run's profile in
+        profile.
+
+        If every strategy implements generate_signals(), only days with a
+        signal are visited; otherwise every day is, with analyze() called
+        for the strategies that need it.
+
+        Args:
+            strategies: Strategies by unique name
+            market_data: Historical market data for all symbols
+            start_date: Start date for backtest
+            end_date: End date for backtest
+            progress: Optional reporter, sent the final report
+
+        Returns:
+            Tuple of (metrics, equity_curve) for the combined portfolio
+
+        Raises:
+            ValueError: If strategies is empty
+        """
+        if not strategies:
+            raise ValueError("A portfolio backtest needs at least one strategy")
+
+        self._reset()
+        self.start_date = start_date
+        self.end_date = end_date
+
+        self._start_profile()
+
+        try:
+            names = list(strategies)
+            symbols = list(dict.fromkeys(s for strategy in strategies.values() for s in strategy.symbols))
+            with self._phase("panel"):
+                panel = PricePanel.from_market_data(market_data, start_date, end_date, symbols=symbols)
+                self._start(panel)
+
+            closes, marks = panel.close, panel.marks
+            has_mark = ~np.isnan(marks)
+            num_days = len(panel.dates)
+            vectorized = [self.vectorized and strategies[name].supports_vectorized() for name in names]
+
+            # Signals of vectorized strategies, from one window per symbol
+            buys: Dict[int, np.ndarray] = {}
+            sells: Dict[int, np.ndarray] = {}
+            for s in [s for s, v in enumerate(vectorized) if v]:
+                buys[s] = np.zeros(closes.shape, dtype=bool)
+                sells[s] = np.zeros(closes.shape, dtype=bool)
+
+            for j, symbol in enumerate(panel.symbols):
+                with self._phase("data_slicing"):
+                    window = select_range(market_data[symbol], start_date, end_date)
+                    rows = panel.dates.get_indexer(window.index)
+                for s in buys:
+                    if symbol in strategies[names[s]].symbols:
+                        with self._phase("signals", names[s]):
+                            buy, sell = strategies[names[s]].generate_signals(window)
+                        buys[s][rows, j] = buy
+                        sells[s][rows, j] = sell & ~buy
+
+            if all(vectorized):
+                events = np.flatnonzero(np.any([buys[s] | sells[s] for s in buys], axis=0).any(axis=1))
+            else:
+                events = np.arange(num_days)
+                with self._phase("data_slicing"):
+                    windows = self._prepare_windows(market_data, start_date) if self.zero_copy else None
+
+            books = [PositionBook() for _ in names]
+            held_qty = np.zeros((len(names), len(panel.symbols)))
+            held_cost = np.zeros((len(names), len(panel.symbols)))
+            flows = np.zeros(len(names))  # Net cash moved by each strategy's fills
+            changes: List[List[tuple]] = [[] for _ in names]
+            trade_owner = []  # Strategy index per closed trade
+            cash_after = np.full(num_days, np.nan)
+            flows_after = np.full((num_days, len(names)), np.nan)
+
+            with _unshared_indicators([strategies[name] for name, v in zip(names, vectorized) if not v]):
+                for t in events:
+                    # Equity as of the previous close, which every strategy sizes against
+                    if t == 0:
+                        portfolio_value = self.equity
+                    else:
+                        values = np.where(has_mark[t - 1], held_qty * marks[t - 1], held_cost)
+                        portfolio_value = self.cash + values.sum()
+
+                    historical_data = None
+                    for s, name in enumerate(names):
+                        strategy = strategies[name]
+                        self.positions = books[s]
+                        cash_before, trades_before = self.cash, len(self.closed_trades)
+
+                        if vectorized[s]:
+                            touched = np.flatnonzero(buys[s][t] | sells[s][t])
+                            with self._phase("execution"):
+                                for j in touched:
+                                    price = float(closes[t, j])
+                                    if buys[s][t, j]:
+                                        try:
+                                            quantity = strategy._calculate_position_size(price, portfolio_value)
+                                        except ValueError:
+                                            continue
+                                        self._open_position(panel.symbols[j], quantity, price, t)
+                                    else:
+                                        self._close_lots(panel.symbols[j], price, t)
+                        else:
+                            if historical_data is None:
+                                current_date = panel.dates[t]
+                                with self._phase("data_slicing"):
+                                    if windows is not None:
+                                        historical_data = self._get_historical_windows(windows, current_date)
+                                    else:
+                                        historical_data = self._get_historical_data(market_data, start_date, current_date)
+
+                            with self._phase("analyze", name):
+                                signals = strategy.analyze(historical_data, portfolio_value=portfolio_value)
+                            with self._phase("execution"):
+                                for signal in signals:
+                                    self._execute_signal(signal, t)
+                            touched = np.unique([panel.columns[sig.symbol] for sig in signals if sig.symbol in panel.columns])
+
+                        flows[s] += self.cash - cash_before
+                        trade_owner.extend([s] * (len(self.closed_trades) - trades_before))
+
+                        for j in touched:
+                            new_qty = books[s].quantity(panel.symbols[j])
+                            new_cost = books[s].cost_basis(panel.symbols[j])
+                            if new_qty == held_qty[s, j] and new_cost == held_cost[s, j]:
+                                continue  # Unfilled signal
+                            changes[s].append((t, j, new_qty - held_qty[s, j], new_cost - held_cost[s, j]))
+                            held_qty[s, j] = new_qty
+                            held_cost[s, j] = new_cost
+
+                    cash_after[t] = self.cash
+                    flows_after[t] = flows
+
+            # Rebuild each strategy's holdings value between event days
+            no_holdings = np.zeros(len(panel.symbols))
+            with self._phase("valuation"):
+                sleeve_values = np.column_stack([
+                    _holdings_value(changes[s], marks, has_mark, 0, no_holdings, no_holdings)[0]
+                    for s in range(len(names))
+                ])
+            cash = pd.Series(cash_after).ffill().fillna(self.initial_capital).to_numpy()
+            equity = cash + sleeve_values.sum(axis=1)
+
+            self.equity_curve.equity[:] = equity
+            self.equity_curve.cash[:] = cash
+            if num_days:
+                self.equity = float(equity[-1])
+            self.positions = merge_books(books)
+
+            # P&L per strategy: net cash flows plus marked holdings
+            pnl_curves = pd.DataFrame(flows_after).ffill().fillna(0.0).to_numpy() + sleeve_values
+            owners = np.array(trade_owner, dtype=np.int64)
+            trades = self.closed_trades
+            self.attribution = []
+            for s, name in enumerate(names):
+                own = owners == s
+                stats = trade_stats(trades.pnl[own])
+                pnl = float(pnl_curves[-1, s]) if num_days else 0.0
+                self.attribution.append(StrategyAttribution(
+                    name=name,
+                    pnl=pnl,
+                    realized_pnl=float(trades.pnl[own].sum()),
+                    contribution_pct=pnl / self.initial_capital * 100,
+                    total_trades=stats.total_trades,
+                    win_rate=stats.win_rate,
+                    pnl_curve=pnl_curves[:, s],
+                ))
+
+            if progress is not None:
+                with self._phase("progress"):
+                    progress.finish(self.equity_curve, self.closed_trades)
+
+            with self._phase("metrics"):
+                metrics = self._calculate_metrics(market_data, start_date, end_date)
+
+        finally:
+            self._stop_profile()
+
+        return metrics, self.equity_curve
+
+    def run_signals(
+        self,
+        strategy: BaseStrategy,
+        signals: "SignalMatrix",
+        market_data: Dict[str, pd.DataFrame],
+    ) -> tuple[BacktestMetrics, EquityCurve]:
+        """
+        Run backtest from signals prepared earlier with prepare_signals()
+
+        Lets callers that evaluate many date ranges of the same strategy,
+        such as walk-forward optimization, compute indicators once and
+        simulate slices of the result.
+
+        Args:
+            strategy: Strategy that produced the signals (used for sizing)
+            signals: Prepared signals, possibly a slice of a longer range
+            market_data: Historical market data for all symbols
+
+        Returns:
+            Tuple of (metrics, equity_curve)
+        """
+        self._reset()
+        self._start(signals.panel)
+        self._simulate(strategy, signals)
+
+        # Buy and hold is measured over the days actually simulated
+        days = signals.trading_days
+        metrics = self._calculate_metrics(
+            market_data, days[0] if days else None, days[-1] if days else None
+        )
+
+        return metrics, self.equity_curve
+
+    def _reset(self):
+        """Reset portfolio state before a run"""
         self.cash = self.initial_capital
         self.equity = self.initial_capital
-        self.positions = []
-        self.closed_trades = []
-        self.equity_curve = []
-
-        # Get trading days
-        trading_days = self._get_trading_days(market_data, start_date, end_date)
+        self.positions = PositionBook()
+        self.closed_trades = TradeLog()
+        self.equity_curve = EquityCurve.empty(self.initial_capital)
+        self.panel = None
+        self.start_date = None
+        self.end_date = None
+        self._carry = None
+        self.profile = None
+        self._next_checkpoint = time.monotonic() + self.checkpoint_interval
+
+    def _start_profile(self):
+        """Begin profiling a run, if enabled"""
+        if self.profiling:
+            self._profiler = BacktestProfiler(track_allocations=self.profile_allocations)
+            self._profiler.start()
+
+    def _stop_profile(self):
+        """Finish profiling a run, leaving the result in self.profile"""
+        if self._profiler is not None:
+            self.profile = self._profiler.stop()
+            self._profiler = None
+
+    def _phase(self, name: str, strategy: Optional[str] = None):
+        """Profiler phase context, or a no-op when not profiling"""
+        if self._profiler is None:
+            return _NO_PHASE
+        return self._profiler.phase(name, strategy)
+
+    def _start(self, panel: PricePanel):
+        """Attach the run's price panel and size the output arrays for it"""
+        self.panel = panel
+        self._bar_times = panel.dates.values  # datetime64 (UTC for tz-aware calendars)
+        self.equity_curve = EquityCurve.allocate(panel.dates, self.initial_capital)
+        self.closed_trades.tz = str(panel.dates.tz) if panel.dates.tz is not None else None
+
+    def _run_loop(
+        self,
+        strategy: BaseStrategy,
+        market_data: Dict[str, pd.DataFrame],
+        start_date: datetime,
+        progress: Optional[ProgressReporter] = None,
+        start_row: int = 0,
+    ):
+        """Evaluate the strategy day by day through analyze() over self.panel[start_row:]"""
+        # Sort each frame once so daily windows can be taken by position
+        with self._phase("data_slicing"):
+            windows = self._prepare_windows(market_data, start_date) if self.zero_copy else None
 
         # Iterate through each trading day
-        for current_date in trading_days:
-            # Get market data up to current date
-            historical_data = self._get_historical_data(market_data, start_date, current_date)
-
-            # Generate signals
-            signals = strategy.analyze(historical_data)
-
-            # Execute signals
-            for signal in signals:
-                self._execute_signal(signal, current_date, market_data)
-
-            # Update portfolio value
-            self._update_portfolio_value(current_date, market_data)
-
-            # Record equity
-            self.equity_curve.append({
-                "date": current_date.isoformat(),
-                "equity": self.equity,
-                "cash": self.cash,
-                "positions_value": self.equity - self.cash,
-                "profit_loss": self.equity - self.initial_capital,
-                "profit_loss_pct": ((self.equity - self.initial_capital) / self.initial_capital) * 100,
-            })
-
-        # Calculate metrics
+        with _unshared_indicators([strategy]):
+            for t, current_date in enumerate(self.panel.trading_days[start_row:], start=start_row):
+                # Get market data up to current date
+                with self._phase("data_slicing"):
+                    if windows is not None:
+                        historical_data = self._get_historical_windows(windows, current_date)
+                    else:
+                        historical_data = self._get_historical_data(market_data, start_date, current_date)
+
+                # Generate signals, sized against the previous day's equity
+                with self._phase("analyze", strategy.name):
+                    signals = strategy.analyze(historical_data, portfolio_value=self.equity)
+
+                # Execute signals
+                with self._phase("execution"):
+                    for signal in signals:
+                        self._execute_signal(signal, t)
+
+                # Update portfolio value and record equity
+                with self._phase("valuation"):
+                    self._update_portfolio_value(t)
+                    self.equity_curve.record(t, self.equity, self.cash)
+
+                if self._checkpoint_due():
+                    with self._phase("checkpoint"):
+                        self._save_checkpoint(strategy, "daily", self.equity_curve.head(t + 1))
+
+                if progress is not None:
+                    with self._phase("progress"):
+                        progress.update(t, self.equity_curve, self.closed_trades)
+
+    def prepare_signals(
+        self,
+        strategy: BaseStrategy,
+        market_data: Dict[str, pd.DataFrame],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> "SignalMatrix":
+        """
+        Compute a vectorized strategy's signals aligned onto a price panel
+
+        Signals are computed once per symbol over [start_date, end_date] and
+        stored as (day x symbol) matrices next to the panel's prices.
+        """
+        with self._phase("panel"):
+            panel = PricePanel.from_market_data(
+                market_data, start_date, end_date, symbols=strategy.symbols
+            )
+        buys = np.zeros(panel.close.shape, dtype=bool)
+        sells = np.zeros(panel.close.shape, dtype=bool)
+
+        for j, symbol in enumerate(panel.symbols):
+            with self._phase("data_slicing"):
+                window = select_range(market_data[symbol], start_date, end_date)
+            with self._phase("signals", strategy.name):
+                buy, sell = strategy.generate_signals(window)
+
+            # Panel rows are a superset of the symbol's own bars
+            rows = panel.dates.get_indexer(window.index)
+            buys[rows, j] = buy
+            sells[rows, j] = sell & ~buy
+
+        return SignalMatrix(panel, buys, sells)
+
+    def record_signals(
+        self,
+        strategy: BaseStrategy,
+        market_data: Dict[str, pd.DataFrame],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> "SignalMatrix":
+        """
+        prepare_signals() for strategies that only implement analyze()
+
+        Calls analyze() day by day over [start_date, end_date], on the same
+        history since start_date the day-by-day path gives it, and records
+        which symbols it buys and sells. Like generate_signals() output,
+        buys are sized at simulation time by _calculate_position_size()
+        and sells close the whole position; a strategy sizing its own
+        signals differently trades differently than under run().
+        """
+        with self._phase("panel"):
+            panel = PricePanel.from_market_data(
+                market_data, start_date, end_date, symbols=strategy.symbols
+            )
+        buys = np.zeros(panel.close.shape, dtype=bool)
+        sells = np.zeros(panel.close.shape, dtype=bool)
+
+        with self._phase("data_slicing"):
+            windows = self._prepare_windows(market_data, start_date) if self.zero_copy else None
+
+        with _unshared_indicators([strategy]):
+            for t, current_date in enumerate(panel.trading_days):
+                with self._phase("data_slicing"):
+                    if windows is not None:
+                        historical_data = self._get_historical_windows(windows, current_date)
+                    else:
+                        historical_data = self._get_historical_data(market_data, start_date, current_date)
+
+                with self._phase("analyze", strategy.name):
+                    signals = strategy.analyze(historical_data, portfolio_value=self.initial_capital)
+
+                for signal in signals:
+                    j = panel.columns.get(signal.symbol)
+                    if j is None or not panel.valid[t, j]:
+                        continue  # Only symbols with a bar today can trade
+                    if signal.action == "buy":
+                        buys[t, j] = True
+                    elif signal.action == "sell":
+                        sells[t, j] = True
+
+        return SignalMatrix(panel, buys, sells & ~buys)
+
+    def prepare_universe_signals(
+        self,
+        strategy: BaseStrategy,
+        universe: UniverseData,
+        start_date: datetime,
+        end_date: datetime,
+        chunk_size: int,
+    ) -> "SignalMatrix":
+        """
+        prepare_signals() for a UniverseData, chunk_size symbols at a time
+
+        Prices and marks keep the universe's dtype; only one block of
+        fields, and one symbol's DataFrame, is converted at a time.
+        """
+        rows = universe.rows(start_date, end_date)
+        dates = universe.dates[rows]
+        close_field = universe.fields["close"]
+        symbols = [s for s in strategy.symbols if s in universe]
+
+        # Symbols without bars in the range are dropped, as in PricePanel
+        present = []
+        for j0 in range(0, len(symbols), chunk_size):
+            block = close_field[[universe.columns[s] for s in symbols[j0:j0 + chunk_size]], rows]
+            present.extend(~np.isnan(block).all(axis=1))
+            universe.release()
+        symbols = [s for s, keep in zip(symbols, present) if keep]
+
+        shape = (len(dates), len(symbols))
+        close = np.empty(shape, dtype=close_field.dtype)
+        marks = np.empty(shape, dtype=close_field.dtype)
+        valid = np.empty(shape, dtype=bool)
+        buys = np.zeros(shape, dtype=bool)
+        sells = np.zeros(shape, dtype=bool)
+
+        for j0 in range(0, len(symbols), chunk_size):
+            chunk = symbols[j0:j0 + chunk_size]
+            cols = slice(j0, j0 + len(chunk))
+
+            block = close_field[[universe.columns[s] for s in chunk], rows].T
+            close[:, cols] = block
+            valid[:, cols] = ~np.isnan(block)
+            marks[:, cols] = _forward_fill(block, valid[:, cols])
+
+            for j, (symbol, window) in enumerate(universe.frames(chunk, start_date, end_date), start=j0):
+                buy, sell = strategy.generate_signals(window)
+
+                # The window holds exactly the symbol's valid rows
+                bars = np.flatnonzero(valid[:, j])
+                buys[bars, j] = buy
+                sells[bars, j] = sell & ~buy
+
+            universe.release()
+
+        return SignalMatrix(PricePanel(dates, symbols, close, valid, marks), buys, sells)
+
+    def _simulate(
+        self,
+        strategy: BaseStrategy,
+        signals: "SignalMatrix",
+        start_row: int = 0,
+        carry: Optional[HoldingsCarry] = None,
+        chunk_size: Optional[int] = None,
+    ):
+        """
+        Simulate fills and the equity curve from prepared signals
+
+        Only days with at least one signal are visited in Python; holdings
+        between them are constant, so the equity curve is rebuilt afterwards
+        from cumulative quantity and cost deltas with NumPy.
+
+        Rows before start_row are taken as already simulated, ending in the
+        current cash/positions and the given holdings carry. chunk_size
+        bounds the number of symbol columns rebuilt at once.
+        """
+        panel = signals.panel
+        symbols = panel.symbols
+        closes, marks = panel.close, panel.marks
+        buys, sells = signals.buys, signals.sells
+        num_days = len(panel.dates)
+        if num_days <= start_row:
+            return
+
+        has_mark = ~np.isnan(marks)
+        changes = []  # (row, column, qty delta, cost delta) per touched symbol
+        cash_after = np.full(num_days, np.nan)
+
+        if carry is not None:
+            held_qty, held_cost, qty_start, cost_start = carry.aligned(symbols)
+        else:
+            held_qty, held_cost, qty_start, cost_start = (np.zeros(len(symbols)) for _ in range(4))
+        cash_start = self.cash
+
+        events = np.flatnonzero((buys | sells).any(axis=1))
+        for t in events[events >= start_row]:
+            # Equity as of the previous close, which is what analyze() sizes against
+            if t == 0:
+                portfolio_value = self.equity  # Carried in from the previous chunk, if any
+            else:
+                values = np.where(has_mark[t - 1], held_qty * marks[t - 1], held_cost)
+                portfolio_value = self.cash + values.sum()
+
+            touched = np.flatnonzero(buys[t] | sells[t])
+            for j in touched:
+                price = float(closes[t, j])
+                if buys[t, j]:
+                    try:
+                        quantity = strategy._calculate_position_size(price, portfolio_value)
+                    except ValueError:
+                        continue
+                    self._open_position(symbols[j], quantity, price, t)
+                else:
+                    self._close_lots(symbols[j], price, t)
+
+            # Record this day's holdings change for touched symbols
+            for j in touched:
+                new_qty = self.positions.quantity(symbols[j])
+                new_cost = self.positions.cost_basis(symbols[j])
+                if new_qty == held_qty[j] and new_cost == held_cost[j]:
+                    continue  # Unfilled signal
+                changes.append((t, j, new_qty - held_qty[j], new_cost - held_cost[j]))
+                held_qty[j] = new_qty
+                held_cost[j] = new_cost
+
+            cash_after[t] = self.cash
+
+        # Holdings and cash are step functions between signal days
+        rows = slice(start_row, None)
+        cash = pd.Series(cash_after[rows]).ffill().fillna(cash_start).to_numpy()
+
+        positions_value, qty_end, cost_end = _holdings_value(
+            changes, marks[rows], has_mark[rows], start_row, qty_start, cost_start, chunk_size
+        )
+        equity = cash + positions_value
+
+        self.equity_curve.equity[rows] = equity
+        self.equity_curve.cash[rows] = cash
+        self.cash = float(cash[-1])
+        self.equity = float(equity[-1])
+        self._carry = HoldingsCarry(symbols, held_qty, held_cost, qty_end, cost_end)
+
+    def snapshot(self, strategy: BaseStrategy) -> BacktestSnapshot:
+        """
+        Capture the end state of the last run() or resume()
+
+        Args:
+            strategy: The strategy that was backtested
+
+        Returns:
+            A snapshot independent of this engine's later runs
+        """
+        if self.start_date is None:
+            raise ValueError("Nothing to snapshot: run a backtest first")
+
+        return copy.deepcopy(self._current_state(strategy, self.equity_curve))
+
+    def _current_state(self, strategy: BaseStrategy, curve: EquityCurve) -> BacktestSnapshot:
+        """Snapshot sharing this engine's live objects, for immediate serialization or copying"""
+        return BacktestSnapshot(
+            start_date=self.start_date,
+            end_date=curve.dates[-1] if len(curve) else None,
+            initial_capital=self.initial_capital,
+            commission_per_trade=self.commission,
+            slippage_pct=self.slippage_pct,
+            cash=self.cash,
+            equity=self.equity,
+            positions=self.positions,
+            closed_trades=self.closed_trades,
+            equity_curve=curve,
+            strategy_parameters=strategy.parameters,
+            strategy_state=vars(strategy),
+            carry=self._carry,
+        )
+
+    def _checkpoint_due(self) -> bool:
+        return self.checkpoint_path is not None and time.monotonic() >= self._next_checkpoint
+
+    def _save_checkpoint(
+        self,
+        strategy: BaseStrategy,
+        mode: str,
+        curve: EquityCurve,
+        run_state: Optional[Dict[str, Any]] = None,
+    ):
+        """Write the state as of the end of curve to checkpoint_path"""
+        save_checkpoint(
+            self.checkpoint_path,
+            Checkpoint(mode, self.end_date, self._current_state(strategy, curve), run_state or {}),
+        )
+        self._next_checkpoint = time.monotonic() + self.checkpoint_interval
+
+    def _clear_checkpoint(self):
+        """Remove the checkpoint of a run that completed"""
+        if self.checkpoint_path is not None and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def resume(
+        self,
+        strategy: BaseStrategy,
+        snapshot: BacktestSnapshot,
+        market_data: Dict[str, pd.DataFrame],
+        end_date: datetime,
+        progress: Optional[ProgressReporter] = None,
+    ) -> tuple[BacktestMetrics, EquityCurve]:
+        """
+        Extend a snapshotted backtest to end_date, simulating only new days
+
+        Indicators and signals still see the full history from the
+        snapshot's start date, and the stored curve and trades are carried
+        over, so the result is identical to run() over the whole range.
+        The snapshot may also be that of a daily Checkpoint, continuing an
+        interrupted run to its end_date.
+
+        Args:
+            strategy: Strategy with the same parameters as the snapshot's
+            snapshot: State captured by snapshot() after an earlier run
+            market_data: Historical market data covering the whole range
+            end_date: New end date for the backtest
+            progress: Optional reporter (see run())
+
+        Returns:
+            Tuple of (metrics, equity_curve) over the whole range
+
+        Raises:
+            ValueError: If the snapshot does not match this engine, the
+                strategy, or the market data before its end date
+        """
+        self._check_snapshot(strategy, snapshot)
+        if snapshot.num_days == 0:
+            return self.run(strategy, market_data, snapshot.start_date, end_date, progress)
+
+        self._restore(strategy, snapshot)
+        self.end_date = end_date
+        start_date = snapshot.start_date
+
+        vectorized = self.vectorized and strategy.supports_vectorized()
+        if vectorized:
+            signals = self.prepare_signals(strategy, market_data, start_date, end_date)
+            panel = signals.panel
+        else:
+            panel = PricePanel.from_market_data(market_data, start_date, end_date)
+
+        # The already simulated days must be an exact prefix of the new calendar
+        start_row = snapshot.num_days
+        if not panel.dates[:start_row].equals(snapshot.equity_curve.dates):
+            raise ValueError("Market data changed before the snapshot's end date; run a full backtest")
+
+        self._start(panel)
+        self.equity_curve.equity[:start_row] = snapshot.equity_curve.equity
+        self.equity_curve.cash[:start_row] = snapshot.equity_curve.cash
+
+        if vectorized:
+            carry = snapshot.carry or HoldingsCarry.from_positions(self.positions)
+            self._simulate(strategy, signals, start_row, carry)
+        else:
+            self._run_loop(strategy, market_data, start_date, progress, start_row)
+
+        if progress is not None:
+            progress.finish(self.equity_curve, self.closed_trades)
+
         metrics = self._calculate_metrics(market_data, start_date, end_date)
+        self._clear_checkpoint()
 
         return metrics, self.equity_curve
 
+    def _check_snapshot(self, strategy: BaseStrategy, snapshot: BacktestSnapshot):
+        """Reject a snapshot taken with other engine settings or strategy parameters"""
+        settings = (self.initial_capital, self.commission, self.slippage_pct)
+        if settings != (snapshot.initial_capital, snapshot.commission_per_trade, snapshot.slippage_pct):
+            raise ValueError("Snapshot was taken with different engine settings")
+        if strategy.parameters != snapshot.strategy_parameters:
+            raise ValueError("Snapshot was taken with different strategy parameters")
+
+    def _restore(self, strategy: BaseStrategy, snapshot: BacktestSnapshot):
+        """Load a snapshot's portfolio and strategy state"""
+        self._reset()
+        self.start_date = snapshot.start_date
+        self.cash = snapshot.cash
+        self.equity = snapshot.equity
+        self.positions = copy.deepcopy(snapshot.positions)
+        self.closed_trades = copy.deepcopy(snapshot.closed_trades)
+        self._carry = copy.deepcopy(snapshot.carry)
+        vars(strategy).update(copy.deepcopy(snapshot.strategy_state))
+
     def _get_trading_days(
         self,
         market_data: Dict[str, pd.DataFrame],
         start_date: datetime,
         end_date: datetime,
     ) -> List[datetime]:
-        """Get all trading days in the date range"""
-        # Use the first symbol's data to get trading days
-        if not market_data:
-            return []
-
-        first_symbol = list(market_data.keys())[0]
-        df = market_data[first_symbol]
-
-        # Filter by date range
-        mask = (df.index >= start_date) & (df.index <= end_date)
-        trading_days = df[mask].index.tolist()
-
-        return trading_days
+        """Get all trading days in the date range (union across symbols)"""
+        frames = [select_range(df, start_date, end_date) for df in market_data.values()]
+        return union_calendar(frames).tolist()
 
     def _get_historical_data(
         self,
@@ -163,101 +1114,119 @@ class BacktestEngine:
 
         return historical
 
-    def _execute_signal(
+    def _prepare_windows(
         self,
-        signal: Signal,
-        current_date: datetime,
         market_data: Dict[str, pd.DataFrame],
-    ):
-        """Execute a trading signal"""
-        symbol = signal.symbol
+        start_date: datetime,
+    ) -> Dict[str, tuple[pd.DataFrame, int]]:
+        """
+        Sort each symbol's data once and locate the backtest start row
 
-        # Get current price
-        if symbol not in market_data:
-            return
+        Returns:
+            Dict mapping symbol to (sorted frame, start position)
+        """
+        windows = {}
 
-        try:
-            current_price = market_data[symbol].loc[current_date, "close"]
-        except KeyError:
+        for symbol, df in market_data.items():
+            if not df.index.is_monotonic_increasing:
+                df = df.sort_index()
+
+            start = int(df.index.searchsorted(start_date, side="left"))
+            windows[symbol] = (df, start)
+
+        return windows
+
+    def _get_historical_windows(
+        self,
+        windows: Dict[str, tuple[pd.DataFrame, int]],
+        current_date: datetime,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Get market data up to current date as positional slices
+
+        Row slices share memory with the pre-sorted frames, so no data is
+        copied per day. Strategies must treat these windows as read-only.
+        """
+        historical = {}
+
+        for symbol, (df, start) in windows.items():
+            end = int(df.index.searchsorted(current_date, side="right"))
+            historical[symbol] = df.iloc[start:end]
+
+        return historical
+
+    def _execute_signal(self, signal: Signal, t: int):
+        """Execute a trading signal at row t of the price panel"""
+        # Only symbols with a bar today can trade
+        current_price = self.panel.price(t, signal.symbol)
+        if current_price is None:
             return
 
         if signal.action == "buy":
-            # Apply slippage (buy at slightly higher price)
-            execution_price = current_price * (1 + self.slippage_pct / 100)
+            self._open_position(signal.symbol, signal.quantity, current_price, t)
 
-            # Calculate position size
-            position_cost = execution_price * signal.quantity
+        elif signal.action == "sell":
+            # Close matching positions; a positive quantity closes part of them
+            quantity = signal.quantity if signal.quantity > 0 else None
+            self._close_lots(signal.symbol, current_price, t, quantity)
 
-            if position_cost <= self.cash:
-                # Open position
-                self.cash -= position_cost + self.commission
+    def _open_position(self, symbol: str, quantity: float, current_price: float, t: int):
+        """Open a new lot if there is enough cash to pay for it"""
+        # Apply slippage (buy at slightly higher price)
+        execution_price = current_price * (1 + self.slippage_pct / 100)
 
-                order = BacktestOrder(
-                    symbol=symbol,
-                    qty=signal.quantity,
-                    side="buy",
-                    entry_price=execution_price,
-                    entry_date=current_date,
-                )
+        # Calculate position size
+        position_cost = execution_price * quantity
 
-                self.positions.append(order)
+        if position_cost <= self.cash:
+            # Open position
+            self.cash -= position_cost + self.commission
 
-        elif signal.action == "sell":
-            # Close matching positions
-            self._close_positions(symbol, current_date, market_data)
+            self.positions.open(
+                symbol, quantity, execution_price, t, self._bar_times[t]
+            )
 
-    def _close_positions(
+    def _close_lots(
         self,
         symbol: str,
-        current_date: datetime,
-        market_data: Dict[str, pd.DataFrame],
+        current_price: float,
+        t: int,
+        quantity: Optional[float] = None,
     ):
-        """Close all positions for a symbol"""
-        try:
-            current_price = market_data[symbol].loc[current_date, "close"]
-        except KeyError:
+        """Close a symbol's lots oldest-first (all of them unless quantity is given)"""
+        if symbol not in self.positions:
             return
 
         # Apply slippage (sell at slightly lower price)
         execution_price = current_price * (1 - self.slippage_pct / 100)
 
-        # Find and close all positions for this symbol
-        positions_to_close = [p for p in self.positions if p.symbol == symbol]
-
-        for position in positions_to_close:
-            # Calculate P&L
-            pnl = (execution_price - position.entry_price) * position.qty
-            pnl -= self.commission
-            pnl_pct = ((execution_price - position.entry_price) / position.entry_price) * 100
-
-            # Update position
-            position.exit_price = execution_price
-            position.exit_date = current_date
-            position.pnl = pnl
-            position.pnl_pct = pnl_pct
-
-            # Update cash
-            self.cash += (execution_price * position.qty) - self.commission
-
-            # Move to closed trades
-            self.closed_trades.append(position)
-            self.positions.remove(position)
+        lots = self.positions.close(symbol, quantity)
+        if not len(lots):
+            return
 
-    def _update_portfolio_value(
-        self,
-        current_date: datetime,
-        market_data: Dict[str, pd.DataFrame],
-    ):
-        """Update total portfolio value"""
-        positions_value = 0.0
+        # P&L per lot, each paying its own commission
+        pnl = (execution_price - lots.entry_price) * lots.qty - self.commission
+        pnl_pct = ((execution_price - lots.entry_price) / lots.entry_price) * 100
+
+        # Update cash
+        self.cash += float(np.sum(execution_price * lots.qty)) - self.commission * len(lots)
+
+        # Record closed trades
+        self.closed_trades.append(
+            symbol,
+            lots.qty,
+            lots.entry_price,
+            lots.entry_time,
+            execution_price,
+            self._bar_times[t],
+            pnl,
+            pnl_pct,
+        )
 
-        for position in self.positions:
-            try:
-                current_price = market_data[position.symbol].loc[current_date, "close"]
-                positions_value += current_price * position.qty
-            except KeyError:
-                # Use entry price if no current data
-                positions_value += position.entry_price * position.qty
+    def _update_portfolio_value(self, t: int):
+        """Update total portfolio value at row t of the price panel"""
+        # Mark to the last known close, or to cost before a symbol's first bar
+        positions_value = self.positions.market_value(self.panel.marks[t], self.panel.columns)
 
         self.equity = self.cash + positions_value
 
@@ -266,10 +1235,11 @@ class BacktestEngine:
         market_data: Dict[str, pd.DataFrame],
         start_date: datetime,
         end_date: datetime,
+        bars_per_day: float = 1.0,
     ) -> BacktestMetrics:
-        """Calculate backtest performance metrics"""
-        # Total return
-        total_return = ((self.equity - self.initial_capital) / self.initial_capital) * 100
+        """Calculate backtest performance metrics (bars_per_day > 1 for intraday curves)"""
+        curve = self.equity_curve
+        trades = self.closed_trades
 
         # Buy and hold return (using first symbol)
         buy_hold_return = 0.0
@@ -284,113 +1254,112 @@ class BacktestEngine:
             except KeyError:
                 pass
 
-        # Win rate and trade stats
-        winning_trades = [t for t in self.closed_trades if t.pnl > 0]
-        losing_trades = [t for t in self.closed_trades if t.pnl <= 0]
-
-        total_trades = len(self.closed_trades)
-        win_rate = (len(winning_trades) / total_trades * 100) if total_trades > 0 else 0
-
-        avg_win = np.mean([t.pnl for t in winning_trades]) if winning_trades else 0
-        avg_loss = np.mean([t.pnl for t in losing_trades]) if losing_trades else 0
-
-        # Average trade duration
-        durations = []
-        for trade in self.closed_trades:
-            if trade.exit_date:
-                duration = (trade.exit_date - trade.entry_date).days
-                durations.append(duration)
-
-        avg_duration = np.mean(durations) if durations else 0
-
-        # Max drawdown
-        max_dd = self._calculate_max_drawdown()
-
-        # Sharpe ratio (simplified)
-        sharpe = self._calculate_sharpe_ratio()
+        periods_per_year = TRADING_DAYS_PER_YEAR * bars_per_day
+        performance = performance_stats(
+            curve.equity, curve.positions_value, self.initial_capital, periods_per_year
+        )
+        trade = trade_stats(trades.pnl, trades.duration_days)
 
-        # Consecutive wins/losses
-        max_consec_wins, max_consec_losses = self._calculate_consecutive_trades()
+        # Both legs of every closed trade
+        traded_value = float(np.sum(trades.qty * (trades.entry_price + trades.exit_price)))
 
         return BacktestMetrics(
-            total_return=total_return,
+            total_return=performance.total_return,
             buy_and_hold_return=buy_hold_return,
-            max_drawdown=max_dd,
-            sharpe_ratio=sharpe,
-            win_rate=win_rate,
-            total_trades=total_trades,
-            winning_trades=len(winning_trades),
-            losing_trades=len(losing_trades),
-            avg_win=avg_win,
-            avg_loss=avg_loss,
-            avg_trade_duration_days=avg_duration,
-            max_consecutive_wins=max_consec_wins,
-            max_consecutive_losses=max_consec_losses,
+            max_drawdown=performance.max_drawdown,
+            sharpe_ratio=performance.sharpe_ratio,
+            win_rate=trade.win_rate,
+            total_trades=trade.total_trades,
+            winning_trades=trade.winning_trades,
+            losing_trades=trade.losing_trades,
+            avg_win=trade.avg_win,
+            avg_loss=trade.avg_loss,
+            avg_trade_duration_days=trade.avg_trade_duration_days,
+            max_consecutive_wins=trade.max_consecutive_wins,
+            max_consecutive_losses=trade.max_consecutive_losses,
+            annualized_return=performance.annualized_return,
+            max_drawdown_duration_days=int(performance.max_drawdown_duration / bars_per_day),
+            sortino_ratio=performance.sortino_ratio,
+            calmar_ratio=performance.calmar_ratio,
+            exposure_pct=performance.exposure_pct,
+            turnover=turnover(traded_value, curve.equity, periods_per_year),
         )
 
-    def _calculate_max_drawdown(self) -> float:
-        """Calculate maximum drawdown percentage"""
-        if not self.equity_curve:
-            return 0.0
-
-        equity_values = [point["equity"] for point in self.equity_curve]
-        peak = equity_values[0]
-        max_dd = 0.0
-
-        for value in equity_values:
-            if value > peak:
-                peak = value
-
-            dd = ((peak - value) / peak) * 100
-            if dd > max_dd:
-                max_dd = dd
-
-        return -max_dd  # Return as negative
 
-    def _calculate_sharpe_ratio(self) -> float:
-        """Calculate Sharpe ratio (simplified)"""
-        if len(self.equity_curve) < 2:
-            return 0.0
-
-        returns = []
-        for i in range(1, len(self.equity_curve)):
-            prev_equity = self.equity_curve[i - 1]["equity"]
-            curr_equity = self.equity_curve[i]["equity"]
-            ret = (curr_equity - prev_equity) / prev_equity
-            returns.append(ret)
-
-        if not returns:
-            return 0.0
-
-        avg_return = np.mean(returns)
-        std_return = np.std(returns)
-
-        if std_return == 0:
-            return 0.0
-
-        # Annualize (assuming daily returns)
-        sharpe = (avg_return / std_return) * np.sqrt(252)
-
-        return sharpe
-
-    def _calculate_consecutive_trades(self) -> tuple[int, int]:
-        """Calculate max consecutive wins and losses"""
-        if not self.closed_trades:
-            return 0, 0
-
-        max_wins = 0
-        max_losses = 0
-        current_wins = 0
-        current_losses = 0
-
-        for trade in self.closed_trades:
-            if trade.pnl > 0:
-                current_wins += 1
-                current_losses = 0
-                max_wins = max(max_wins, current_wins)
-            else:
-                current_losses += 1
-                current_wins = 0
-                max_losses = max(max_losses, current_losses)
+@contextmanager
+def _unshared_indicators(strategies: List[BaseStrategy]):
+    """
+    Keep the strategies' analyze() calls out of the shared indicator cache
 
-        return max_wins, max_losses
+    Each day of a day-by-day backtest sees a new window, so caching it
+    would only evict the entries of live strategies in this process.
+    """
+    for strategy in strategies:
+        strategy.shared_indicators = False
+    try:
+        yield
+    finally:
+        for strategy in strategies:
+            # Back to the class setting; a resumed checkpoint may have restored the override
+            vars(strategy).pop("shared_indicators", None)
+
+
+def _holdings_value(
+    changes: List[tuple],
+    marks: np.ndarray,
+    has_mark: np.ndarray,
+    start_row: int,
+    qty_start: np.ndarray,
+    cost_start: np.ndarray,
+    chunk_size: Optional[int] = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rebuild the daily value of holdings from sparse holdings changes
+
+    Args:
+        changes: (row, column, qty delta, cost delta) tuples, rows counted
+            from the start of the panel
+        marks: Last known close per (day, symbol) from start_row on
+        has_mark: Where marks is not NaN
+        start_row: Panel row of marks[0]
+        qty_start: Quantity held per symbol before marks[0]
+        cost_start: Entry cost held per symbol before marks[0]
+        chunk_size: Symbol columns rebuilt at once (None: all of them)
+
+    Returns:
+        Tuple of (value per day, final quantity, final cost) with holdings
+        marked to the last known close, or to entry cost before a first bar
+    """
+    num_days, num_symbols = marks.shape
+
+    change_rows, change_cols, change_qty, change_cost = (
+        np.array(column) for column in zip(*changes)
+    ) if changes else (np.empty(0, dtype=np.int64),) * 2 + (np.empty(0),) * 2
+
+    positions_value = np.zeros(num_days)
+    qty_end, cost_end = qty_start.copy(), cost_start.copy()
+    step = chunk_size or max(num_symbols, 1)
+
+    for j0 in range(0, num_symbols, step):
+        cols = slice(j0, j0 + step)
+        width = min(step, num_symbols - j0)
+        touched = (change_cols >= j0) & (change_cols < j0 + width)
+        at = (change_rows[touched] - start_row, change_cols[touched] - j0)
+
+        # Cumulative holdings, built in place from the starting row
+        qty = np.zeros((num_days, width))
+        cost = np.zeros((num_days, width))
+        qty[at] = change_qty[touched]
+        cost[at] = change_cost[touched]
+        qty[0] += qty_start[cols]
+        cost[0] += cost_start[cols]
+        np.cumsum(qty, axis=0, out=qty)
+        np.cumsum(cost, axis=0, out=cost)
+        qty_end[cols] = qty[-1]
+        cost_end[cols] = cost[-1]
+
+        qty *= np.nan_to_num(marks[:, cols])
+        np.copyto(qty, cost, where=~has_mark[:, cols])
+        positions_value += qty.sum(axis=1)
+
+    return positions_value, qty_end, cost_end
@@ -0,0 +1,253 @@
+"""Vectorized performance statistics for equity curves and trade logs
+
+Every function works on plain NumPy arrays, so the same code scores a
+backtest's EquityCurve/TradeLog and a live account's PortfolioSnapshot
+history.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Periods per year for daily bars
+TRADING_DAYS_PER_YEAR = 252
+
+
+@dataclass
+class PerformanceStats:
+    """Statistics of an equity curve"""
+    total_return: float  # percent
+    annualized_return: float  # percent
+    max_drawdown: float  # percent, negative
+    max_drawdown_duration: int  # longest stretch below a prior peak, in periods
+    sharpe_ratio: float
+    sortino_ratio: float
+    calmar_ratio: float
+    exposure_pct: float  # average share of equity held in positions
+
+
+@dataclass
+class TradeStats:
+    """Statistics of a list of closed trades"""
+    total_trades: int
+    winning_trades: int
+    losing_trades: int
+    win_rate: float
+    avg_win: float
+    avg_loss: float
+    avg_trade_duration_days: float
+    max_consecutive_wins: int
+    max_consecutive_losses: int
+
+
+def returns(equity: np.ndarray) -> np.ndarray:
+    """Simple period-over-period returns"""
+    equity = np.asarray(equity, dtype=np.float64)
+    if len(equity) < 2:
+        return np.empty(0)
+    return np.diff(equity) / equity[:-1]
+
+
+def drawdown(equity: np.ndarray) -> np.ndarray:
+    """Percent below the running peak at each period (<= 0)"""
+    equity = np.asarray(equity, dtype=np.float64)
+    if len(equity) == 0:
+        return np.empty(0)
+    peak = np.maximum.accumulate(equity)
+    return (equity - peak) / peak * 100
+
+
+def run_lengths(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Run-length encode a 1-D array
+
+    Returns:
+        Tuple of (value of each run, length of each run)
+    """
+    values = np.asarray(values)
+    if len(values) == 0:
+        return values[:0], np.empty(0, dtype=np.int64)
+
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    lengths = np.diff(np.r_[starts, len(values)])
+    return values[starts], lengths
+
+
+def longest_run(mask: np.ndarray) -> int:
+    """Length of the longest run of True values"""
+    values, lengths = run_lengths(np.asarray(mask, dtype=bool))
+    lengths = lengths[values]
+    return int(lengths.max()) if len(lengths) else 0
+
+
+def sharpe_ratio(period_returns: np.ndarray, periods_per_year: int = TRADING_DAYS_PER_YEAR) -> float:
+    """Annualized Sharpe ratio (zero risk-free rate)"""
+    if len(period_returns) == 0:
+        return 0.0
+
+    std = period_returns.std()
+    if std == 0:
+        return 0.0
+
+    return float(period_returns.mean() / std * np.sqrt(periods_per_year))
+
+
+def sortino_ratio(period_returns: np.ndarray, periods_per_year: int = TRADING_DAYS_PER_YEAR) -> float:
+    """Annualized Sortino ratio (downside deviation below zero)"""
+    if len(period_returns) == 0:
+        return 0.0
+
+    downside = np.sqrt(np.mean(np.minimum(period_returns, 0.0) ** 2))
+    if downside == 0:
+        return 0.0
+
+    return float(period_returns.mean() / downside * np.sqrt(periods_per_year))
+
+
+def rolling_sharpe(
+    period_returns: np.ndarray,
+    window: int,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+) -> np.ndarray:
+    """
+    Annualized Sharpe ratio over a trailing window of returns
+
+    Computed in O(n) from cumulative sums of returns and squared returns.
+    The first window - 1 values, and windows with zero variance, are NaN.
+    """
+    period_returns = np.asarray(period_returns, dtype=np.float64)
+    out = np.full(len(period_returns), np.nan)
+    if window < 2 or len(period_returns) < window:
+        return out
+
+    sums = np.cumsum(np.r_[0.0, period_returns])
+    squares = np.cumsum(np.r_[0.0, period_returns ** 2])
+    mean = (sums[window:] - sums[:-window]) / window
+    var = (squares[window:] - squares[:-window]) / window - mean ** 2
+
+    std = np.sqrt(np.maximum(var, 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(std > 1e-12, mean / std * np.sqrt(periods_per_year), np.nan)
+    out[window - 1:] = ratio
+
+    return out
+
+
+def turnover(
+    traded_value: float,
+    equity: np.ndarray,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+) -> float:
+    """Annualized one-way turnover: half the traded value over average equity, per year"""
+    if len(equity) == 0:
+        return 0.0
+
+    average_equity = float(np.mean(equity))
+    if average_equity <= 0:
+        return 0.0
+
+    return float(traded_value / 2 / average_equity * periods_per_year / len(equity))
+
+
+def performance_stats(
+    equity: np.ndarray,
+    positions_value: Optional[np.ndarray] = None,
+    initial_capital: Optional[float] = None,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+) -> PerformanceStats:
+    """
+    Score an equity curve in one pass over its arrays
+
+    Args:
+        equity: Portfolio value per period
+        positions_value: Value held in positions per period (for exposure)
+        initial_capital: Starting value for returns (default: equity[0])
+        periods_per_year: Annualization factor
+
+    Returns:
+        PerformanceStats
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if len(equity) == 0:
+        return PerformanceStats(0.0, 0.0, 0.0, 0, 0.0, 0.0, 0.0, 0.0)
+
+    start = float(initial_capital) if initial_capital is not None else float(equity[0])
+    final = float(equity[-1])
+    total_return = (final - start) / start * 100
+
+    years = len(equity) / periods_per_year
+    growth = final / start
+    annualized_return = (growth ** (1 / years) - 1) * 100 if growth > 0 else -100.0
+
+    dd = drawdown(equity)
+    max_dd = float(dd.min())
+    calmar = annualized_return / -max_dd if max_dd < 0 else 0.0
+
+    period_returns = returns(equity)
+
+    exposure = 0.0
+    if positions_value is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            share = np.where(equity > 0, np.asarray(positions_value) / equity, 0.0)
+        exposure = float(share.mean() * 100)
+
+    return PerformanceStats(
+        total_return=total_return,
+        annualized_return=annualized_return,
+        max_drawdown=max_dd,
+        max_drawdown_duration=longest_run(dd < 0),
+        sharpe_ratio=sharpe_ratio(period_returns, periods_per_year),
+        sortino_ratio=sortino_ratio(period_returns, periods_per_year),
+        calmar_ratio=calmar,
+        exposure_pct=exposure,
+    )
+
+
+def trade_stats(pnl: np.ndarray, durations: Optional[np.ndarray] = None) -> TradeStats:
+    """
+    Score closed trades in the order they were closed
+
+    Args:
+        pnl: Realized P&L per trade
+        durations: Holding period per trade, in days
+
+    Returns:
+        TradeStats (a trade with pnl <= 0 counts as a loss)
+    """
+    pnl = np.asarray(pnl, dtype=np.float64)
+    total = len(pnl)
+    wins = pnl > 0
+
+    win_pnl = pnl[wins]
+    loss_pnl = pnl[~wins]
+
+    avg_duration = 0.0
+    if durations is not None and len(durations):
+        avg_duration = float(np.mean(durations))
+
+    return TradeStats(
+        total_trades=total,
+        winning_trades=len(win_pnl),
+        losing_trades=len(loss_pnl),
+        win_rate=len(win_pnl) / total * 100 if total else 0.0,
+        avg_win=float(win_pnl.mean()) if len(win_pnl) else 0.0,
+        avg_loss=float(loss_pnl.mean()) if len(loss_pnl) else 0.0,
+        avg_trade_duration_days=avg_duration,
+        max_consecutive_wins=longest_run(wins),
+        max_consecutive_losses=longest_run(~wins),
+    )
+
+
+def snapshot_stats(
+    snapshots: Sequence,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+) -> PerformanceStats:
+    """
+    Score a live account from PortfolioSnapshot rows (oldest first)
+
+    Snapshots are expected once per period (daily by default).
+    """
+    equity = np.array([s.equity for s in snapshots], dtype=np.float64)
+    cash = np.array([s.cash for s in snapshots], dtype=np.float64)
+    return performance_stats(equity, equity - cash, periods_per_year=periods_per_year)
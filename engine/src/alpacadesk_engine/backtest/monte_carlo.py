@@ -0,0 +1,195 @@
+"""Monte Carlo resampling of backtest results
+
+Both resamplers draw every path of a batch at once as a (paths x steps)
+matrix and score the batch with array operations, so the only Python
+loop is over batches of at most BATCH_CELLS values.
+"""
+
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .metrics import TRADING_DAYS_PER_YEAR
+
+# Upper bound on (paths x steps) values resampled per batch (16 MB of float64)
+BATCH_CELLS = 2 ** 21
+
+
+@dataclass
+class Distribution:
+    """Summary of one statistic across resampled paths"""
+    mean: float
+    std: float
+    p5: float
+    p25: float
+    median: float
+    p75: float
+    p95: float
+
+    @classmethod
+    def of(cls, values: np.ndarray) -> "Distribution":
+        p5, p25, median, p75, p95 = np.percentile(values, [5, 25, 50, 75, 95])
+        return cls(
+            mean=float(values.mean()),
+            std=float(values.std()),
+            p5=float(p5),
+            p25=float(p25),
+            median=float(median),
+            p75=float(p75),
+            p95=float(p95),
+        )
+
+
+@dataclass
+class MonteCarloResult:
+    """Distributions of path statistics, in the units of BacktestMetrics"""
+    method: str  # 'trades' or 'block_bootstrap'
+    resamples: int
+    path_length: int  # Trades or periods per resampled path
+    block_size: Optional[int]
+    total_return: Distribution  # percent
+    max_drawdown: Distribution  # percent, negative
+    sharpe_ratio: Distribution
+    probability_of_loss: float  # Share of paths ending below their start, percent
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def bootstrap_trades(
+    pnl: np.ndarray,
+    initial_capital: float,
+    resamples: int = 10000,
+    trades_per_year: Optional[float] = None,
+    seed: Optional[int] = None,
+) -> MonteCarloResult:
+    """
+    Resample closed trades with replacement into alternative trade sequences
+
+    Each path draws len(pnl) trades and adds their P&L to initial_capital
+    in the drawn order, which changes drawdowns and Sharpe but not the
+    expected total return. Sharpe is computed over per-trade returns.
+
+    Args:
+        pnl: Realized P&L per closed trade (TradeLog.pnl)
+        initial_capital: Starting equity of every path
+        resamples: Number of paths
+        trades_per_year: Annualizes Sharpe (None: per-trade Sharpe)
+        seed: Random seed, for reproducible results
+
+    Raises:
+        ValueError: If there are fewer than two trades
+    """
+    pnl = np.asarray(pnl, dtype=np.float64)
+    if len(pnl) < 2:
+        raise ValueError("Trade bootstrap needs at least two closed trades")
+
+    rng = np.random.default_rng(seed)
+    n = len(pnl)
+
+    def draw(batch: int) -> np.ndarray:
+        equity = np.empty((batch, n + 1))
+        equity[:, 0] = initial_capital
+        np.cumsum(pnl[rng.integers(0, n, size=(batch, n))], axis=1, out=equity[:, 1:])
+        equity[:, 1:] += initial_capital
+        return equity
+
+    return _resample("trades", draw, n, resamples, trades_per_year or 1.0, None)
+
+
+def block_bootstrap(
+    period_returns: np.ndarray,
+    resamples: int = 10000,
+    block_size: Optional[int] = None,
+    periods_per_year: float = TRADING_DAYS_PER_YEAR,
+    seed: Optional[int] = None,
+) -> MonteCarloResult:
+    """
+    Circular block bootstrap of an equity curve's period returns
+
+    Paths are built from blocks of block_size consecutive returns starting
+    at random periods (wrapping around the end), which keeps short-range
+    autocorrelation and volatility clustering that a per-period bootstrap
+    would destroy.
+
+    Args:
+        period_returns: Simple returns per period (metrics.returns(equity))
+        resamples: Number of paths
+        block_size: Periods per block (default: cube root of the length)
+        periods_per_year: Annualization factor for Sharpe
+        seed: Random seed, for reproducible results
+
+    Raises:
+        ValueError: If there are fewer than two returns
+    """
+    period_returns = np.asarray(period_returns, dtype=np.float64)
+    n = len(period_returns)
+    if n < 2:
+        raise ValueError("Block bootstrap needs at least two period returns")
+
+    block_size = min(max(1, block_size or round(n ** (1 / 3))), n)
+    blocks = -(-n // block_size)
+    offsets = np.arange(block_size)
+    growth = 1.0 + period_returns
+    rng = np.random.default_rng(seed)
+
+    def draw(batch: int) -> np.ndarray:
+        starts = rng.integers(0, n, size=(batch, blocks, 1))
+        rows = ((starts + offsets) % n).reshape(batch, -1)[:, :n]
+
+        equity = np.empty((batch, n + 1))
+        equity[:, 0] = 1.0
+        np.cumprod(growth[rows], axis=1, out=equity[:, 1:])
+        return equity
+
+    return _resample("block_bootstrap", draw, n, resamples, periods_per_year, block_size)
+
+
+def _resample(method, draw, n, resamples, periods_per_year, block_size) -> MonteCarloResult:
+    """Draw and score paths in batches of at most BATCH_CELLS values"""
+    if resamples < 1:
+        raise ValueError("resamples must be at least 1")
+
+    total_return = np.empty(resamples)
+    max_drawdown = np.empty(resamples)
+    sharpe = np.empty(resamples)
+    batch = max(1, BATCH_CELLS // (n + 1))
+
+    for start in range(0, resamples, batch):
+        rows = slice(start, min(start + batch, resamples))
+        total_return[rows], max_drawdown[rows], sharpe[rows] = _path_stats(
+            draw(rows.stop - rows.start), periods_per_year
+        )
+
+    return MonteCarloResult(
+        method=method,
+        resamples=resamples,
+        path_length=n,
+        block_size=block_size,
+        total_return=Distribution.of(total_return),
+        max_drawdown=Distribution.of(max_drawdown),
+        sharpe_ratio=Distribution.of(sharpe),
+        probability_of_loss=float(np.mean(total_return < 0) * 100),
+    )
+
+
+def _path_stats(equity: np.ndarray, periods_per_year: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Total return, max drawdown and Sharpe of each row of a (paths x periods + 1) equity matrix
+
+    Same definitions as metrics.performance_stats(), applied along rows.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total_return = (equity[:, -1] / equity[:, 0] - 1) * 100
+
+        peak = np.maximum.accumulate(equity, axis=1)
+        max_drawdown = ((equity - peak) / peak).min(axis=1) * 100
+
+        period_returns = np.diff(equity, axis=1)
+        period_returns /= equity[:, :-1]
+        mean = period_returns.mean(axis=1)
+        std = period_returns.std(axis=1)
+        sharpe = np.where(std > 0, mean / std, 0.0) * np.sqrt(periods_per_year)
+
+    return total_return, max_drawdown, np.nan_to_num(sharpe)
@@ -0,0 +1,175 @@
+"""Dense date x symbol price panel for the backtest engine"""
+
+from datetime import datetime
+from typing import List, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class PricePanel:
+    """
+    Closing prices aligned on a union trading calendar
+
+    Prices are stored as a C-contiguous (dates x symbols) float64 matrix
+    with a validity mask, so the engine resolves any price by integer
+    (row, column) in O(1) instead of a per-lookup .loc on a DataFrame.
+
+    Attributes:
+        dates: Union of every symbol's bar timestamps in the range
+        symbols: Column order of the matrices
+        close: Closing price, NaN where the symbol has no bar that day
+        valid: True where the symbol has a bar that day
+        marks: Last known close as of each day (forward-filled), NaN
+            before a symbol's first bar; used for mark-to-market
+    """
+
+    def __init__(
+        self,
+        dates: pd.DatetimeIndex,
+        symbols: List[str],
+        close: np.ndarray,
+        valid: np.ndarray,
+        marks: Optional[np.ndarray] = None,
+    ):
+        self.dates = dates
+        self.symbols = symbols
+        self.close = close
+        self.valid = valid
+        self.marks = marks if marks is not None else _forward_fill(close, valid)
+        self.columns: Dict[str, int] = {symbol: j for j, symbol in enumerate(symbols)}
+
+    @classmethod
+    def from_market_data(
+        cls,
+        market_data: Dict[str, pd.DataFrame],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        symbols: Optional[List[str]] = None,
+    ) -> "PricePanel":
+        """
+        Build a panel from per-symbol OHLCV frames
+
+        Args:
+            market_data: Historical market data for all symbols
+            start_date: First calendar date to include (None for unbounded)
+            end_date: Last calendar date to include (None for unbounded)
+            symbols: Columns to include, in order (default: all of market_data);
+                symbols without bars in the range are dropped
+        """
+        frames = {s: select_range(df, start_date, end_date) for s, df in market_data.items()}
+
+        # The calendar always spans every symbol, even ones left out of the columns
+        dates = union_calendar(frames.values())
+
+        if symbols is None:
+            symbols = list(market_data.keys())
+        symbols = [s for s in symbols if s in frames and not frames[s].empty]
+
+        close = np.full((len(dates), len(symbols)), np.nan)
+        for j, symbol in enumerate(symbols):
+            df = frames[symbol]
+            rows = dates.get_indexer(df.index)
+            close[rows, j] = df["close"].to_numpy(dtype=np.float64)
+
+        return cls(dates, symbols, close, ~np.isnan(close))
+
+    @classmethod
+    def continued(
+        cls,
+        frames: Dict[str, pd.DataFrame],
+        symbols: List[str],
+        prior_marks: Optional[np.ndarray] = None,
+    ) -> "PricePanel":
+        """
+        Panel for the next chunk of a run streamed in chunks
+
+        Unlike from_market_data(), every symbol keeps its column whether or
+        not it has bars in the chunk, and marks start from prior_marks (the
+        previous chunk's last row) instead of NaN.
+
+        Args:
+            frames: The chunk's bars per symbol (symbols may be missing)
+            symbols: Columns, in the same order for every chunk
+            prior_marks: Marks carried in from the previous chunk
+        """
+        dates = union_calendar(frames.values())
+
+        close = np.full((len(dates), len(symbols)), np.nan)
+        for j, symbol in enumerate(symbols):
+            df = frames.get(symbol)
+            if df is not None:
+                close[dates.get_indexer(df.index), j] = df["close"].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(close)
+
+        if prior_marks is None:
+            return cls(dates, symbols, close, valid)
+
+        # Forward-fill from a seed row holding the carried marks
+        seeded = np.vstack([prior_marks, close])
+        marks = _forward_fill(seeded, np.vstack([~np.isnan(prior_marks), valid]))[1:]
+        return cls(dates, symbols, close, valid, marks)
+
+    @property
+    def trading_days(self) -> List[datetime]:
+        """Calendar as a list of timestamps"""
+        return self.dates.tolist()
+
+    def row(self, date: datetime) -> int:
+        """Integer row of a calendar date (raises KeyError if absent)"""
+        return self.dates.get_loc(date)
+
+    def price(self, t: int, symbol: str) -> Optional[float]:
+        """Close of a symbol on row t, or None if it has no bar that day"""
+        j = self.columns.get(symbol)
+        if j is None or not self.valid[t, j]:
+            return None
+        return float(self.close[t, j])
+
+    def slice(self, start: int, end: int) -> "PricePanel":
+        """Rows [start, end) as views over the same matrices"""
+        return PricePanel(
+            self.dates[start:end],
+            self.symbols,
+            self.close[start:end],
+            self.valid[start:end],
+            self.marks[start:end],
+        )
+
+
+def union_calendar(frames) -> pd.DatetimeIndex:
+    """Sorted union of the timestamps of several frames"""
+    indexes = [df.index for df in frames if len(df)]
+    if not indexes:
+        return pd.DatetimeIndex([])
+
+    return indexes[0].append(indexes[1:]).unique().sort_values()
+
+
+def select_range(
+    df: pd.DataFrame, start_date: Optional[datetime], end_date: Optional[datetime]
+) -> pd.DataFrame:
+    """Rows of df within [start_date, end_date], sorted and de-duplicated by timestamp"""
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    if df.index.has_duplicates:
+        df = df[~df.index.duplicated(keep="last")]
+
+    start = 0 if start_date is None else df.index.searchsorted(start_date, side="left")
+    end = len(df) if end_date is None else df.index.searchsorted(end_date, side="right")
+
+    return df.iloc[start:end]
+
+
+def _forward_fill(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Carry the last valid value down each column"""
+    if values.size == 0:
+        return values.copy()
+
+    rows = np.where(valid, np.arange(values.shape[0])[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+
+    filled = np.take_along_axis(values, rows, axis=0)
+    filled[~np.logical_or.accumulate(valid, axis=0)] = np.nan
+
+    return filled
@@ -0,0 +1,50 @@
+"""Per-strategy attribution for multi-strategy portfolio backtests"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .positions import PositionBook
+
+
+@dataclass
+class StrategyAttribution:
+    """
+    One strategy's share of a portfolio backtest
+
+    Strategy P&L is the net cash its fills moved (proceeds minus costs and
+    commissions) plus the marked value of its open lots, so the strategies'
+    P&L sums exactly to the portfolio's.
+    """
+    name: str
+    pnl: float  # Realized plus unrealized, at the end of the run
+    realized_pnl: float  # Sum of closed trade P&L
+    contribution_pct: float  # pnl as a percent of initial capital
+    total_trades: int
+    win_rate: float
+    pnl_curve: np.ndarray  # Cumulative P&L per portfolio day
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary without the daily curve"""
+        return {
+            "name": self.name,
+            "pnl": self.pnl,
+            "realized_pnl": self.realized_pnl,
+            "contribution_pct": self.contribution_pct,
+            "total_trades": self.total_trades,
+            "win_rate": self.win_rate,
+        }
+
+
+def merge_books(books: List[PositionBook]) -> PositionBook:
+    """One book holding every lot of several books"""
+    merged = PositionBook()
+    for book in books:
+        for symbol in book:
+            lots = book.lots(symbol)
+            for i in range(len(lots)):
+                merged.open(
+                    symbol, lots.qty[i], lots.entry_price[i], lots.entry_index[i], lots.entry_time[i]
+                )
+    return merged
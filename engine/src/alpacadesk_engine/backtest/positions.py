@@ -0,0 +1,269 @@
+"""Symbol-indexed position book for the backtest engine"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class Lots:
+    """Parallel arrays describing a set of lots"""
+    qty: np.ndarray
+    entry_price: np.ndarray
+    entry_index: np.ndarray
+    entry_time: np.ndarray  # datetime64[ns]
+
+    def __len__(self) -> int:
+        return len(self.qty)
+
+
+def _no_lots() -> Lots:
+    """An empty set of lots"""
+    return Lots(
+        np.empty(0), np.empty(0), np.empty(0, dtype=np.int64), np.empty(0, dtype="datetime64[ns]")
+    )
+
+
+class _SymbolLots:
+    """
+    FIFO queue of one symbol's open lots in growable arrays
+
+    Live lots occupy [start, end). Closing consumes from the front by
+    advancing start; the arrays are compacted once the dead prefix
+    outgrows the live part, so every operation is amortized O(1) per lot.
+    """
+
+    __slots__ = ("qty", "entry_price", "entry_index", "entry_time", "start", "end",
+                 "total_qty", "total_cost")
+
+    def __init__(self, capacity: int = 4):
+        self.qty = np.empty(capacity, dtype=np.float64)
+        self.entry_price = np.empty(capacity, dtype=np.float64)
+        self.entry_index = np.empty(capacity, dtype=np.int64)
+        self.entry_time = np.empty(capacity, dtype="datetime64[ns]")
+        self.start = 0
+        self.end = 0
+        self.total_qty = 0.0
+        self.total_cost = 0.0
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def append(self, qty: float, entry_price: float, entry_index: int, entry_time: np.datetime64):
+        if self.end == len(self.qty):
+            self._grow()
+
+        i = self.end
+        self.qty[i] = qty
+        self.entry_price[i] = entry_price
+        self.entry_index[i] = entry_index
+        self.entry_time[i] = entry_time
+        self.end += 1
+
+        self.total_qty += qty
+        self.total_cost += qty * entry_price
+
+    def pop_front(self, qty: Optional[float]) -> Lots:
+        """Remove up to qty shares oldest-first (all lots when qty is None)"""
+        live = slice(self.start, self.end)
+
+        if qty is None or qty >= self.total_qty:
+            closed = Lots(
+                self.qty[live].copy(),
+                self.entry_price[live].copy(),
+                self.entry_index[live].copy(),
+                self.entry_time[live].copy(),
+            )
+            self.start = self.end = 0
+            self.total_qty = 0.0
+            self.total_cost = 0.0
+            return closed
+
+        # Whole lots covered by qty, then a fragment of the next one
+        covered = np.cumsum(self.qty[live])
+        whole = int(np.searchsorted(covered, qty, side="right"))
+        remainder = qty - (covered[whole - 1] if whole else 0.0)
+
+        stop = self.start + whole
+        closed_qty = self.qty[self.start:stop].copy()
+        if remainder > 1e-12:
+            closed_qty = np.append(closed_qty, remainder)
+            self.qty[stop] -= remainder
+            stop_fragment = stop + 1
+        else:
+            stop_fragment = stop
+
+        closed = Lots(
+            closed_qty,
+            self.entry_price[self.start:stop_fragment].copy(),
+            self.entry_index[self.start:stop_fragment].copy(),
+            self.entry_time[self.start:stop_fragment].copy(),
+        )
+
+        self.start = stop
+        self.total_qty -= qty
+        self.total_cost -= float(np.dot(closed.qty, closed.entry_price))
+        self._compact()
+
+        return closed
+
+    def _grow(self):
+        """Double capacity, dropping the consumed prefix"""
+        size = len(self)
+        capacity = max(4, 2 * size)
+        for name in ("qty", "entry_price", "entry_index", "entry_time"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:size] = old[self.start:self.end]
+            setattr(self, name, new)
+        self.start, self.end = 0, size
+
+    def _compact(self):
+        """Shift live lots to the front once the dead prefix dominates"""
+        if self.start > len(self):
+            size = len(self)
+            for name in ("qty", "entry_price", "entry_index", "entry_time"):
+                arr = getattr(self, name)
+                arr[:size] = arr[self.start:self.end]
+            self.start, self.end = 0, size
+
+
+class PositionBook:
+    """
+    Open lots keyed by symbol
+
+    Each symbol's lots live in compact arrays (qty, entry price, entry
+    index, entry time), with running quantity and cost totals. Closing,
+    marking to market and exposure queries only touch the lots of the
+    symbols involved, and closes can take part of a position FIFO.
+    """
+
+    def __init__(self):
+        self._books: Dict[str, _SymbolLots] = {}
+
+    def open(
+        self,
+        symbol: str,
+        qty: float,
+        entry_price: float,
+        entry_index: int,
+        entry_time: np.datetime64,
+    ):
+        """Add a lot"""
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _SymbolLots()
+        book.append(qty, entry_price, entry_index, entry_time)
+
+    def close(self, symbol: str, qty: Optional[float] = None) -> Lots:
+        """
+        Close a symbol's lots oldest-first
+
+        Args:
+            symbol: Symbol to close
+            qty: Shares to close; None (or more than held) closes everything
+
+        Returns:
+            The closed lots, with the last one split on a partial close
+        """
+        book = self._books.get(symbol)
+        if book is None:
+            return _no_lots()
+
+        closed = book.pop_front(qty)
+        if len(book) == 0:
+            del self._books[symbol]
+
+        return closed
+
+    def quantity(self, symbol: str) -> float:
+        """Total shares held in a symbol"""
+        book = self._books.get(symbol)
+        return book.total_qty if book else 0.0
+
+    def cost_basis(self, symbol: str) -> float:
+        """Total entry cost of a symbol's open lots"""
+        book = self._books.get(symbol)
+        return book.total_cost if book else 0.0
+
+    def lots(self, symbol: str) -> Lots:
+        """Read-only view of a symbol's open lots"""
+        book = self._books.get(symbol)
+        if book is None:
+            return _no_lots()
+        live = slice(book.start, book.end)
+        return Lots(
+            book.qty[live], book.entry_price[live], book.entry_index[live], book.entry_time[live]
+        )
+
+    def symbols(self) -> List[str]:
+        """Symbols with open lots"""
+        return list(self._books.keys())
+
+    def market_value(self, marks: np.ndarray, columns: Dict[str, int]) -> float:
+        """
+        Value of all open lots
+
+        Args:
+            marks: Last known price per panel column (NaN if never traded)
+            columns: Panel column of each symbol
+
+        Symbols without a mark are valued at cost.
+        """
+        return sum(self.exposure(marks, columns).values())
+
+    def exposure(self, marks: np.ndarray, columns: Dict[str, int]) -> Dict[str, float]:
+        """Market value per held symbol (see market_value)"""
+        exposure = {}
+        for symbol, book in self._books.items():
+            mark = marks[columns[symbol]]
+            exposure[symbol] = book.total_cost if np.isnan(mark) else book.total_qty * mark
+        return exposure
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        The book as flat arrays, for binary checkpoints
+
+        Running totals are stored as they are rather than re-summed from
+        the lots, so a restored book continues the same arithmetic.
+        """
+        books = list(self._books.values())
+        live = [slice(book.start, book.end) for book in books]
+        arrays = {
+            "symbols": np.array(list(self._books.keys()), dtype=str),
+            "lot_counts": np.array([len(book) for book in books], dtype=np.int64),
+            "total_qty": np.array([book.total_qty for book in books], dtype=np.float64),
+            "total_cost": np.array([book.total_cost for book in books], dtype=np.float64),
+        }
+        empty = vars(_no_lots())
+        for name in ("qty", "entry_price", "entry_index", "entry_time"):
+            parts = [getattr(book, name)[rows] for book, rows in zip(books, live)]
+            arrays[name] = np.concatenate(parts) if parts else empty[name]
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "PositionBook":
+        """Rebuild a book saved with to_arrays()"""
+        book = cls()
+        ends = np.cumsum(arrays["lot_counts"])
+        for i, symbol in enumerate(arrays["symbols"].tolist()):
+            rows = slice(ends[i] - arrays["lot_counts"][i], ends[i])
+            lots = _SymbolLots(capacity=max(4, rows.stop - rows.start))
+            for name in ("qty", "entry_price", "entry_index", "entry_time"):
+                getattr(lots, name)[:rows.stop - rows.start] = arrays[name][rows]
+            lots.end = rows.stop - rows.start
+            lots.total_qty = float(arrays["total_qty"][i])
+            lots.total_cost = float(arrays["total_cost"][i])
+            book._books[symbol] = lots
+        return book
+
+    def __len__(self) -> int:
+        """Number of open lots"""
+        return sum(len(book) for book in self._books.values())
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._books
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._books)
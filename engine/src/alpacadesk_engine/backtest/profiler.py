@@ -0,0 +1,101 @@
+"""Opt-in phase profiler for backtest runs"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class PhaseStats:
+    """Cumulative cost of one phase"""
+    calls: int = 0
+    seconds: float = 0.0
+    allocated_bytes: int = 0  # Sum over calls of memory allocated above the call's start, at its peak
+
+
+@dataclass
+class BacktestProfile:
+    """Where a backtest run spent its time and memory"""
+    total_seconds: float
+    phases: Dict[str, PhaseStats] = field(default_factory=dict)
+    strategies: Dict[str, Dict[str, PhaseStats]] = field(default_factory=dict)  # Strategy -> phase
+    peak_traced_bytes: Optional[int] = None  # None when allocations were not tracked
+
+    @property
+    def other_seconds(self) -> float:
+        """Time spent outside every recorded phase"""
+        return max(self.total_seconds - sum(p.seconds for p in self.phases.values()), 0.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "other_seconds": self.other_seconds}
+
+
+class BacktestProfiler:
+    """
+    Records wall time, call counts and allocations per named phase
+
+    Phases are entered with phase() and must not nest. Allocation tracking
+    uses tracemalloc, which slows Python-heavy phases down several-fold,
+    so timings taken with it are best compared with each other only.
+    """
+
+    def __init__(self, track_allocations: bool = True):
+        self.track_allocations = track_allocations
+        self.phases: Dict[str, PhaseStats] = {}
+        self.strategies: Dict[str, Dict[str, PhaseStats]] = {}
+        self._started: Optional[float] = None
+        self._owns_tracing = False
+        self._peak = 0
+
+    def start(self):
+        """Start the run clock and, if enabled, allocation tracing"""
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        self._started = time.perf_counter()
+
+    def stop(self) -> BacktestProfile:
+        """Stop tracing and return the profile of the run"""
+        total = time.perf_counter() - self._started
+
+        peak = None
+        if self.track_allocations:
+            peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+            if self._owns_tracing:
+                tracemalloc.stop()
+                self._owns_tracing = False
+
+        return BacktestProfile(
+            total_seconds=total,
+            phases=self.phases,
+            strategies=self.strategies,
+            peak_traced_bytes=peak,
+        )
+
+    @contextmanager
+    def phase(self, name: str, strategy: Optional[str] = None):
+        """Attribute the enclosed work to a phase, and to a strategy if given"""
+        tracing = self.track_allocations and tracemalloc.is_tracing()
+        if tracing:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            allocated = 0
+            if tracing:
+                peak = tracemalloc.get_traced_memory()[1]
+                self._peak = max(self._peak, peak)
+                allocated = peak - base
+
+            stats = [self.phases.setdefault(name, PhaseStats())]
+            if strategy is not None:
+                stats.append(self.strategies.setdefault(strategy, {}).setdefault(name, PhaseStats()))
+            for s in stats:
+                s.calls += 1
+                s.seconds += elapsed
+                s.allocated_bytes += allocated
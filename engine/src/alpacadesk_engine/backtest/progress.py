@@ -0,0 +1,111 @@
+"""Throttled progress reporting for long backtests"""
+
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .metrics import drawdown
+from .results import EquityCurve, TradeLog
+
+
+class BacktestCancelled(Exception):
+    """Raised from a progress callback to stop a running backtest"""
+
+
+@dataclass
+class BacktestProgress:
+    """Snapshot of a backtest in flight"""
+    percent: float
+    day: int  # Trading days simulated so far
+    total_days: int
+    date: Optional[str]
+    equity: float
+    total_return: float
+    max_drawdown: float
+    total_trades: int
+    win_rate: float
+    equity_curve: List[Dict[str, Any]] = field(default_factory=list)  # Decimated {date, equity}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ProgressReporter:
+    """
+    Calls back with BacktestProgress at most every min_interval seconds
+
+    update() is called once per simulated day and normally returns after a
+    single clock read; the snapshot (decimated curve, running drawdown and
+    trade stats) is only built when a report is due, which keeps reporting
+    overhead to a small fraction of the run.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[BacktestProgress], None],
+        min_interval: float = 0.5,
+        max_points: int = 200,
+    ):
+        self.callback = callback
+        self.min_interval = min_interval
+        self.max_points = max_points
+        self._last_report = time.monotonic()
+
+    def due(self) -> bool:
+        """Whether min_interval has elapsed; if so, the next report is counted as sent"""
+        now = time.monotonic()
+        if now - self._last_report < self.min_interval:
+            return False
+
+        self._last_report = now
+        return True
+
+    def update(self, t: int, curve: EquityCurve, trades: TradeLog):
+        """Report after day t if min_interval has elapsed"""
+        if self.due():
+            self.callback(self.snapshot(t + 1, curve, trades))
+
+    def report(self, curve: EquityCurve, trades: TradeLog, total_days: int):
+        """Report a run streamed in chunks: curve so far, out of a projected total_days"""
+        self.callback(self.snapshot(len(curve), curve, trades, total_days))
+
+    def finish(self, curve: EquityCurve, trades: TradeLog):
+        """Send the final report"""
+        self.callback(self.snapshot(len(curve), curve, trades))
+
+    def snapshot(
+        self,
+        days: int,
+        curve: EquityCurve,
+        trades: TradeLog,
+        total_days: Optional[int] = None,
+    ) -> BacktestProgress:
+        """Progress after the first days rows of the curve (of total_days, default all rows)"""
+        total_days = len(curve) if total_days is None else max(total_days, days)
+        equity = curve.equity[:days]
+        initial = curve.initial_capital
+
+        last = float(equity[-1]) if days else initial
+        pnl = trades.pnl
+
+        # Evenly spaced points, always including the latest day
+        rows = np.unique(np.linspace(0, days - 1, min(days, self.max_points)).astype(np.int64))
+        dates = curve.dates[rows]
+
+        return BacktestProgress(
+            percent=days / total_days * 100 if total_days else 100.0,
+            day=days,
+            total_days=total_days,
+            date=curve.dates[days - 1].isoformat() if days else None,
+            equity=last,
+            total_return=(last - initial) / initial * 100,
+            max_drawdown=float(drawdown(equity).min()) if days else 0.0,
+            total_trades=len(pnl),
+            win_rate=float((pnl > 0).mean() * 100) if len(pnl) else 0.0,
+            equity_curve=[
+                {"date": date.isoformat(), "equity": value}
+                for date, value in zip(dates, equity[rows].tolist())
+            ],
+        )
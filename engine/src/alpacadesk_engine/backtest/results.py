@@ -0,0 +1,268 @@
+"""Columnar containers for backtest output"""
+
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class EquityCurve:
+    """
+    Portfolio state per trading day, stored as parallel NumPy arrays
+
+    Only equity and cash are stored; positions value and P&L columns are
+    derived on demand. Use to_records() at the API boundary.
+    """
+
+    def __init__(
+        self,
+        dates: pd.DatetimeIndex,
+        equity: np.ndarray,
+        cash: np.ndarray,
+        initial_capital: float,
+    ):
+        self.dates = dates
+        self.equity = equity
+        self.cash = cash
+        self.initial_capital = initial_capital
+
+    @classmethod
+    def allocate(cls, dates: pd.DatetimeIndex, initial_capital: float) -> "EquityCurve":
+        """Preallocate a curve to be filled row by row with record()"""
+        return cls(
+            dates,
+            np.full(len(dates), np.nan),
+            np.full(len(dates), np.nan),
+            initial_capital,
+        )
+
+    @classmethod
+    def empty(cls, initial_capital: float) -> "EquityCurve":
+        return cls.allocate(pd.DatetimeIndex([]), initial_capital)
+
+    @classmethod
+    def concatenate(cls, curves: List["EquityCurve"], initial_capital: float) -> "EquityCurve":
+        """Chain curves end to end, measuring P&L against initial_capital"""
+        curves = [c for c in curves if len(c)]
+        if not curves:
+            return cls.empty(initial_capital)
+
+        return cls(
+            curves[0].dates.append([c.dates for c in curves[1:]]),
+            np.concatenate([c.equity for c in curves]),
+            np.concatenate([c.cash for c in curves]),
+            initial_capital,
+        )
+
+    def head(self, n: int) -> "EquityCurve":
+        """The first n rows, as views"""
+        return EquityCurve(self.dates[:n], self.equity[:n], self.cash[:n], self.initial_capital)
+
+    def record(self, t: int, equity: float, cash: float):
+        """Fill row t"""
+        self.equity[t] = equity
+        self.cash[t] = cash
+
+    def __len__(self) -> int:
+        return len(self.equity)
+
+    @property
+    def positions_value(self) -> np.ndarray:
+        return self.equity - self.cash
+
+    @property
+    def profit_loss(self) -> np.ndarray:
+        return self.equity - self.initial_capital
+
+    @property
+    def profit_loss_pct(self) -> np.ndarray:
+        return (self.equity - self.initial_capital) / self.initial_capital * 100
+
+    @property
+    def final_equity(self) -> float:
+        return float(self.equity[-1]) if len(self) else self.initial_capital
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """One dict per day, in the API's equity point format"""
+        columns = zip(
+            [d.isoformat() for d in self.dates],
+            self.equity.tolist(),
+            self.cash.tolist(),
+            self.positions_value.tolist(),
+            self.profit_loss.tolist(),
+            self.profit_loss_pct.tolist(),
+        )
+        return [
+            {
+                "date": date,
+                "equity": equity,
+                "cash": cash,
+                "positions_value": positions_value,
+                "profit_loss": profit_loss,
+                "profit_loss_pct": profit_loss_pct,
+            }
+            for date, equity, cash, positions_value, profit_loss, profit_loss_pct in columns
+        ]
+
+
+class TradeLog:
+    """
+    Closed trades stored as growable parallel NumPy arrays
+
+    Symbols are stored as integer codes into self.symbols. Timestamps are
+    datetime64[ns] (UTC for timezone-aware data, converted back to tz in
+    to_records()).
+    """
+
+    _FIELDS = {
+        "symbol_code": np.int32,
+        "qty": np.float64,
+        "entry_price": np.float64,
+        "exit_price": np.float64,
+        "entry_time": "datetime64[ns]",
+        "exit_time": "datetime64[ns]",
+        "pnl": np.float64,
+        "pnl_pct": np.float64,
+    }
+
+    def __init__(self, capacity: int = 64, tz: Optional[str] = None):
+        self.symbols: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._size = 0
+        self.tz = tz
+        for name, dtype in self._FIELDS.items():
+            setattr(self, f"_{name}", np.empty(capacity, dtype=dtype))
+
+    def append(
+        self,
+        symbol: str,
+        qty: np.ndarray,
+        entry_price: np.ndarray,
+        entry_time: np.ndarray,
+        exit_price: float,
+        exit_time: np.datetime64,
+        pnl: np.ndarray,
+        pnl_pct: np.ndarray,
+    ):
+        """Record a batch of lots of one symbol closed at the same fill"""
+        n = len(qty)
+        if n == 0:
+            return
+
+        self._reserve(self._size + n)
+        rows = slice(self._size, self._size + n)
+        self._symbol_code[rows] = self._code(symbol)
+        self._qty[rows] = qty
+        self._entry_price[rows] = entry_price
+        self._exit_price[rows] = exit_price
+        self._entry_time[rows] = entry_time
+        self._exit_time[rows] = exit_time
+        self._pnl[rows] = pnl
+        self._pnl_pct[rows] = pnl_pct
+        self._size += n
+
+    def extend(self, other: "TradeLog"):
+        """Append every trade of another log, keeping their order"""
+        n = len(other)
+        if n == 0:
+            return
+
+        remap = np.array([self._code(symbol) for symbol in other.symbols], dtype=np.int32)
+
+        self._reserve(self._size + n)
+        rows = slice(self._size, self._size + n)
+        self._symbol_code[rows] = remap[other.symbol_code]
+        for name in self._FIELDS:
+            if name != "symbol_code":
+                getattr(self, f"_{name}")[rows] = getattr(other, name)
+        self._size += n
+
+    def _code(self, symbol: str) -> int:
+        """Integer code of a symbol, registering it on first use"""
+        code = self._codes.get(symbol)
+        if code is None:
+            code = self._codes[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return code
+
+    def _reserve(self, size: int):
+        """Grow the arrays geometrically to hold size rows"""
+        capacity = len(self._qty)
+        if size <= capacity:
+            return
+
+        capacity = max(size, capacity * 2)
+        for name in self._FIELDS:
+            old = getattr(self, f"_{name}")
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, f"_{name}", new)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """The filled rows and symbol table as arrays, for binary checkpoints"""
+        arrays = {name: getattr(self, name) for name in self._FIELDS}
+        arrays["symbols"] = np.array(self.symbols, dtype=str)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], tz: Optional[str] = None) -> "TradeLog":
+        """Rebuild a log saved with to_arrays()"""
+        log = cls(capacity=max(64, len(arrays["qty"])), tz=tz)
+        for symbol in arrays["symbols"].tolist():
+            log._code(symbol)
+        log._size = len(arrays["qty"])
+        for name in cls._FIELDS:
+            getattr(log, f"_{name}")[:log._size] = arrays[name]
+        return log
+
+    # Read-only views of the filled rows
+    symbol_code = property(lambda self: self._symbol_code[:self._size])
+    qty = property(lambda self: self._qty[:self._size])
+    entry_price = property(lambda self: self._entry_price[:self._size])
+    exit_price = property(lambda self: self._exit_price[:self._size])
+    entry_time = property(lambda self: self._entry_time[:self._size])
+    exit_time = property(lambda self: self._exit_time[:self._size])
+    pnl = property(lambda self: self._pnl[:self._size])
+    pnl_pct = property(lambda self: self._pnl_pct[:self._size])
+
+    @property
+    def duration_days(self) -> np.ndarray:
+        """Calendar days each trade was held, fractional for intraday trades"""
+        return (self.exit_time - self.entry_time) / np.timedelta64(1, "D")
+
+    def _timestamps(self, values: np.ndarray) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(values)
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+        return index
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """One dict per closed trade"""
+        symbols = np.array(self.symbols, dtype=object)[self.symbol_code] if self._size else []
+        columns = zip(
+            symbols,
+            self.qty.tolist(),
+            self.entry_price.tolist(),
+            [d.isoformat() for d in self._timestamps(self.entry_time)],
+            self.exit_price.tolist(),
+            [d.isoformat() for d in self._timestamps(self.exit_time)],
+            self.pnl.tolist(),
+            self.pnl_pct.tolist(),
+        )
+        return [
+            {
+                "symbol": symbol,
+                "qty": qty,
+                "side": "buy",
+                "entry_price": entry_price,
+                "entry_date": entry_date,
+                "exit_price": exit_price,
+                "exit_date": exit_date,
+                "pnl": pnl,
+                "pnl_pct": pnl_pct,
+            }
+            for symbol, qty, entry_price, entry_date, exit_price, exit_date, pnl, pnl_pct in columns
+        ]
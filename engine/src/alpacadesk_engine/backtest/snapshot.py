@@ -0,0 +1,81 @@
+"""End-of-run engine state for resuming backtests over new bars"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .positions import PositionBook
+from .results import EquityCurve, TradeLog
+
+
+@dataclass
+class HoldingsCarry:
+    """
+    Holdings of the vectorized simulation at the end of a run
+
+    held_qty/held_cost are the position book totals the simulation sizes
+    against; qty/cost are the last rows of its cumulative holdings arrays.
+    Carrying both lets a resumed run continue the exact same arithmetic.
+    """
+    symbols: List[str]
+    held_qty: np.ndarray
+    held_cost: np.ndarray
+    qty: np.ndarray
+    cost: np.ndarray
+
+    @classmethod
+    def from_positions(cls, positions: PositionBook) -> "HoldingsCarry":
+        """Carry rebuilt from a position book (after a day-by-day run)"""
+        symbols = positions.symbols()
+        qty = np.array([positions.quantity(s) for s in symbols], dtype=np.float64)
+        cost = np.array([positions.cost_basis(s) for s in symbols], dtype=np.float64)
+        return cls(symbols, qty, cost, qty.copy(), cost.copy())
+
+    def aligned(self, symbols: List[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(held_qty, held_cost, qty, cost) in the given column order, zero for new symbols"""
+        index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        out = tuple(np.zeros(len(symbols)) for _ in range(4))
+
+        for j, symbol in enumerate(symbols):
+            i = index.get(symbol)
+            if i is not None:
+                for dst, src in zip(out, (self.held_qty, self.held_cost, self.qty, self.cost)):
+                    dst[j] = src[i]
+
+        for symbol in self.symbols:
+            if symbol not in symbols and (self.held_qty[index[symbol]] or self.qty[index[symbol]]):
+                raise ValueError(f"Snapshot holds {symbol}, which has no data in the resumed range")
+
+        return out
+
+
+@dataclass
+class BacktestSnapshot:
+    """
+    Everything needed to extend a finished backtest
+
+    Produced by BacktestEngine.snapshot() and consumed by
+    BacktestEngine.resume(). Metrics are not accumulated here: they are
+    recomputed in one vectorized pass over the full stored curve and trade
+    log, which is what makes resumed results identical to a full rerun.
+    """
+    start_date: datetime
+    end_date: Optional[pd.Timestamp]  # Last simulated day (None if no days)
+    initial_capital: float
+    commission_per_trade: float
+    slippage_pct: float
+    cash: float
+    equity: float
+    positions: PositionBook
+    closed_trades: TradeLog
+    equity_curve: EquityCurve
+    strategy_parameters: Dict[str, Any]
+    strategy_state: Dict[str, Any]
+    carry: Optional[HoldingsCarry] = None  # Set when the vectorized path ran last
+
+    @property
+    def num_days(self) -> int:
+        return len(self.equity_curve)
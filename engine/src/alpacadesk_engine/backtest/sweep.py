@@ -0,0 +1,281 @@
+"""Parallel parameter sweeps over the backtest engine"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import List, Dict, Any, Optional, Type
+
+import numpy as np
+import pandas as pd
+
+from ..strategies.base import BaseStrategy
+from .engine import BacktestEngine, BacktestMetrics
+
+# Columns packed into shared memory for every symbol
+SHARED_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+@dataclass
+class SweepResult:
+    """One evaluated parameter combination"""
+    parameters: Dict[str, Any]
+    metrics: BacktestMetrics
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Flatten to a row of the ranked results table"""
+        return {"parameters": self.parameters, **asdict(self.metrics)}
+
+
+def expand_grid(param_grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter grid into every combination
+
+    Example:
+        {"lookback_period": [10, 20], "volume_multiplier": [1.5, 2.0]}
+        -> 4 parameter dicts
+    """
+    if not param_grid:
+        return [{}]
+
+    names = list(param_grid.keys())
+    return [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+
+
+class SharedMarketData:
+    """
+    Market data packed into a single shared memory block
+
+    Each symbol is stored as a contiguous (rows x columns) float64 matrix
+    followed by its int64 nanosecond timestamps. Worker processes attach
+    by name and rebuild DataFrames over the shared buffer without copying.
+    """
+
+    def __init__(self, market_data: Dict[str, pd.DataFrame]):
+        # symbol -> (values offset, rows, index offset, timezone)
+        self.layout: Dict[str, tuple[int, int, int, Optional[str]]] = {}
+
+        size = 0
+        for symbol, df in market_data.items():
+            rows = len(df)
+            values_offset = size
+            size += rows * len(SHARED_COLUMNS) * 8
+            index_offset = size
+            size += rows * 8
+            tz = str(df.index.tz) if getattr(df.index, "tz", None) is not None else None
+            self.layout[symbol] = (values_offset, rows, index_offset, tz)
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+        for symbol, df in market_data.items():
+            values_offset, rows, index_offset, _ = self.layout[symbol]
+            values, index = _shared_arrays(self.shm, values_offset, rows, index_offset)
+            values[:] = df[SHARED_COLUMNS].to_numpy(dtype=np.float64)
+            index[:] = pd.DatetimeIndex(df.index).as_unit("ns").asi8
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self):
+        """Release the shared memory block"""
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _shared_arrays(
+    shm: shared_memory.SharedMemory, values_offset: int, rows: int, index_offset: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Map one symbol's value matrix and timestamps onto a shared block"""
+    values = np.ndarray(
+        (rows, len(SHARED_COLUMNS)), dtype=np.float64, buffer=shm.buf, offset=values_offset
+    )
+    index = np.ndarray((rows,), dtype=np.int64, buffer=shm.buf, offset=index_offset)
+    return values, index
+
+
+# Per-worker state set by _init_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(
+    shm_name: str,
+    layout: Dict[str, tuple[int, int, int, Optional[str]]],
+    strategy_class: Type[BaseStrategy],
+    symbols: List[str],
+    base_parameters: Dict[str, Any],
+    engine_kwargs: Dict[str, Any],
+    start_date: datetime,
+    end_date: datetime,
+):
+    """Attach to the shared market data once per worker process"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+
+    market_data = {}
+    for symbol, (values_offset, rows, index_offset, tz) in layout.items():
+        values, index = _shared_arrays(shm, values_offset, rows, index_offset)
+        values.flags.writeable = False
+        timestamps = pd.DatetimeIndex(index.view("datetime64[ns]"))
+        if tz is not None:
+            timestamps = timestamps.tz_localize("UTC").tz_convert(tz)
+        market_data[symbol] = pd.DataFrame(
+            values, index=timestamps, columns=SHARED_COLUMNS, copy=False
+        )
+
+    _worker_state.update(
+        shm=shm,
+        market_data=market_data,
+        strategy_class=strategy_class,
+        symbols=symbols,
+        base_parameters=base_parameters,
+        engine_kwargs=engine_kwargs,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+
+def _run_worker_task(parameters: Dict[str, Any]) -> Optional[SweepResult]:
+    """Backtest one parameter combination inside a worker process"""
+    state = _worker_state
+    return _evaluate(
+        state["strategy_class"],
+        state["symbols"],
+        {**state["base_parameters"], **parameters},
+        state["engine_kwargs"],
+        state["market_data"],
+        state["start_date"],
+        state["end_date"],
+        parameters,
+    )
+
+
+def _evaluate(
+    strategy_class: Type[BaseStrategy],
+    symbols: List[str],
+    full_parameters: Dict[str, Any],
+    engine_kwargs: Dict[str, Any],
+    market_data: Dict[str, pd.DataFrame],
+    start_date: datetime,
+    end_date: datetime,
+    parameters: Dict[str, Any],
+) -> Optional[SweepResult]:
+    """Run a single backtest, skipping parameter sets the strategy rejects"""
+    strategy = strategy_class(symbols, full_parameters)
+    if not strategy.validate_parameters():
+        return None
+
+    engine = BacktestEngine(**engine_kwargs)
+    metrics, _ = engine.run(strategy, market_data, start_date, end_date)
+
+    return SweepResult(parameters=parameters, metrics=metrics)
+
+
+class ParameterSweep:
+    """
+    Evaluates a strategy over a grid of parameters in parallel
+
+    Features:
+    - Fans runs out over a process pool
+    - Shares one copy of the market data through shared memory
+    - Skips combinations rejected by validate_parameters()
+    - Returns results ranked by any BacktestMetrics field
+    """
+
+    def __init__(
+        self,
+        strategy_class: Type[BaseStrategy],
+        symbols: List[str],
+        base_parameters: Optional[Dict[str, Any]] = None,
+        engine_kwargs: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.strategy_class = strategy_class
+        self.symbols = symbols
+        self.base_parameters = base_parameters or {}
+        self.engine_kwargs = engine_kwargs or {}
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def run(
+        self,
+        market_data: Dict[str, pd.DataFrame],
+        start_date: datetime,
+        end_date: datetime,
+        param_grid: Dict[str, List[Any]],
+        rank_by: str = "sharpe_ratio",
+    ) -> List[SweepResult]:
+        """
+        Backtest every combination in the grid
+
+        Args:
+            market_data: Historical market data for all symbols
+            start_date: Start date for each backtest
+            end_date: End date for each backtest
+            param_grid: Mapping of parameter name to candidate values
+            rank_by: BacktestMetrics field to sort by, best (highest) first
+
+        Returns:
+            Results for all valid combinations, ranked
+        """
+        if rank_by not in BacktestMetrics.__dataclass_fields__:
+            raise ValueError(f"Unknown metric to rank by: {rank_by}")
+
+        combinations = expand_grid(param_grid)
+        workers = min(self.max_workers, len(combinations))
+
+        if workers <= 1:
+            results = [
+                _evaluate(
+                    self.strategy_class,
+                    self.symbols,
+                    {**self.base_parameters, **parameters},
+                    self.engine_kwargs,
+                    market_data,
+                    start_date,
+                    end_date,
+                    parameters,
+                )
+                for parameters in combinations
+            ]
+        else:
+            results = self._run_parallel(market_data, start_date, end_date, combinations, workers)
+
+        ranked = [r for r in results if r is not None]
+        ranked.sort(key=lambda r: getattr(r.metrics, rank_by), reverse=True)
+
+        return ranked
+
+    def _run_parallel(
+        self,
+        market_data: Dict[str, pd.DataFrame],
+        start_date: datetime,
+        end_date: datetime,
+        combinations: List[Dict[str, Any]],
+        workers: int,
+    ) -> List[Optional[SweepResult]]:
+        """Fan combinations out over worker processes sharing one data copy"""
+        with SharedMarketData(market_data) as shared:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(
+                    shared.name,
+                    shared.layout,
+                    self.strategy_class,
+                    self.symbols,
+                    self.base_parameters,
+                    self.engine_kwargs,
+                    start_date,
+                    end_date,
+                ),
+            ) as pool:
+                # A few chunks per worker keeps IPC low while balancing uneven runs
+                chunksize = max(1, len(combinations) // (workers * 4))
+                return list(pool.map(_run_worker_task, combinations, chunksize=chunksize))
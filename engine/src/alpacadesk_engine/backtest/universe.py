@@ -0,0 +1,283 @@
+"""Float32 columnar bar storage for backtesting large symbol universes"""
+
+import json
+import mmap
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .panel import select_range, union_calendar
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+# Bytes per (day, symbol) cell that run_universe() holds for the whole run:
+# float32 close and marks, the validity mask, buy/sell flags and their masks
+RUN_BYTES_PER_CELL = 13
+
+# Working bytes per (day, symbol) cell of the chunk being processed: float32
+# fields read from the store and forward-fill indices while preparing
+# signals, then the float64 holdings arrays used to rebuild the equity curve
+CHUNK_BYTES_PER_CELL = 48
+
+
+class UniverseData:
+    """
+    OHLCV bars for many symbols as float32 columnar arrays
+
+    Each field is a (symbols x dates) matrix on a shared calendar, so one
+    symbol's history is a contiguous row and a chunk of symbols is a
+    contiguous block. Missing bars are NaN. A universe opened with load()
+    is memory-mapped, so only the chunks being read become resident.
+
+    Attributes:
+        dates: Calendar shared by every field
+        symbols: Row order of the field matrices
+        fields: Field name to (symbols x dates) matrix
+    """
+
+    def __init__(self, dates: pd.DatetimeIndex, symbols: List[str], fields: Dict[str, np.ndarray]):
+        self.dates = dates
+        self.symbols = symbols
+        self.fields = fields
+        self.columns: Dict[str, int] = {symbol: i for i, symbol in enumerate(symbols)}
+
+    @classmethod
+    def from_market_data(
+        cls,
+        market_data: Dict[str, pd.DataFrame],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        dtype=np.float32,
+    ) -> "UniverseData":
+        """
+        Convert per-symbol OHLCV frames, dropping symbols without bars in range
+
+        Args:
+            market_data: Historical market data for all symbols
+            start_date: First calendar date to include (None for unbounded)
+            end_date: Last calendar date to include (None for unbounded)
+            dtype: Storage dtype (float64 reproduces BacktestEngine.run() up
+                to summation order when the run is chunked)
+        """
+        frames = {s: select_range(df, start_date, end_date) for s, df in market_data.items()}
+        frames = {s: df for s, df in frames.items() if not df.empty}
+        dates = union_calendar(frames.values())
+
+        universe = cls(dates, list(frames), {
+            field: np.full((len(frames), len(dates)), np.nan, dtype=dtype) for field in FIELDS
+        })
+        for symbol, df in frames.items():
+            universe.set_frame(symbol, df)
+
+        return universe
+
+    @classmethod
+    def create(
+        cls,
+        directory: str,
+        dates: pd.DatetimeIndex,
+        symbols: List[str],
+        dtype=np.float32,
+    ) -> "UniverseData":
+        """
+        Allocate an empty on-disk universe to be filled one symbol at a time
+
+        Lets a universe larger than memory be built with set_frame() while
+        only one symbol's frame is loaded; call flush() when done.
+        """
+        os.makedirs(directory, exist_ok=True)
+        _write_index(directory, dates, symbols)
+
+        fields = {}
+        for field in FIELDS:
+            fields[field] = np.lib.format.open_memmap(
+                os.path.join(directory, f"{field}.npy"), mode="w+", dtype=dtype,
+                shape=(len(symbols), len(dates)),
+            )
+            fields[field][:] = np.nan
+
+        return cls(dates, symbols, fields)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "UniverseData":
+        """Open a universe written by save() or create()"""
+        with open(os.path.join(directory, "universe.json")) as f:
+            meta = json.load(f)
+
+        dates = pd.DatetimeIndex(np.load(os.path.join(directory, "dates.npy")))
+        if meta["tz"] is not None:
+            dates = dates.tz_localize("UTC").tz_convert(meta["tz"])
+
+        fields = {
+            field: np.load(os.path.join(directory, f"{field}.npy"), mmap_mode="r" if mmap else None)
+            for field in FIELDS
+        }
+        return cls(dates, meta["symbols"], fields)
+
+    def save(self, directory: str):
+        """Write one .npy file per field plus the calendar and symbol list"""
+        os.makedirs(directory, exist_ok=True)
+        _write_index(directory, self.dates, self.symbols)
+
+        for field, values in self.fields.items():
+            np.save(os.path.join(directory, f"{field}.npy"), values)
+
+    def flush(self):
+        """Write pending changes of memory-mapped fields to disk"""
+        for values in self.fields.values():
+            if isinstance(values, np.memmap):
+                values.flush()
+
+    def release(self):
+        """Drop memory-mapped pages read so far from the resident set"""
+        if not hasattr(mmap, "MADV_DONTNEED"):
+            return
+
+        for values in self.fields.values():
+            # Clean file-backed pages are simply re-read on the next access
+            mapping = getattr(values, "_mmap", None)
+            if mapping is not None:
+                mapping.madvise(mmap.MADV_DONTNEED)
+
+    def set_frame(self, symbol: str, df: pd.DataFrame):
+        """Store a symbol's bars; bars off the calendar are ignored"""
+        i = self.columns[symbol]
+        df = select_range(df, None, None)
+        rows = self.dates.get_indexer(df.index)
+        keep = rows >= 0
+
+        for field, values in self.fields.items():
+            values[i, rows[keep]] = df[field].to_numpy()[keep]
+
+    def rows(self, start_date: Optional[datetime], end_date: Optional[datetime]) -> slice:
+        """Calendar positions within [start_date, end_date]"""
+        start = 0 if start_date is None else self.dates.searchsorted(start_date, side="left")
+        end = len(self.dates) if end_date is None else self.dates.searchsorted(end_date, side="right")
+        return slice(int(start), int(end))
+
+    def frame(
+        self,
+        symbol: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """One symbol's bars in range as a float64 OHLCV DataFrame"""
+        i = self.columns[symbol]
+        rows = self.rows(start_date, end_date)
+        return _frame(self.dates[rows], {field: values[i, rows] for field, values in self.fields.items()})
+
+    def frames(
+        self,
+        symbols: Sequence[str],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Iterator[tuple[str, pd.DataFrame]]:
+        """(symbol, frame) pairs, reading the store one contiguous block at a time"""
+        rows = self.rows(start_date, end_date)
+        dates = self.dates[rows]
+        index = [self.columns[s] for s in symbols]
+
+        block = {field: values[index, rows] for field, values in self.fields.items()}
+        for k, symbol in enumerate(symbols):
+            yield symbol, _frame(dates, {field: values[k] for field, values in block.items()})
+
+    def to_market_data(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        symbols: Optional[Sequence[str]] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """Per-symbol frames as taken by BacktestEngine.run()"""
+        symbols = [s for s in (symbols or self.symbols) if s in self.columns]
+        return dict(self.frames(symbols, start_date, end_date))
+
+    @property
+    def resident_bytes(self) -> int:
+        """Size of the fields held in memory rather than memory-mapped"""
+        return sum(v.nbytes for v in self.fields.values() if not isinstance(v, np.memmap))
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.columns
+
+
+@dataclass
+class UniverseRunStats:
+    """Resource usage of a BacktestEngine.run_universe() call"""
+    symbols: int
+    days: int
+    chunk_size: int  # Symbols processed per block
+    chunks: int
+    memory_budget_mb: Optional[float]
+    peak_rss_mb: Optional[float]  # Process high-water mark; None where unsupported
+
+
+def chunk_size_for_budget(
+    num_days: int,
+    num_symbols: int,
+    budget_bytes: Optional[float],
+    resident_bytes: int = 0,
+) -> int:
+    """
+    Largest symbol block that keeps a universe run within budget_bytes
+
+    Raises:
+        ValueError: If the budget cannot hold the run's fixed arrays plus
+            one symbol's working set
+    """
+    if num_symbols == 0 or budget_bytes is None:
+        return max(num_symbols, 1)
+
+    fixed = num_days * num_symbols * RUN_BYTES_PER_CELL + resident_bytes
+    per_symbol = num_days * CHUNK_BYTES_PER_CELL
+
+    if budget_bytes - fixed < per_symbol:
+        needed = (fixed + per_symbol) / 2 ** 20
+        raise ValueError(
+            f"Memory budget of {budget_bytes / 2 ** 20:.0f} MB is too small for "
+            f"{num_symbols} symbols x {num_days} days; at least {needed:.0f} MB is needed"
+        )
+
+    return min(num_symbols, int((budget_bytes - fixed) // per_symbol))
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, or None where unsupported"""
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def _frame(dates: pd.DatetimeIndex, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """float64 frame of the rows where the symbol has a close"""
+    valid = ~np.isnan(columns["close"])
+    return pd.DataFrame(
+        {field: values[valid].astype(np.float64) for field, values in columns.items()},
+        index=dates[valid],
+    )
+
+
+def _write_index(directory: str, dates: pd.DatetimeIndex, symbols: List[str]):
+    """Write the calendar (as UTC datetime64) and the symbol list"""
+    tz = str(dates.tz) if dates.tz is not None else None
+    if tz is not None:
+        dates = dates.tz_convert("UTC").tz_localize(None)
+    np.save(os.path.join(directory, "dates.npy"), dates.to_numpy())
+
+    with open(os.path.join(directory, "universe.json"), "w") as f:
+        json.dump({"symbols": list(symbols), "tz": tz, "fields": list(FIELDS)}, f)
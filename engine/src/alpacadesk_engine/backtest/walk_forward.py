@@ -0,0 +1,224 @@
+"""Walk-forward optimization over the backtest engine"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Type
+
+import pandas as pd
+
+from ..strategies.base import BaseStrategy
+from .engine import BacktestEngine, BacktestMetrics, SignalMatrix
+from .results import EquityCurve, TradeLog
+from .sweep import expand_grid
+
+
+@dataclass
+class WalkForwardWindow:
+    """One in-sample optimization window and its out-of-sample test"""
+    in_sample_start: datetime
+    in_sample_end: datetime
+    out_sample_start: datetime
+    out_sample_end: datetime
+    best_parameters: Dict[str, Any]
+    in_sample_metrics: BacktestMetrics
+    out_sample_metrics: BacktestMetrics
+
+
+@dataclass
+class WalkForwardResult:
+    """Stitched out-of-sample performance across all windows"""
+    windows: List[WalkForwardWindow]
+    metrics: BacktestMetrics
+    equity_curve: EquityCurve
+
+
+class WalkForwardOptimizer:
+    """
+    Rolling in-sample optimization with out-of-sample validation
+
+    Features:
+    - Splits a date range into rolling in-sample/out-of-sample windows
+    - Picks the best parameters on each in-sample window
+    - Chains out-of-sample runs, carrying equity forward
+    - Computes each candidate's signals once over the full range and
+      simulates every window from slices of them
+
+    Strategies without generate_signals() have their analyze() signals
+    recorded once over the full range instead (see
+    BacktestEngine.record_signals()), so their indicators see the same
+    history in every window as under the vectorized path.
+    """
+
+    def __init__(
+        self,
+        strategy_class: Type[BaseStrategy],
+        symbols: List[str],
+        base_parameters: Optional[Dict[str, Any]] = None,
+        engine_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        self.strategy_class = strategy_class
+        self.symbols = symbols
+        self.base_parameters = base_parameters or {}
+        self.engine_kwargs = engine_kwargs or {}
+
+    def run(
+        self,
+        market_data: Dict[str, pd.DataFrame],
+        start_date: datetime,
+        end_date: datetime,
+        param_grid: Dict[str, List[Any]],
+        in_sample_days: int,
+        out_sample_days: int,
+        step_days: Optional[int] = None,
+        rank_by: str = "sharpe_ratio",
+    ) -> WalkForwardResult:
+        """
+        Run walk-forward optimization
+
+        Args:
+            market_data: Historical market data for all symbols
+            start_date: Start of the first in-sample window
+            end_date: End of the last out-of-sample window
+            param_grid: Mapping of parameter name to candidate values
+            in_sample_days: Trading days per in-sample window
+            out_sample_days: Trading days per out-of-sample window
+            step_days: Trading days between window starts (default:
+                out_sample_days); must be at least out_sample_days, as
+                overlapping out-of-sample windows cannot be stitched into
+                one equity curve
+            rank_by: BacktestMetrics field used to pick parameters, highest wins
+
+        Returns:
+            WalkForwardResult with per-window details and stitched metrics
+        """
+        if rank_by not in BacktestMetrics.__dataclass_fields__:
+            raise ValueError(f"Unknown metric to rank by: {rank_by}")
+        if in_sample_days < 2 or out_sample_days < 1:
+            raise ValueError("in_sample_days must be >= 2 and out_sample_days >= 1")
+
+        step_days = step_days or out_sample_days
+        if step_days < out_sample_days:
+            raise ValueError("step_days must be >= out_sample_days; out-of-sample windows would overlap")
+        engine = BacktestEngine(**self.engine_kwargs)
+        initial_capital = capital = engine.initial_capital
+        trading_days = engine._get_trading_days(market_data, start_date, end_date)
+        splits = self._split(len(trading_days), in_sample_days, out_sample_days, step_days)
+        if not splits:
+            raise ValueError("Date range is too short for one in-sample + out-of-sample window")
+
+        # One strategy and one set of signals per candidate, shared by all windows
+        candidates = self._prepare_candidates(market_data, start_date, end_date, param_grid)
+        if not candidates:
+            raise ValueError("No parameter combination passed validate_parameters()")
+
+        windows = []
+        oos_curves: List[EquityCurve] = []
+        stitched_trades = TradeLog()
+
+        for is_start, is_end, oos_end in splits:
+            # Optimize on the in-sample window
+            best = None
+            for parameters, strategy, signals in candidates:
+                metrics, _ = self._run_window(strategy, signals, market_data, is_start, is_end, capital)
+                if best is None or getattr(metrics, rank_by) > getattr(best[3], rank_by):
+                    best = (parameters, strategy, signals, metrics)
+
+            parameters, strategy, signals, is_metrics = best
+
+            # Trade the winner out of sample, starting from the carried equity
+            engine = BacktestEngine(**{**self.engine_kwargs, "initial_capital": capital})
+            oos_metrics, oos_curve = self._run_window(
+                strategy, signals, market_data, is_end, oos_end, capital, engine
+            )
+            oos_curves.append(oos_curve)
+            stitched_trades.extend(engine.closed_trades)
+            capital = oos_curve.final_equity
+
+            windows.append(WalkForwardWindow(
+                in_sample_start=trading_days[is_start],
+                in_sample_end=trading_days[is_end - 1],
+                out_sample_start=trading_days[is_end],
+                out_sample_end=trading_days[oos_end - 1],
+                best_parameters=parameters,
+                in_sample_metrics=is_metrics,
+                out_sample_metrics=oos_metrics,
+            ))
+
+        # P&L of the stitched curve is measured against the original capital
+        stitched_curve = EquityCurve.concatenate(oos_curves, initial_capital)
+        metrics = self._stitched_metrics(market_data, stitched_curve, stitched_trades, windows)
+
+        return WalkForwardResult(windows=windows, metrics=metrics, equity_curve=stitched_curve)
+
+    def _split(
+        self, num_days: int, in_sample_days: int, out_sample_days: int, step_days: int
+    ) -> List[tuple[int, int, int]]:
+        """Return (in-sample start, in-sample end, out-of-sample end) row offsets"""
+        splits = []
+        start = 0
+
+        while start + in_sample_days < num_days:
+            is_end = start + in_sample_days
+            oos_end = min(is_end + out_sample_days, num_days)
+            splits.append((start, is_end, oos_end))
+            start += step_days
+
+        return splits
+
+    def _prepare_candidates(
+        self,
+        market_data: Dict[str, pd.DataFrame],
+        start_date: datetime,
+        end_date: datetime,
+        param_grid: Dict[str, List[Any]],
+    ) -> List[tuple[Dict[str, Any], BaseStrategy, SignalMatrix]]:
+        """Build each valid candidate and its full-range signals"""
+        engine = BacktestEngine(**self.engine_kwargs)
+        candidates = []
+
+        for parameters in expand_grid(param_grid):
+            strategy = self.strategy_class(self.symbols, {**self.base_parameters, **parameters})
+            if not strategy.validate_parameters():
+                continue
+
+            if engine.vectorized and strategy.supports_vectorized():
+                signals = engine.prepare_signals(strategy, market_data, start_date, end_date)
+            else:
+                signals = engine.record_signals(strategy, market_data, start_date, end_date)
+
+            candidates.append((parameters, strategy, signals))
+
+        return candidates
+
+    def _run_window(
+        self,
+        strategy: BaseStrategy,
+        signals: SignalMatrix,
+        market_data: Dict[str, pd.DataFrame],
+        start: int,
+        end: int,
+        capital: float,
+        engine: Optional[BacktestEngine] = None,
+    ) -> tuple[BacktestMetrics, EquityCurve]:
+        """Backtest trading days [start, end) from the candidate's shared signals"""
+        if engine is None:
+            engine = BacktestEngine(**{**self.engine_kwargs, "initial_capital": capital})
+
+        return engine.run_signals(strategy, signals.slice(start, end), market_data)
+
+    def _stitched_metrics(
+        self,
+        market_data: Dict[str, pd.DataFrame],
+        equity_curve: EquityCurve,
+        closed_trades: TradeLog,
+        windows: List[WalkForwardWindow],
+    ) -> BacktestMetrics:
+        """Metrics over the chained out-of-sample equity curve and trades"""
+        engine = BacktestEngine(**self.engine_kwargs)
+        engine.equity_curve = equity_curve
+        engine.closed_trades = closed_trades
+        engine.equity = equity_curve.final_equity
+
+        return engine._calculate_metrics(
+            market_data, windows[0].out_sample_start, windows[-1].out_sample_end
+        )
@@ -0,0 +1,194 @@
+"""Process-wide cache of indicator arrays
+
+Strategies on overlapping watchlists compute the same indicators of the
+same bars on every tick: a 50-bar SMA of AAPL's close is identical for
+every strategy that asks for it. Results are cached per (symbol,
+timeframe, indicator, params, bars) with LRU eviction under a memory
+budget, so each distinct indicator is computed once per bar.
+
+The bars are identified by the window's length, first and last timestamp,
+and the last values of the input columns, so a bar that is still forming
+and a window of a different length never share an entry.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .rolling import values
+
+# Rough per-entry overhead of the key, tuple and dict slot
+_ENTRY_OVERHEAD = 512
+
+
+def _nbytes(result: Any) -> int:
+    """Memory held by an indicator result: an array or a tuple of arrays"""
+    if isinstance(result, np.ndarray):
+        return result.nbytes
+    if isinstance(result, tuple):
+        return sum(_nbytes(item) for item in result)
+    return 0
+
+
+def _freeze(result: Any) -> Any:
+    """
+    Read-only copy of an indicator result, since every caller shares it
+
+    Arrays the indicator allocated are frozen in place; views (e.g. of an
+    input column) are copied first so the caller's data stays writable.
+    """
+    if isinstance(result, np.ndarray):
+        if not result.flags.owndata:
+            result = result.copy()
+        result.flags.writeable = False
+        return result
+    if isinstance(result, tuple):
+        items = [_freeze(item) for item in result]
+        return result._make(items) if hasattr(result, "_make") else tuple(items)
+    return result
+
+
+class IndicatorCache:
+    """
+    LRU cache of indicator results, bounded by their total size in bytes
+
+    Thread-safe. Indicators are computed outside the lock, so two threads
+    missing on the same key at once may both compute it; the first result
+    stored wins.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Cached result for key, computing and storing it on a miss
+
+        Args:
+            key: Hashable identity of the indicator and its input bars
+            compute: Returns the indicator, an array or a tuple of arrays
+
+        Returns:
+            The result, with its arrays read-only
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        result = _freeze(compute())
+        size = _nbytes(result) + _ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return result
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry[0]
+
+            self._entries[key] = (result, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+                self.evictions += 1
+
+        return result
+
+    def clear(self) -> int:
+        """Drop all entries, keeping the statistics; returns how many were dropped"""
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._size = 0
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count, memory use and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+indicator_cache = IndicatorCache()
+
+
+class BarIndicators:
+    """
+    Indicators of one symbol's bars, computed through the shared cache
+
+    Usage:
+        ind = BarIndicators(df, "AAPL", "1day")
+        slow = ind.compute(sma, "close", 50)
+        bands = ind.compute(bollinger, "close", 20, 2.0)
+
+    Without a symbol (e.g. a backtest chunk of unknown origin) indicators
+    are computed directly and nothing is cached.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        symbol: Optional[str] = None,
+        timeframe: str = "1day",
+        cache: Optional[IndicatorCache] = None,
+    ):
+        self.df = df
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.cache = cache or indicator_cache
+        self._columns: Dict[str, np.ndarray] = {}
+        self._window = (len(df), df.index[0], df.index[-1]) if len(df) else (0, None, None)
+
+    def column(self, name: str) -> np.ndarray:
+        """One OHLCV column as a float64 array"""
+        array = self._columns.get(name)
+        if array is None:
+            array = self._columns[name] = values(self.df[name])
+        return array
+
+    def compute(self, func: Callable, columns: Union[str, Tuple[str, ...]], *args, **kwargs) -> Any:
+        """
+        func(*column arrays, *args, **kwargs), from the cache when possible
+
+        Args:
+            func: Indicator function taking the column arrays first
+            columns: Input column name, or a tuple of names in func's order
+            *args, **kwargs: Indicator parameters; must be hashable
+        """
+        names = (columns,) if isinstance(columns, str) else tuple(columns)
+        inputs = [self.column(name) for name in names]
+        if self.symbol is None:
+            return func(*inputs, *args, **kwargs)
+
+        key = (
+            self.symbol,
+            self.timeframe,
+            f"{func.__module__}.{func.__qualname__}",
+            names,
+            args,
+            tuple(sorted(kwargs.items())),
+            self._window,
+            tuple(array[-1:].tobytes() for array in inputs) if self._window[0] else (),
+        )
+        return self.cache.get_or_compute(key, lambda: func(*inputs, *args, **kwargs))
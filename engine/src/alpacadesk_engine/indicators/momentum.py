@@ -0,0 +1,106 @@
+"""Momentum oscillators: RSI, MACD, Stochastic, ROC and MFI"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .moving_averages import ema, sma, wilder
+from .rolling import rolling_max, rolling_min, rolling_sum, shift, values
+
+
+class MACD(NamedTuple):
+    macd: np.ndarray
+    signal: np.ndarray
+    histogram: np.ndarray
+
+
+class Stochastic(NamedTuple):
+    k: np.ndarray
+    d: np.ndarray
+
+
+def rsi(close, period: int = 14, method: str = "wilder") -> np.ndarray:
+    """
+    Relative Strength Index, 0-100
+
+    Args:
+        close: Closing prices
+        period: Averaging window for gains and losses
+        method: 'wilder' for Wilder's smoothing (the textbook RSI, first
+            value at period), or 'sma' for plain rolling means of gains
+            and losses (Cutler's RSI)
+
+    All-gain windows give 100; windows with no change at all give NaN.
+    """
+    close = values(close)
+    delta = np.diff(close, axis=0, prepend=np.nan)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    gain[np.isnan(delta)] = loss[np.isnan(delta)] = np.nan
+
+    if method == "wilder":
+        avg_gain, avg_loss = wilder(gain, period), wilder(loss, period)
+    elif method == "sma":
+        avg_gain, avg_loss = sma(gain, period), sma(loss, period)
+    else:
+        raise ValueError(f"Unknown RSI method: {method}")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> MACD:
+    """MACD line (fast EMA - slow EMA), its signal EMA and the histogram between them"""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return MACD(line, signal_line, line - signal_line)
+
+
+def stochastic(high, low, close, k_period: int = 14, d_period: int = 3, smooth_k: int = 1) -> Stochastic:
+    """
+    Stochastic oscillator, 0-100
+
+    %K places the close within the k_period high-low range (optionally
+    smoothed over smooth_k bars for the slow stochastic); %D is the SMA
+    of %K over d_period. A range of zero puts %K at 50.
+    """
+    close = values(close)
+    highest = rolling_max(high, k_period)
+    lowest = rolling_min(low, k_period)
+    span = highest - lowest
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = np.where(span > 0, 100 * (close - lowest) / span, 50.0)
+    k[np.isnan(span)] = np.nan
+
+    if smooth_k > 1:
+        k = sma(k, smooth_k)
+    return Stochastic(k, sma(k, d_period))
+
+
+def roc(close, period: int = 10) -> np.ndarray:
+    """Rate of change over period bars, in percent"""
+    close = values(close)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 * (close / shift(close, period) - 1)
+
+
+def mfi(high, low, close, volume, period: int = 14) -> np.ndarray:
+    """
+    Money Flow Index, 0-100: RSI of typical price weighted by volume
+
+    Money flow counts as positive on bars whose typical price rose and
+    negative on bars where it fell; first value at period.
+    """
+    typical = (values(high) + values(low) + values(close)) / 3
+    flow = typical * values(volume)
+    change = np.diff(typical, prepend=np.nan)
+
+    positive = np.where(change > 0, flow, 0.0)
+    negative = np.where(change < 0, flow, 0.0)
+    positive[0] = negative[0] = np.nan
+
+    positive_sum = rolling_sum(positive, period)
+    negative_sum = rolling_sum(negative, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + positive_sum / negative_sum)
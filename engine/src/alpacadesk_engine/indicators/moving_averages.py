@@ -0,0 +1,43 @@
+"""Moving averages: SMA, EMA, WMA and Wilder's smoothing"""
+
+import numpy as np
+
+from .rolling import exponential_smoothing, rolling_mean, values
+
+
+def sma(x, period: int) -> np.ndarray:
+    """Simple moving average"""
+    return rolling_mean(x, period)
+
+
+def ema(x, period: int) -> np.ndarray:
+    """
+    Exponential moving average, alpha = 2 / (period + 1)
+
+    Seeded with the SMA of the first period values, as in TA-Lib, so the
+    first value is at period - 1 (or period - 1 bars after the first
+    valid value when x is itself an indicator with leading NaNs).
+    """
+    return exponential_smoothing(x, 2.0 / (period + 1), seed_period=period)
+
+
+def wilder(x, period: int) -> np.ndarray:
+    """
+    Wilder's smoothing (RMA), alpha = 1 / period, seeded like ema()
+
+    Used by RSI, ATR and ADX.
+    """
+    return exponential_smoothing(x, 1.0 / period, seed_period=period)
+
+
+def wma(x, period: int) -> np.ndarray:
+    """Linearly weighted moving average, weights 1..period (newest heaviest)"""
+    x = values(x)
+    out = np.full(len(x), np.nan)
+    if len(x) < period:
+        return out
+
+    # convolve() flips the kernel, so descending weights put period on the newest value
+    weights = np.arange(period, 0, -1, dtype=np.float64) / (period * (period + 1) / 2)
+    out[period - 1:] = np.convolve(x, weights, mode="valid")
+    return out
@@ -0,0 +1,239 @@
+"""Rolling-window and recursive smoothing primitives on NumPy arrays
+
+Every function takes a 1-D array (or anything np.asarray accepts, such as
+a pandas Series) and returns a float64 array of the same length, NaN
+where the window is not yet full. A NaN inside a window makes that
+window's result NaN, as with pandas' rolling() at min_periods=window.
+
+A 2-D (bars x series) array, such as a panel of closes across symbols,
+is processed along axis 0 as if each column were passed on its own.
+Leading NaNs then stand in for a column's missing history.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+# Smoothing blocks are sized so the carry into the next block decays below this
+_CARRY_TOLERANCE = 1e-17
+
+
+def values(x) -> np.ndarray:
+    """x as a float64 array (no copy if it already is one)"""
+    return np.asarray(x, dtype=np.float64)
+
+
+def rolling_sum(x, period: int) -> np.ndarray:
+    """
+    Sum over the last period values, from block-local prefix sums
+
+    The series is cut into blocks of period values and summed cumulatively
+    within each block. The window ending at t starts just after t - period,
+    one block earlier, so its sum is the prefix sum at t plus the rest of
+    that earlier block. Rounding error stays proportional to one window's
+    values rather than to a running total over the whole series.
+    """
+    x = values(x)
+    _check_period(period)
+    n, tail = len(x), x.shape[1:]
+    out = np.full(x.shape, np.nan)
+    if n < period:
+        return out
+
+    missing = np.isnan(x)
+    padding = np.zeros((-n % period,) + tail)
+    blocks = np.concatenate((np.where(missing, 0.0, x), padding)).reshape((-1, period) + tail)
+    prefix = np.cumsum(blocks, axis=1)
+    totals = prefix[:, -1]
+    prefix = prefix.reshape((-1,) + tail)
+
+    out[period - 1] = prefix[period - 1]
+    out[period:] = prefix[period:n] + (totals[np.arange(n - period) // period] - prefix[:n - period])
+
+    if missing.any():
+        gaps = np.concatenate((np.zeros((1,) + tail, dtype=np.intp), np.cumsum(missing, axis=0)))
+        out[period - 1:][gaps[period:] > gaps[:-period]] = np.nan
+
+    return out
+
+
+def rolling_mean(x, period: int) -> np.ndarray:
+    """Mean over the last period values"""
+    return rolling_sum(x, period) / period
+
+
+def rolling_std(x, period: int, ddof: int = 1) -> np.ndarray:
+    """
+    Standard deviation over the last period values
+
+    From rolling sums of the values and their squares; ddof=1 matches
+    pandas' rolling().std().
+    """
+    x = values(x)
+    _check_period(period)
+    if len(x) < period:
+        return np.full(x.shape, np.nan)
+
+    # Center on the first value so the squares stay small for flat-ish series
+    valid = ~np.isnan(x)
+    first = np.take_along_axis(x, np.expand_dims(np.argmax(valid, axis=0), 0), axis=0)[0]
+    centered = x - np.where(valid.any(axis=0), first, 0.0)
+    sum_x = rolling_sum(centered, period)
+    sum_sq = rolling_sum(centered * centered, period)
+
+    var = (sum_sq - sum_x * sum_x / period) / (period - ddof)
+    return np.sqrt(np.maximum(var, 0.0))
+
+
+def rolling_max(x, period: int) -> np.ndarray:
+    """Maximum over the last period values (van Herk/Gil-Werman, O(n))"""
+    return _rolling_extreme(values(x), period, np.maximum, -np.inf)
+
+
+def rolling_min(x, period: int) -> np.ndarray:
+    """Minimum over the last period values (van Herk/Gil-Werman, O(n))"""
+    return _rolling_extreme(values(x), period, np.minimum, np.inf)
+
+
+def _rolling_extreme(x: np.ndarray, period: int, op: np.ufunc, pad: float) -> np.ndarray:
+    """
+    Rolling max or min from per-block prefix and suffix scans
+
+    With blocks of period values, every window spans the end of one block
+    and the start of the next, so its extreme is op(suffix scan at its
+    first value, prefix scan at its last value). This is the vectorized
+    counterpart of a monotonic deque: two accumulate passes, no Python loop.
+    """
+    _check_period(period)
+    n, tail = len(x), x.shape[1:]
+    out = np.full(x.shape, np.nan)
+    if n < period:
+        return out
+
+    blocks = np.concatenate((x, np.full((-n % period,) + tail, pad))).reshape((-1, period) + tail)
+    prefix = op.accumulate(blocks, axis=1).reshape((-1,) + tail)
+    suffix = op.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape((-1,) + tail)
+
+    out[period - 1:] = op(suffix[:n - period + 1], prefix[period - 1:n])
+    return out
+
+
+def rolling_argmax_age(x, period: int) -> np.ndarray:
+    """Bars since the highest of the last period values (0 = current bar, latest on ties)"""
+    return _extreme_age(values(x), period, np.argmax)
+
+
+def rolling_argmin_age(x, period: int) -> np.ndarray:
+    """Bars since the lowest of the last period values (0 = current bar, latest on ties)"""
+    return _extreme_age(values(x), period, np.argmin)
+
+
+def _extreme_age(x: np.ndarray, period: int, arg) -> np.ndarray:
+    _check_period(period)
+    out = np.full(x.shape, np.nan)
+    if len(x) < period:
+        return out
+
+    # Newest value first, so the first extreme found is the latest one
+    windows = np.lib.stride_tricks.sliding_window_view(x, period, axis=0)[..., ::-1]
+    out[period - 1:] = arg(windows, axis=-1)
+    out[period - 1:][np.isnan(windows).any(axis=-1)] = np.nan
+    return out
+
+
+def linear_recurrence(u, a: float, init=0.0) -> np.ndarray:
+    """
+    y[t] = a * y[t - 1] + u[t], with y[-1] = init, for 0 <= a < 1
+
+    For a 2-D u, init may be a scalar or one value per column.
+
+    Solved in closed form a block at a time: within a block, y is the
+    decayed carry from the previous block plus a^k * cumsum(u[j] / a^j).
+    Blocks are long enough for a^block to fall below 1e-17, so a block's
+    carry only reaches into the next one and every block is computed in
+    one pass of array operations. Rounding error stays near that of the
+    plain loop.
+    """
+    u = values(u)
+    n = len(u)
+    if not 0.0 <= a < 1.0:
+        raise ValueError("Smoothing factor must be in [0, 1)")
+    if n == 0 or a == 0.0:
+        return u + a * init
+
+    tail = u.shape[1:]
+    block = int(min(n, max(1, np.ceil(np.log(_CARRY_TOLERANCE) / np.log(a)))))
+    blocks = np.concatenate((u, np.zeros((-n % block,) + tail))).reshape((-1, block) + tail)
+    powers = (a ** np.arange(block)).reshape((block,) + (1,) * len(tail))
+
+    # Response of each block to its own inputs, starting from zero
+    response = np.cumsum(blocks / powers, axis=1) * powers
+
+    # Each block starts from the previous block's last value
+    carry = np.empty((len(blocks),) + tail)
+    carry[0] = init
+    carry[1:] = response[:-1, -1]
+    if len(blocks) > 1:
+        carry[1] += a ** block * init  # Only matters when a^block is not negligible
+
+    return (response + carry[:, None] * (a * powers)).reshape((-1,) + tail)[:n]
+
+
+def exponential_smoothing(x, alpha: float, seed_period: Optional[int] = None) -> np.ndarray:
+    """
+    y[t] = alpha * x[t] + (1 - alpha) * y[t - 1], from the first valid value
+
+    Args:
+        x: Series, optionally with leading NaNs (e.g. another indicator)
+        alpha: Weight of the newest value, in (0, 1]
+        seed_period: Seed with the mean of the first seed_period valid
+            values (NaN before it); None seeds with the first valid value,
+            like pandas' ewm(adjust=False)
+
+    NaNs after the first valid value propagate to the rest of the series.
+    """
+    x = values(x)
+    out = np.full(x.shape, np.nan)
+    valid = ~np.isnan(x)
+
+    if x.ndim == 1:
+        if valid.any():
+            _smooth_from(x, out, int(np.argmax(valid)), alpha, seed_period)
+        return out
+
+    # Columns starting on the same bar are smoothed together
+    firsts = np.where(valid.any(axis=0), np.argmax(valid, axis=0), -1)
+    for first in np.unique(firsts[firsts >= 0]):
+        columns = firsts == first
+        block = np.full((len(x), int(columns.sum())), np.nan)
+        _smooth_from(x[:, columns], block, int(first), alpha, seed_period)
+        out[:, columns] = block
+    return out
+
+
+def _smooth_from(x: np.ndarray, out: np.ndarray, first: int, alpha: float, seed_period: Optional[int]):
+    """exponential_smoothing() into out, for series whose first valid value is at row first"""
+    if seed_period is None:
+        start, seed = first, x[first]
+    else:
+        start = first + seed_period - 1
+        if start >= len(x):
+            return
+        seed = x[first:start + 1].mean(axis=0)
+
+    out[start] = seed
+    out[start + 1:] = linear_recurrence(alpha * x[start + 1:], 1.0 - alpha, seed)
+
+
+def shift(x, periods: int = 1) -> np.ndarray:
+    """x delayed by periods bars, NaN-filled at the start"""
+    x = values(x)
+    out = np.full(x.shape, np.nan)
+    if periods < len(x):
+        out[periods:] = x[:len(x) - periods]
+    return out
+
+
+def _check_period(period: int):
+    if period < 1:
+        raise ValueError("period must be at least 1")
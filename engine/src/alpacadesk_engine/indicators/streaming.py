@@ -0,0 +1,705 @@
+"""Incremental indicators for live evaluation, O(1) per bar
+
+Each indicator keeps just enough state (running sums over a ring buffer,
+monotonic deques, smoothing state) to move forward one bar at a time:
+
+- update(...) commits a closed bar and returns the new value
+- peek(...) returns the value update() would give for a bar that is
+  still forming, without changing any state, so a live tick can be
+  evaluated many times before the bar closes
+- value is the output as of the last committed bar
+
+Values follow the array functions in this package (same seeding, same
+warm-up, NaN until ready) to within floating-point rounding. Inputs must
+be finite. Seed from history with seed(), which is update() over each row.
+"""
+
+import math
+from collections import deque
+from typing import Optional
+
+from .momentum import MACD as MACDValue, Stochastic as StochasticValue
+from .trend import ADX as ADXValue, Aroon as AroonValue
+from .volatility import Bands
+
+NAN = float("nan")
+
+
+class StreamingIndicator:
+    """Base for single-input indicators: update(x), peek(x), value"""
+
+    value: float = NAN
+
+    def update(self, x: float) -> float:
+        raise NotImplementedError
+
+    def peek(self, x: float) -> float:
+        raise NotImplementedError
+
+    def seed(self, history) -> float:
+        """Feed closed bars in order; returns the last value"""
+        for x in history:
+            self.update(x)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return not math.isnan(self.value)
+
+
+class RollingSum(StreamingIndicator):
+    """
+    Sum of the last period values from a ring buffer and a running total
+
+    The total is re-summed exactly (math.fsum) once every period updates,
+    so rounding from the running adds and subtracts never builds up, at
+    an amortized O(1) cost.
+    """
+
+    def __init__(self, period: int):
+        if period < 1:
+            raise ValueError("period must be at least 1")
+        self.period = period
+        self._buffer = [0.0] * period
+        self._next = 0  # Slot of the oldest value, overwritten next
+        self._count = 0
+        self._total = 0.0
+        self._since_resum = 0
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        self._total += x - self._buffer[self._next]
+        self._buffer[self._next] = x
+        self._next = (self._next + 1) % self.period
+        self._count += 1
+
+        self._since_resum += 1
+        if self._since_resum >= self.period:
+            self._total = math.fsum(self._buffer)
+            self._since_resum = 0
+
+        if self._count >= self.period:
+            self.value = self._total
+        return self.value
+
+    def peek(self, x: float) -> float:
+        if self._count + 1 < self.period:
+            return NAN
+        return self._total + x - self._buffer[self._next]
+
+    @property
+    def oldest(self) -> float:
+        """The value that drops out of the window on the next update (0 before the window fills)"""
+        return self._buffer[self._next]
+
+    def lag(self, k: int) -> float:
+        """The value committed k bars ago (0 = latest), for k < period"""
+        return self._buffer[(self._next - 1 - k) % self.period]
+
+    @property
+    def count(self) -> int:
+        """Values committed so far"""
+        return self._count
+
+
+class SMA(StreamingIndicator):
+    """Simple moving average"""
+
+    def __init__(self, period: int):
+        self._sum = RollingSum(period)
+        self.period = period
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        self.value = self._sum.update(x) / self.period
+        return self.value
+
+    def peek(self, x: float) -> float:
+        return self._sum.peek(x) / self.period
+
+
+class RollingStd(StreamingIndicator):
+    """Rolling standard deviation from running sums of deviations and their squares"""
+
+    def __init__(self, period: int, ddof: int = 1):
+        self.period = period
+        self.ddof = ddof
+        self._center: Optional[float] = None
+        self._sum = RollingSum(period)
+        self._sum_sq = RollingSum(period)
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        if self._center is None:
+            self._center = x
+        d = x - self._center
+        self.value = self._std(self._sum.update(d), self._sum_sq.update(d * d))
+        return self.value
+
+    def peek(self, x: float) -> float:
+        d = x - (x if self._center is None else self._center)
+        return self._std(self._sum.peek(d), self._sum_sq.peek(d * d))
+
+    def _std(self, total: float, total_sq: float) -> float:
+        var = (total_sq - total * total / self.period) / (self.period - self.ddof)
+        return math.sqrt(max(var, 0.0)) if not math.isnan(var) else NAN
+
+
+class RollingMax(StreamingIndicator):
+    """
+    Maximum of the last period values from a monotonic deque
+
+    The deque holds (bar, value) pairs with strictly decreasing values:
+    a new value evicts every older one it equals or exceeds, so the front
+    is the window maximum (the latest one on ties) and each value enters
+    and leaves once.
+    """
+
+    def __init__(self, period: int):
+        if period < 1:
+            raise ValueError("period must be at least 1")
+        self.period = period
+        self._deque = deque()
+        self._bar = -1
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        self._bar += 1
+        window = self._deque
+        while window and window[-1][1] <= x:
+            window.pop()
+        window.append((self._bar, x))
+        if window[0][0] <= self._bar - self.period:
+            window.popleft()
+
+        if self._bar >= self.period - 1:
+            self.value = window[0][1]
+        return self.value
+
+    def peek(self, x: float) -> float:
+        best = self._best_before(self._bar + 1)
+        if best is None:
+            return NAN
+        return x if best[1] <= x else best[1]
+
+    @property
+    def age(self) -> float:
+        """Bars since the window maximum was set (0 = latest bar), NaN until ready"""
+        if math.isnan(self.value):
+            return NAN
+        return float(self._bar - self._deque[0][0])
+
+    def peek_age(self, x: float) -> float:
+        """age as peek() would leave it"""
+        best = self._best_before(self._bar + 1)
+        if best is None:
+            return NAN
+        return 0.0 if best[1] <= x else float(self._bar + 1 - best[0])
+
+    def _best_before(self, bar: int):
+        """Largest committed value still in the window ending at bar; (bar, -inf) if none"""
+        if bar < self.period - 1:
+            return None
+        window = self._deque
+        if window and window[0][0] > bar - self.period:
+            return window[0]
+        if len(window) > 1:
+            return window[1]
+        return (bar, -math.inf)
+
+
+class RollingMin(StreamingIndicator):
+    """Minimum of the last period values (a RollingMax of the negated series)"""
+
+    def __init__(self, period: int):
+        self._max = RollingMax(period)
+        self.period = period
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        self.value = -self._max.update(-x)
+        return self.value
+
+    def peek(self, x: float) -> float:
+        return -self._max.peek(-x)
+
+    @property
+    def age(self) -> float:
+        return self._max.age
+
+    def peek_age(self, x: float) -> float:
+        return self._max.peek_age(-x)
+
+
+class ExponentialSmoothing(StreamingIndicator):
+    """
+    y = alpha * x + (1 - alpha) * y, seeded like rolling.exponential_smoothing()
+
+    With seed_period, the first value is the mean of the first seed_period
+    inputs; without it, the first input itself.
+    """
+
+    def __init__(self, alpha: float, seed_period: Optional[int] = None):
+        self.alpha = alpha
+        self.seed_period = seed_period or 1
+        self._count = 0
+        self._seed_sum = 0.0
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        self.value = self.peek(x)
+        if self._count < self.seed_period:
+            self._seed_sum += x
+        self._count += 1
+        return self.value
+
+    def peek(self, x: float) -> float:
+        if self._count >= self.seed_period:
+            return (1.0 - self.alpha) * self.value + self.alpha * x
+        if self._count == self.seed_period - 1:
+            return (self._seed_sum + x) / self.seed_period
+        return NAN
+
+
+class EMA(ExponentialSmoothing):
+    """Exponential moving average seeded with an SMA, as moving_averages.ema()"""
+
+    def __init__(self, period: int):
+        super().__init__(2.0 / (period + 1), seed_period=period)
+        self.period = period
+
+
+class Wilder(ExponentialSmoothing):
+    """Wilder's smoothing seeded with an SMA, as moving_averages.wilder()"""
+
+    def __init__(self, period: int):
+        super().__init__(1.0 / period, seed_period=period)
+        self.period = period
+
+
+class WMA(StreamingIndicator):
+    """
+    Linearly weighted moving average
+
+    Adding a bar raises every weight by one, so the weighted sum moves by
+    period * x minus the plain sum of the previous window. It is rebuilt
+    exactly from the buffer whenever the plain sum is.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self._sum = RollingSum(period)
+        self._weighted = 0.0
+        self._divisor = period * (period + 1) / 2
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        self._weighted += self.period * x - self._sum._total
+        self._sum.update(x)
+        if self._sum._since_resum == 0:
+            self._weighted = math.fsum(
+                (i + 1) * self._sum.lag(self.period - 1 - i) for i in range(self.period)
+            )
+        if self._sum.count >= self.period:
+            self.value = self._weighted / self._divisor
+        return self.value
+
+    def peek(self, x: float) -> float:
+        if self._sum.count + 1 < self.period:
+            return NAN
+        return (self._weighted + self.period * x - self._sum._total) / self._divisor
+
+
+class RSI(StreamingIndicator):
+    """Relative Strength Index, as momentum.rsi() ('wilder' or 'sma' averaging)"""
+
+    def __init__(self, period: int = 14, method: str = "wilder"):
+        if method == "wilder":
+            self._gain, self._loss = Wilder(period), Wilder(period)
+        elif method == "sma":
+            self._gain, self._loss = SMA(period), SMA(period)
+        else:
+            raise ValueError(f"Unknown RSI method: {method}")
+        self._prev: Optional[float] = None
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        if self._prev is not None:
+            delta = x - self._prev
+            self.value = _rsi(self._gain.update(max(delta, 0.0)), self._loss.update(max(-delta, 0.0)))
+        self._prev = x
+        return self.value
+
+    def peek(self, x: float) -> float:
+        if self._prev is None:
+            return NAN
+        delta = x - self._prev
+        return _rsi(self._gain.peek(max(delta, 0.0)), self._loss.peek(max(-delta, 0.0)))
+
+
+class MACD:
+    """MACD line, signal and histogram, as momentum.macd()"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast, self._slow = EMA(fast), EMA(slow)
+        self._signal = EMA(signal)
+        self.value = MACDValue(NAN, NAN, NAN)
+
+    def update(self, x: float) -> MACDValue:
+        line = self._fast.update(x) - self._slow.update(x)
+        signal = self._signal.update(line) if not math.isnan(line) else NAN
+        self.value = MACDValue(line, signal, line - signal)
+        return self.value
+
+    def peek(self, x: float) -> MACDValue:
+        line = self._fast.peek(x) - self._slow.peek(x)
+        signal = self._signal.peek(line) if not math.isnan(line) else NAN
+        return MACDValue(line, signal, line - signal)
+
+
+class Bollinger:
+    """Bollinger Bands, as volatility.bollinger()"""
+
+    def __init__(self, period: int = 20, std_dev: float = 2.0, ddof: int = 1):
+        self.std_dev = std_dev
+        self._mean = SMA(period)
+        self._std = RollingStd(period, ddof=ddof)
+        self.value = Bands(NAN, NAN, NAN)
+
+    def update(self, x: float) -> Bands:
+        self.value = self._bands(self._mean.update(x), self._std.update(x))
+        return self.value
+
+    def peek(self, x: float) -> Bands:
+        return self._bands(self._mean.peek(x), self._std.peek(x))
+
+    def _bands(self, middle: float, std: float) -> Bands:
+        width = self.std_dev * std
+        return Bands(middle, middle + width, middle - width)
+
+
+class ATR:
+    """Average True Range, as volatility.atr(); update(high, low, close)"""
+
+    def __init__(self, period: int = 14):
+        self._smooth = Wilder(period)
+        self._prev_close: Optional[float] = None
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        if self._prev_close is not None:
+            self.value = self._smooth.update(_true_range(high, low, self._prev_close))
+        self._prev_close = close
+        return self.value
+
+    def peek(self, high: float, low: float, close: float) -> float:
+        if self._prev_close is None:
+            return NAN
+        return self._smooth.peek(_true_range(high, low, self._prev_close))
+
+
+class Keltner:
+    """Keltner Channels, as volatility.keltner(); update(high, low, close)"""
+
+    def __init__(self, period: int = 20, multiplier: float = 2.0, atr_period: int = 10):
+        self.multiplier = multiplier
+        self._middle = EMA(period)
+        self._atr = ATR(atr_period)
+        self.value = Bands(NAN, NAN, NAN)
+
+    def update(self, high: float, low: float, close: float) -> Bands:
+        self.value = self._bands(self._middle.update(close), self._atr.update(high, low, close))
+        return self.value
+
+    def peek(self, high: float, low: float, close: float) -> Bands:
+        return self._bands(self._middle.peek(close), self._atr.peek(high, low, close))
+
+    def _bands(self, middle: float, atr: float) -> Bands:
+        width = self.multiplier * atr
+        return Bands(middle, middle + width, middle - width)
+
+
+class Stochastic:
+    """Stochastic oscillator, as momentum.stochastic(); update(high, low, close)"""
+
+    def __init__(self, k_period: int = 14, d_period: int = 3, smooth_k: int = 1):
+        self._highest = RollingMax(k_period)
+        self._lowest = RollingMin(k_period)
+        self._smooth = SMA(smooth_k) if smooth_k > 1 else None
+        self._d = SMA(d_period)
+        self.value = StochasticValue(NAN, NAN)
+
+    def update(self, high: float, low: float, close: float) -> StochasticValue:
+        k = _stochastic_k(self._highest.update(high), self._lowest.update(low), close)
+        if self._smooth is not None and not math.isnan(k):
+            k = self._smooth.update(k)
+        d = self._d.update(k) if not math.isnan(k) else NAN
+        self.value = StochasticValue(k, d)
+        return self.value
+
+    def peek(self, high: float, low: float, close: float) -> StochasticValue:
+        k = _stochastic_k(self._highest.peek(high), self._lowest.peek(low), close)
+        if self._smooth is not None and not math.isnan(k):
+            k = self._smooth.peek(k)
+        d = self._d.peek(k) if not math.isnan(k) else NAN
+        return StochasticValue(k, d)
+
+
+class ROC(StreamingIndicator):
+    """Rate of change over period bars, in percent"""
+
+    def __init__(self, period: int = 10):
+        self.period = period
+        self._window = RollingSum(period)  # Only its ring buffer is used
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        self.value = self.peek(x)
+        self._window.update(x)
+        return self.value
+
+    def peek(self, x: float) -> float:
+        if self._window.count < self.period:
+            return NAN
+        base = self._window.oldest
+        return 100 * (x / base - 1) if base != 0 else NAN
+
+
+class MFI:
+    """Money Flow Index, as momentum.mfi(); update(high, low, close, volume)"""
+
+    def __init__(self, period: int = 14):
+        self._positive = RollingSum(period)
+        self._negative = RollingSum(period)
+        self._prev_typical: Optional[float] = None
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        typical = (high + low + close) / 3
+        if self._prev_typical is not None:
+            positive, negative = self._flows(typical, volume)
+            self.value = _rsi(self._positive.update(positive), self._negative.update(negative))
+        self._prev_typical = typical
+        return self.value
+
+    def peek(self, high: float, low: float, close: float, volume: float) -> float:
+        if self._prev_typical is None:
+            return NAN
+        positive, negative = self._flows((high + low + close) / 3, volume)
+        return _rsi(self._positive.peek(positive), self._negative.peek(negative))
+
+    def _flows(self, typical: float, volume: float):
+        flow = typical * volume
+        if typical > self._prev_typical:
+            return flow, 0.0
+        if typical < self._prev_typical:
+            return 0.0, flow
+        return 0.0, 0.0
+
+
+class OBV:
+    """On-balance volume from 0, as volume.obv(); update(close, volume)"""
+
+    def __init__(self):
+        self._prev_close: Optional[float] = None
+        self.value = NAN
+
+    def update(self, close: float, volume: float) -> float:
+        self.value = self.peek(close, volume)
+        self._prev_close = close
+        return self.value
+
+    def peek(self, close: float, volume: float) -> float:
+        if self._prev_close is None:
+            return 0.0
+        if close > self._prev_close:
+            return self.value + volume
+        if close < self._prev_close:
+            return self.value - volume
+        return self.value
+
+
+class VWAP:
+    """
+    Volume-weighted average price, as volume.vwap()
+
+    update(high, low, close, volume, session=None): with period, a rolling
+    VWAP; otherwise cumulative, restarting whenever session changes.
+    """
+
+    def __init__(self, period: Optional[int] = None):
+        self.period = period
+        if period is not None:
+            self._weighted, self._volume = RollingSum(period), RollingSum(period)
+        self._session = None
+        self._weighted_total = 0.0
+        self._volume_total = 0.0
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float, volume: float, session=None) -> float:
+        weighted = (high + low + close) / 3 * volume
+        if self.period is not None:
+            self.value = _ratio(self._weighted.update(weighted), self._volume.update(volume))
+            return self.value
+
+        if session != self._session:
+            self._session = session
+            self._weighted_total = self._volume_total = 0.0
+        self._weighted_total += weighted
+        self._volume_total += volume
+        self.value = _ratio(self._weighted_total, self._volume_total)
+        return self.value
+
+    def peek(self, high: float, low: float, close: float, volume: float, session=None) -> float:
+        weighted = (high + low + close) / 3 * volume
+        if self.period is not None:
+            return _ratio(self._weighted.peek(weighted), self._volume.peek(volume))
+        if session != self._session:
+            return _ratio(weighted, volume)
+        return _ratio(self._weighted_total + weighted, self._volume_total + volume)
+
+
+class ADX:
+    """Average Directional Index with +DI/-DI, as trend.adx(); update(high, low, close)"""
+
+    def __init__(self, period: int = 14):
+        self._tr, self._plus, self._minus = Wilder(period), Wilder(period), Wilder(period)
+        self._adx = Wilder(period)
+        self._prev = None  # (high, low, close) of the last committed bar
+        self.value = ADXValue(NAN, NAN, NAN)
+
+    def update(self, high: float, low: float, close: float) -> ADXValue:
+        if self._prev is not None:
+            tr, plus_dm, minus_dm = self._movement(high, low)
+            self.value = self._lines(
+                self._tr.update(tr), self._plus.update(plus_dm), self._minus.update(minus_dm), self._adx.update
+            )
+        self._prev = (high, low, close)
+        return self.value
+
+    def peek(self, high: float, low: float, close: float) -> ADXValue:
+        if self._prev is None:
+            return self.value
+        tr, plus_dm, minus_dm = self._movement(high, low)
+        return self._lines(
+            self._tr.peek(tr), self._plus.peek(plus_dm), self._minus.peek(minus_dm), self._adx.peek
+        )
+
+    def _movement(self, high: float, low: float):
+        prev_high, prev_low, prev_close = self._prev
+        up, down = high - prev_high, prev_low - low
+        plus_dm = up if up > down and up > 0 else 0.0
+        minus_dm = down if down > up and down > 0 else 0.0
+        return _true_range(high, low, prev_close), plus_dm, minus_dm
+
+    @staticmethod
+    def _lines(tr: float, plus_dm: float, minus_dm: float, smooth_dx) -> ADXValue:
+        plus_di = 100 * _ratio(plus_dm, tr)
+        minus_di = 100 * _ratio(minus_dm, tr)
+        if math.isnan(plus_di) or math.isnan(minus_di):
+            return ADXValue(NAN, plus_di, minus_di)
+        dx = 100 * _ratio(abs(plus_di - minus_di), plus_di + minus_di)
+        return ADXValue(smooth_dx(dx) if not math.isnan(dx) else NAN, plus_di, minus_di)
+
+
+class Aroon:
+    """Aroon up/down/oscillator, as trend.aroon(); update(high, low)"""
+
+    def __init__(self, period: int = 25):
+        self.period = period
+        self._highest = RollingMax(period + 1)
+        self._lowest = RollingMin(period + 1)
+        self.value = AroonValue(NAN, NAN, NAN)
+
+    def update(self, high: float, low: float) -> AroonValue:
+        self._highest.update(high)
+        self._lowest.update(low)
+        self.value = self._lines(self._highest.age, self._lowest.age)
+        return self.value
+
+    def peek(self, high: float, low: float) -> AroonValue:
+        return self._lines(self._highest.peek_age(high), self._lowest.peek_age(low))
+
+    def _lines(self, high_age: float, low_age: float) -> AroonValue:
+        up = 100 * (self.period - high_age) / self.period
+        down = 100 * (self.period - low_age) / self.period
+        return AroonValue(up, down, up - down)
+
+
+class ParabolicSAR:
+    """Wilder's Parabolic SAR, as trend.parabolic_sar(); update(high, low)"""
+
+    def __init__(self, acceleration: float = 0.02, maximum: float = 0.2):
+        self.acceleration = acceleration
+        self.maximum = maximum
+        self._bars = []  # (high, low) of the last two committed bars
+        self._state = None  # (long, sar, extreme, factor)
+        self.value = NAN
+
+    def update(self, high: float, low: float) -> float:
+        state = self._next_state(high, low)
+        if state is not None:
+            self._state = state
+            self.value = state[1]
+        self._bars = (self._bars + [(high, low)])[-2:]
+        return self.value
+
+    def peek(self, high: float, low: float) -> float:
+        state = self._next_state(high, low)
+        return state[1] if state is not None else NAN
+
+    def _next_state(self, high: float, low: float):
+        """State after a bar at (high, low); one step of trend.parabolic_sar()'s loop"""
+        if not self._bars:
+            return None
+
+        prev_high, prev_low = self._bars[-1]
+        before_high, before_low = self._bars[0] if len(self._bars) > 1 else self._bars[-1]
+        if self._state is None:
+            # Second bar: pick the first trend from the first two bars
+            long = not (prev_low - low > max(high - prev_high, 0.0))
+            sar, extreme = (prev_low, prev_high) if long else (prev_high, prev_low)
+            factor = self.acceleration
+        else:
+            long, sar, extreme, factor = self._state
+
+        sar += factor * (extreme - sar)
+        if long:
+            sar = min(sar, prev_low, before_low)
+            if low < sar:
+                return False, extreme, low, self.acceleration
+            if high > extreme:
+                extreme, factor = high, min(factor + self.acceleration, self.maximum)
+        else:
+            sar = max(sar, prev_high, before_high)
+            if high > sar:
+                return True, extreme, high, self.acceleration
+            if low < extreme:
+                extreme, factor = low, min(factor + self.acceleration, self.maximum)
+        return long, sar, extreme, factor
+
+
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+def _stochastic_k(highest: float, lowest: float, close: float) -> float:
+    span = highest - lowest
+    if math.isnan(span):
+        return NAN
+    return 100 * (close - lowest) / span if span > 0 else 50.0
+
+
+def _rsi(up: float, down: float) -> float:
+    """100 - 100 / (1 + up / down), with IEEE semantics for a zero denominator"""
+    if math.isnan(up) or math.isnan(down):
+        return NAN
+    if down == 0:
+        return 100.0 if up > 0 else NAN
+    return 100 - 100 / (1 + up / down)
+
+
+def _ratio(a: float, b: float) -> float:
+    if b == 0:
+        return math.copysign(math.inf, a) if a != 0 else NAN
+    return a / b
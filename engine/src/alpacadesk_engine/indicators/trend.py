@@ -0,0 +1,102 @@
+"""Trend indicators: ADX, Aroon and Parabolic SAR"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .moving_averages import wilder
+from .rolling import rolling_argmax_age, rolling_argmin_age, shift, values
+from .volatility import true_range
+
+
+class ADX(NamedTuple):
+    adx: np.ndarray
+    plus_di: np.ndarray
+    minus_di: np.ndarray
+
+
+class Aroon(NamedTuple):
+    up: np.ndarray
+    down: np.ndarray
+    oscillator: np.ndarray
+
+
+def adx(high, low, close, period: int = 14) -> ADX:
+    """
+    Average Directional Index with the +DI/-DI lines, 0-100
+
+    Directional movement, true range and DX are all Wilder-smoothed as in
+    TA-Lib: the DI lines start at period, ADX at 2 * period - 1.
+    """
+    high, low = values(high), values(low)
+    up = high - shift(high, 1)
+    down = shift(low, 1) - low
+
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    tr = true_range(high, low, close)
+    if len(tr):
+        plus_dm[0] = minus_dm[0] = tr[0] = np.nan
+
+    smoothed_tr = wilder(tr, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = 100 * wilder(plus_dm, period) / smoothed_tr
+        minus_di = 100 * wilder(minus_dm, period) / smoothed_tr
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+
+    return ADX(wilder(dx, period), plus_di, minus_di)
+
+
+def aroon(high, low, period: int = 25) -> Aroon:
+    """
+    Aroon up/down, 0-100: how recently the period high/low was set
+
+    Looks back over period + 1 bars (the current bar plus period before
+    it); on ties the most recent extreme counts, as in TA-Lib.
+    """
+    up = 100 * (period - rolling_argmax_age(high, period + 1)) / period
+    down = 100 * (period - rolling_argmin_age(low, period + 1)) / period
+    return Aroon(up, down, up - down)
+
+
+def parabolic_sar(high, low, acceleration: float = 0.02, maximum: float = 0.2) -> np.ndarray:
+    """
+    Wilder's Parabolic SAR
+
+    The stop trails the extreme point of the current trend, closing in by
+    an acceleration factor that rises by acceleration with each new
+    extreme (up to maximum), and flips to the extreme point when price
+    crosses it. The first trend is long unless the second bar's downward
+    movement is the larger. Each value depends on the previous one, so
+    this is a plain loop; first value at bar 1.
+    """
+    high, low = values(high), values(low)
+    n = len(high)
+    out = np.full(n, np.nan)
+    if n < 2:
+        return out
+
+    hi, lo = high.tolist(), low.tolist()
+    long = not (lo[0] - lo[1] > max(hi[1] - hi[0], 0.0))
+    sar = lo[0] if long else hi[0]
+    extreme = hi[0] if long else lo[0]
+    factor = acceleration
+
+    for i in range(1, n):
+        sar += factor * (extreme - sar)
+        if long:
+            # The stop may not rise into the prior two bars' range
+            sar = min(sar, lo[i - 1], lo[i - 2] if i > 1 else lo[i - 1])
+            if lo[i] < sar:
+                long, sar, extreme, factor = False, extreme, lo[i], acceleration
+            elif hi[i] > extreme:
+                extreme, factor = hi[i], min(factor + acceleration, maximum)
+        else:
+            sar = max(sar, hi[i - 1], hi[i - 2] if i > 1 else hi[i - 1])
+            if hi[i] > sar:
+                long, sar, extreme, factor = True, extreme, hi[i], acceleration
+            elif lo[i] < extreme:
+                extreme, factor = lo[i], min(factor + acceleration, maximum)
+        out[i] = sar
+
+    return out
@@ -0,0 +1,56 @@
+"""Volatility indicators: Bollinger Bands, ATR and Keltner Channels"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .moving_averages import ema, sma, wilder
+from .rolling import rolling_std, shift, values
+
+
+class Bands(NamedTuple):
+    middle: np.ndarray
+    upper: np.ndarray
+    lower: np.ndarray
+
+
+def bollinger(close, period: int = 20, std_dev: float = 2.0, ddof: int = 1) -> Bands:
+    """
+    Bollinger Bands: SMA +/- std_dev rolling standard deviations
+
+    ddof=1 (sample deviation) matches pandas' rolling().std(); TA-Lib
+    and Bollinger's own definition use ddof=0.
+    """
+    middle = sma(close, period)
+    width = std_dev * rolling_std(close, period, ddof=ddof)
+    return Bands(middle, middle + width, middle - width)
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """Greatest of high - low and the gaps from the previous close (high - low on the first bar)"""
+    high, low = values(high), values(low)
+    prev_close = shift(close, 1)
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return tr
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """
+    Average True Range with Wilder's smoothing
+
+    Seeded with the mean true range of bars 1..period, skipping the first
+    bar's gapless range as TA-Lib does, so the first value is at period.
+    """
+    tr = true_range(high, low, close)
+    if len(tr):
+        tr[0] = np.nan
+    return wilder(tr, period)
+
+
+def keltner(
+    high, low, close, period: int = 20, multiplier: float = 2.0, atr_period: int = 10
+) -> Bands:
+    """Keltner Channels: EMA of close +/- multiplier ATRs"""
+    middle = ema(close, period)
+    width = multiplier * atr(high, low, close, atr_period)
+    return Bands(middle, middle + width, middle - width)
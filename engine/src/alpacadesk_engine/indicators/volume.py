@@ -0,0 +1,49 @@
+"""Volume indicators: OBV and VWAP"""
+
+from typing import Optional
+
+import numpy as np
+
+from .rolling import rolling_sum, values
+
+
+def obv(close, volume) -> np.ndarray:
+    """On-balance volume: running total of volume signed by the close's direction, from 0"""
+    direction = np.sign(np.diff(values(close), prepend=np.nan))
+    flow = np.nan_to_num(direction) * values(volume)
+    return np.cumsum(flow)
+
+
+def vwap(high, low, close, volume, period: Optional[int] = None, session=None) -> np.ndarray:
+    """
+    Volume-weighted average of the typical price (high + low + close) / 3
+
+    Args:
+        period: Average over the last period bars (rolling VWAP, the usual
+            choice on daily bars)
+        session: Per-bar session labels, e.g. bar dates for intraday data;
+            the average restarts at each new label (anchored VWAP).
+            Ignored when period is given.
+
+    With neither, the average runs over the whole series. Bars with no
+    volume so far give NaN.
+    """
+    volume = values(volume)
+    weighted = (values(high) + values(low) + values(close)) / 3 * volume
+
+    if period is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return rolling_sum(weighted, period) / rolling_sum(volume, period)
+
+    weighted_sum = np.cumsum(weighted)
+    volume_sum = np.cumsum(volume)
+    if session is not None and len(volume):
+        labels = np.asarray(session)
+        starts = np.flatnonzero(np.concatenate(([True], labels[1:] != labels[:-1])))
+        # Subtract the running totals as they stood before each session began
+        counts = np.diff(np.append(starts, len(volume)))
+        weighted_sum -= np.repeat(np.concatenate(([0.0], weighted_sum[starts[1:] - 1])), counts)
+        volume_sum -= np.repeat(np.concatenate(([0.0], volume_sum[starts[1:] - 1])), counts)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return weighted_sum / volume_sum
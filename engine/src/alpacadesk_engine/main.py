@@ -23,6 +23,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     print("👋 AlpacaDesk Engine shutting down...")
+    backtest.shutdown_job_queue()
 
 
 app = FastAPI(
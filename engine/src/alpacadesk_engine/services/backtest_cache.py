@@ -0,0 +1,230 @@
+"""Content-addressed cache of backtest results"""
+
+import hashlib
+import inspect
+import json
+import os
+import zlib
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Type
+
+from sqlalchemy import func
+
+from ..strategies.base import BaseStrategy
+from ..utils.database import get_db
+from ..utils.models import BacktestCacheEntry
+
+# Bump when results change for identical inputs in ways the code fingerprints
+# cannot see: the cached payload's format, a dependency upgrade, or a build
+# shipped without sources (where only this version invalidates old entries)
+CACHE_FORMAT_VERSION = 3
+
+# Packages whose source is hashed into every key: fills, commissions,
+# positions and metrics (backtest), indicator math (indicators), and signal
+# code shared across strategies, such as rule compilation (strategies)
+ENGINE_PACKAGES = ("backtest", "indicators", "strategies")
+
+# Bars of ranges ending before today are final; ranges reaching today are
+# re-simulated once the stamp rolls over (every LIVE_STAMP_MINUTES)
+LIVE_STAMP_MINUTES = 15
+
+
+@lru_cache(maxsize=None)
+def strategy_fingerprint(strategy_class: Type[BaseStrategy]) -> str:
+    """
+    Identify a strategy implementation
+
+    Combines the class path, its version attribute and, when available,
+    the source of every strategy class in its MRO, so editing signal
+    logic invalidates cached results even if nobody bumps the version.
+    """
+    parts = [f"{strategy_class.__module__}.{strategy_class.__qualname__}", str(strategy_class.version)]
+
+    for cls in strategy_class.__mro__:
+        if not (isinstance(cls, type) and issubclass(cls, BaseStrategy)):
+            continue
+        try:
+            parts.append(inspect.getsource(cls))
+        except (OSError, TypeError):
+            pass  # Frozen builds ship without sources; the version still applies
+
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def engine_fingerprint() -> str:
+    """
+    Identify the engine, indicator and strategy code a backtest runs on
+
+    Hashes the source files of ENGINE_PACKAGES, so a fix anywhere in them
+    invalidates cached results, including those of past ranges whose data
+    stamp never changes.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha256()
+
+    for package in ENGINE_PACKAGES:
+        directory = os.path.join(root, package)
+        try:
+            names = sorted(name for name in os.listdir(directory) if name.endswith(".py"))
+        except OSError:
+            continue  # Frozen builds ship without sources; CACHE_FORMAT_VERSION still applies
+
+        for name in names:
+            digest.update(f"{package}/{name}\n".encode())
+            with open(os.path.join(directory, name), "rb") as f:
+                digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+def market_data_stamp(end_date: datetime, timeframe: str = "1day", now: Optional[datetime] = None) -> str:
+    """
+    Version of the bars a backtest would download, without downloading them
+
+    Completed days never change, so ranges ending before today share one
+    stamp forever. Ranges reaching today get a stamp that rolls over every
+    LIVE_STAMP_MINUTES.
+    """
+    now = now or datetime.utcnow()
+    end = end_date.replace(tzinfo=None) if end_date.tzinfo else end_date
+
+    if end.date() < now.date():
+        return f"{timeframe}:final"
+
+    bucket = now - timedelta(
+        minutes=now.minute % LIVE_STAMP_MINUTES, seconds=now.second, microseconds=now.microsecond
+    )
+    return f"{timeframe}:live:{bucket.isoformat()}"
+
+
+def backtest_cache_key(
+    strategy_class: Type[BaseStrategy],
+    parameters: Dict[str, Any],
+    symbols: List[str],
+    start_date: datetime,
+    end_date: datetime,
+    initial_capital: float,
+    slippage_pct: float,
+    commission_per_trade: float,
+    data_stamp: str,
+) -> str:
+    """
+    Hash everything that determines a backtest's output
+
+    Besides the inputs, the key covers the code: the strategy class (see
+    strategy_fingerprint()), the engine, indicator and strategy packages
+    (see engine_fingerprint()) and CACHE_FORMAT_VERSION.
+
+    Args:
+        parameters: Effective strategy parameters (defaults applied)
+        symbols: Symbols in request order (the first drives buy and hold)
+        data_stamp: Market data version, see market_data_stamp()
+    """
+    content = {
+        "format": CACHE_FORMAT_VERSION,
+        "engine": engine_fingerprint(),
+        "strategy": strategy_fingerprint(strategy_class),
+        "parameters": parameters,
+        "symbols": symbols,
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "initial_capital": initial_capital,
+        "slippage_pct": slippage_pct,
+        "commission_per_trade": commission_per_trade,
+        "data": data_stamp,
+    }
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class BacktestCache:
+    """
+    SQLite-backed backtest result cache
+
+    Features:
+    - Entries are zlib-compressed JSON keyed by backtest_cache_key()
+    - Least recently used entries are evicted once the total compressed
+      size exceeds max_bytes
+    - Hits refresh the entry's access time and hit count
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached value for key, or None"""
+        with get_db() as db:
+            entry = db.get(BacktestCacheEntry, key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            entry.last_accessed_at = datetime.utcnow()
+            entry.hits += 1
+            payload = entry.payload
+
+        self.hits += 1
+        return json.loads(zlib.decompress(payload))
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """Store a JSON-serializable value, then enforce the size budget"""
+        payload = zlib.compress(json.dumps(value, separators=(",", ":")).encode(), 6)
+        now = datetime.utcnow()
+
+        with get_db() as db:
+            db.merge(BacktestCacheEntry(
+                key=key,
+                payload=payload,
+                size_bytes=len(payload),
+                created_at=now,
+                last_accessed_at=now,
+                hits=0,
+            ))
+            db.flush()
+            self._evict(db)
+
+    def _evict(self, db):
+        """Delete least recently used entries until under max_bytes"""
+        total = db.query(func.coalesce(func.sum(BacktestCacheEntry.size_bytes), 0)).scalar()
+        if total <= self.max_bytes:
+            return
+
+        oldest = (
+            db.query(BacktestCacheEntry.key, BacktestCacheEntry.size_bytes)
+            .order_by(BacktestCacheEntry.last_accessed_at)
+            .all()
+        )
+        doomed = []
+        for key, size in oldest:
+            if total <= self.max_bytes:
+                break
+            doomed.append(key)
+            total -= size
+
+        db.query(BacktestCacheEntry).filter(
+            BacktestCacheEntry.key.in_(doomed)
+        ).delete(synchronize_session=False)
+
+    def clear(self) -> int:
+        """Delete every entry, returning how many were removed"""
+        with get_db() as db:
+            return db.query(BacktestCacheEntry).delete()
+
+    def stats(self) -> Dict[str, Any]:
+        with get_db() as db:
+            entries, size = db.query(
+                func.count(BacktestCacheEntry.key),
+                func.coalesce(func.sum(BacktestCacheEntry.size_bytes), 0),
+            ).one()
+
+        return {
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
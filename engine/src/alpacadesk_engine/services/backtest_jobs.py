@@ -0,0 +1,649 @@
+"""Background backtest jobs executed in worker processes"""
+
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Type, Union
+
+import pandas as pd
+
+from ..backtest.bar_store import BarStore
+from ..backtest.checkpoint import Checkpoint, load_checkpoint
+from ..backtest.engine import BacktestEngine
+from ..backtest.halving import SuccessiveHalvingOptimizer
+from ..backtest.progress import BacktestCancelled, ProgressReporter
+from ..backtest.sweep import ParameterSweep
+from ..backtest.walk_forward import WalkForwardOptimizer
+from ..strategies.base import BaseStrategy
+from .backtest_cache import BacktestCache, backtest_cache_key, market_data_stamp
+from ..utils.database import DB_DIR, get_db
+from ..utils.models import AnalysisResult, BacktestResult
+
+# Job lifecycle: queued -> fetching -> running -> completed | failed | cancelled
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+# Job kinds other than a single backtest; they search over spec.options["param_grid"]
+ANALYSIS_KINDS = ("sweep", "optimize", "walk_forward")
+
+# Checkpoints of unfinished jobs, named by the job's cache key
+CHECKPOINT_DIR = os.path.join(DB_DIR, "checkpoints")
+
+
+@dataclass
+class BacktestJobSpec:
+    """Inputs of one backtest job, or of a sweep, optimization or walk-forward analysis"""
+    strategy_type: str
+    strategy_class: Type[BaseStrategy]
+    symbols: List[str]
+    parameters: Dict[str, Any]
+    start_date: datetime
+    end_date: datetime
+    initial_capital: float = 100000.0
+    slippage_pct: float = 0.05
+    commission_per_trade: float = 0.0
+    progress_interval: float = 0.5  # Minimum seconds between progress reports
+    timeframe: str = "1day"  # Intraday timeframes run from the local BarStore
+    profile: bool = False  # Record a BacktestProfile (bypasses the result cache)
+    checkpoint_path: Optional[str] = None  # Resume from and save checkpoints to this file
+    kind: str = "backtest"  # Or one of ANALYSIS_KINDS
+    options: Dict[str, Any] = field(default_factory=dict)  # Analysis settings: param_grid, rank_by, ...
+
+
+@dataclass
+class BacktestJob:
+    """A submitted backtest and its current state"""
+    id: str
+    spec: BacktestJobSpec
+    status: str = "queued"
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None  # {"metrics": ..., "equity_curve": [...]}
+    result_id: Optional[int] = None  # Row id in backtest_results (analysis_results for analyses)
+    cached: bool = False  # Result served from the backtest cache
+    progress: Optional[Dict[str, Any]] = None  # Latest BacktestProgress as a dict
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    future: Optional[Future] = field(default=None, repr=False)
+    subscribers: Set[asyncio.Queue] = field(default_factory=set, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Status summary (without the result payload)"""
+        return {
+            "job_id": self.id,
+            "kind": self.spec.kind,
+            "status": self.status,
+            "strategy_type": self.spec.strategy_type,
+            "symbols": self.spec.symbols,
+            "start_date": self.spec.start_date.isoformat(),
+            "end_date": self.spec.end_date.isoformat(),
+            "timeframe": self.spec.timeframe,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+            "result_id": self.result_id,
+            "cached": self.cached,
+            "percent": self.progress["percent"] if self.progress else None,
+        }
+
+
+def run_backtest_job(
+    spec: BacktestJobSpec,
+    market_data: Union[Dict[str, pd.DataFrame], BarStore],
+    job_id: Optional[str] = None,
+    progress_queue=None,
+    cancelled=None,
+) -> Dict[str, Any]:
+    """
+    Run one backtest inside a worker process and return plain data
+
+    Args:
+        spec: What to backtest
+        market_data: Daily bars for all symbols, or the BarStore holding
+            the intraday bars of spec.timeframe
+        job_id: Tag for progress messages
+        progress_queue: Shared queue receiving (job_id, progress dict)
+        cancelled: Shared mapping of cancelled job ids, checked at each report
+    """
+    strategy = spec.strategy_class(spec.symbols, spec.parameters)
+    engine = BacktestEngine(
+        initial_capital=spec.initial_capital,
+        slippage_pct=spec.slippage_pct,
+        commission_per_trade=spec.commission_per_trade,
+        profile=spec.profile,
+        checkpoint_path=spec.checkpoint_path,
+    )
+    checkpoint = _load_job_checkpoint(spec)
+
+    progress = None
+    if progress_queue is not None:
+        def report(snapshot):
+            if cancelled is not None and job_id in cancelled:
+                raise BacktestCancelled(job_id)
+            progress_queue.put((job_id, snapshot.to_dict()))
+
+        progress = ProgressReporter(report, min_interval=spec.progress_interval)
+
+    def run(strategy: BaseStrategy, checkpoint: Optional[Checkpoint]):
+        if isinstance(market_data, BarStore):
+            return engine.run_intraday(
+                strategy, market_data, spec.timeframe, spec.start_date, spec.end_date,
+                progress=progress, checkpoint=checkpoint,
+            )
+        if checkpoint is not None:
+            return engine.resume(strategy, checkpoint.snapshot, market_data, spec.end_date, progress=progress)
+        return engine.run(strategy, market_data, spec.start_date, spec.end_date, progress=progress)
+
+    try:
+        metrics, equity_curve = run(strategy, checkpoint)
+    except ValueError:
+        if checkpoint is None:
+            raise
+        # The data no longer matches the checkpoint; start over with a fresh strategy
+        metrics, equity_curve = run(spec.strategy_class(spec.symbols, spec.parameters), None)
+
+    result = {
+        "metrics": asdict(metrics),
+        "equity_curve": equity_curve.to_records(),
+        "trade_pnl": engine.closed_trades.pnl.tolist(),  # In close order, for Monte Carlo analysis
+    }
+    if engine.profile is not None:
+        result["profile"] = engine.profile.to_dict()
+    return result
+
+
+def run_analysis_job(spec: BacktestJobSpec, market_data: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+    """
+    Run a sweep, optimization or walk-forward analysis inside a worker process
+
+    Sweeps and optimizations fan their runs out over a process pool of
+    their own. Returns the response payload as plain data.
+
+    Raises:
+        ValueError: If the analysis settings are invalid
+    """
+    options = spec.options
+    engine_kwargs = {
+        "initial_capital": spec.initial_capital,
+        "slippage_pct": spec.slippage_pct,
+        "commission_per_trade": spec.commission_per_trade,
+    }
+    combinations = math.prod(len(values) for values in options["param_grid"].values())
+
+    if spec.kind == "sweep":
+        sweep = ParameterSweep(
+            spec.strategy_class,
+            spec.symbols,
+            base_parameters=spec.parameters,
+            engine_kwargs=engine_kwargs,
+            max_workers=options.get("max_workers"),
+        )
+        results = sweep.run(
+            market_data, spec.start_date, spec.end_date, options["param_grid"], rank_by=options["rank_by"]
+        )
+        return {
+            "combinations": combinations,
+            "evaluated": len(results),
+            "rank_by": options["rank_by"],
+            "results": [r.to_dict() for r in results[:options["top_n"]]],
+        }
+
+    if spec.kind == "optimize":
+        optimizer = SuccessiveHalvingOptimizer(
+            spec.strategy_class,
+            spec.symbols,
+            base_parameters=spec.parameters,
+            engine_kwargs=engine_kwargs,
+            max_workers=options.get("max_workers"),
+        )
+        result = optimizer.run(
+            market_data,
+            spec.start_date,
+            spec.end_date,
+            options["param_grid"],
+            rank_by=options["rank_by"],
+            eta=options["eta"],
+            min_days=options["min_days"],
+        )
+        summary = result.to_dict()
+        return {
+            "combinations": combinations,
+            "candidates": result.candidates,
+            "rank_by": options["rank_by"],
+            "budget_pct": result.budget_pct,
+            "rungs": summary["rungs"],
+            "results": summary["results"][:options["top_n"]],
+        }
+
+    if spec.kind == "walk_forward":
+        optimizer = WalkForwardOptimizer(
+            spec.strategy_class,
+            spec.symbols,
+            base_parameters=spec.parameters,
+            engine_kwargs=engine_kwargs,
+        )
+        result = optimizer.run(
+            market_data,
+            spec.start_date,
+            spec.end_date,
+            options["param_grid"],
+            in_sample_days=options["in_sample_days"],
+            out_sample_days=options["out_sample_days"],
+            step_days=options.get("step_days"),
+            rank_by=options["rank_by"],
+        )
+        return {
+            "metrics": asdict(result.metrics),
+            "windows": [
+                {
+                    "in_sample_start": w.in_sample_start.isoformat(),
+                    "in_sample_end": w.in_sample_end.isoformat(),
+                    "out_sample_start": w.out_sample_start.isoformat(),
+                    "out_sample_end": w.out_sample_end.isoformat(),
+                    "best_parameters": w.best_parameters,
+                    "in_sample_metrics": asdict(w.in_sample_metrics),
+                    "out_sample_metrics": asdict(w.out_sample_metrics),
+                }
+                for w in result.windows
+            ],
+            "equity_curve": result.equity_curve.to_records(),
+        }
+
+    raise ValueError(f"Unknown job kind: {spec.kind}")
+
+
+def _load_job_checkpoint(spec: BacktestJobSpec) -> Optional[Checkpoint]:
+    """
+    Checkpoint left by an earlier, interrupted run of the same job, if any
+
+    The file is named after the job's inputs. It is dropped if unreadable
+    or if it does not continue this exact backtest, and the job starts over.
+    """
+    if spec.checkpoint_path is None or not os.path.exists(spec.checkpoint_path):
+        return None
+
+    try:
+        checkpoint = load_checkpoint(spec.checkpoint_path)
+        snapshot = checkpoint.snapshot
+        expected_mode = "daily" if spec.timeframe == "1day" else "intraday"
+        if (
+            checkpoint.mode == expected_mode
+            and checkpoint.end_date == spec.end_date
+            and snapshot.start_date == spec.start_date
+            and snapshot.initial_capital == spec.initial_capital
+            and snapshot.slippage_pct == spec.slippage_pct
+            and snapshot.commission_per_trade == spec.commission_per_trade
+        ):
+            return checkpoint
+    except Exception as e:
+        print(f"Ignoring unreadable checkpoint {spec.checkpoint_path}: {e}")
+
+    os.remove(spec.checkpoint_path)
+    return None
+
+
+def job_cache_key(spec: BacktestJobSpec) -> str:
+    """Cache key of a job's result"""
+    strategy = spec.strategy_class(spec.symbols, spec.parameters)
+
+    return backtest_cache_key(
+        spec.strategy_class,
+        strategy.parameters,
+        spec.symbols,
+        spec.start_date,
+        spec.end_date,
+        spec.initial_capital,
+        spec.slippage_pct,
+        spec.commission_per_trade,
+        market_data_stamp(spec.end_date, spec.timeframe),
+    )
+
+
+def save_backtest_result(spec: BacktestJobSpec, result: Dict[str, Any]) -> int:
+    """Persist a finished backtest to the backtest_results table"""
+    metrics = result["metrics"]
+
+    with get_db() as db:
+        row = BacktestResult(
+            strategy_type=spec.strategy_type,
+            symbols=json.dumps(spec.symbols),
+            start_date=spec.start_date,
+            end_date=spec.end_date,
+            initial_capital=spec.initial_capital,
+            total_return=metrics["total_return"],
+            buy_and_hold_return=metrics["buy_and_hold_return"],
+            max_drawdown=metrics["max_drawdown"],
+            sharpe_ratio=metrics["sharpe_ratio"],
+            win_rate=metrics["win_rate"],
+            total_trades=metrics["total_trades"],
+            winning_trades=metrics["winning_trades"],
+            losing_trades=metrics["losing_trades"],
+            avg_win=metrics["avg_win"],
+            avg_loss=metrics["avg_loss"],
+            avg_trade_duration_days=metrics["avg_trade_duration_days"],
+            max_consecutive_wins=metrics["max_consecutive_wins"],
+            max_consecutive_losses=metrics["max_consecutive_losses"],
+        )
+        row.set_equity_curve_list(result["equity_curve"])
+        if "profile" in result:
+            row.set_profile(result["profile"])
+
+        db.add(row)
+        db.flush()
+        return row.id
+
+
+def save_analysis_result(spec: BacktestJobSpec, result: Dict[str, Any]) -> int:
+    """Persist a finished analysis to the analysis_results table"""
+    with get_db() as db:
+        row = AnalysisResult(
+            kind=spec.kind,
+            strategy_type=spec.strategy_type,
+            symbols=json.dumps(spec.symbols),
+            start_date=spec.start_date,
+            end_date=spec.end_date,
+            initial_capital=spec.initial_capital,
+            parameters=json.dumps(spec.parameters),
+            options=json.dumps(spec.options),
+        )
+        row.set_result_dict(result)
+
+        db.add(row)
+        db.flush()
+        return row.id
+
+
+class _ProgressChannel:
+    """
+    Carries progress reports from worker processes to the event loop
+
+    Workers put (job_id, progress) on a manager queue; a daemon thread
+    drains it and hands each report to the loop thread-safely.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, dispatch: Callable[[str, Dict[str, Any]], None]):
+        self._loop = loop
+        self._dispatch = dispatch
+        self._manager = multiprocessing.Manager()
+        self.queue = self._manager.Queue()
+        self.cancelled = self._manager.dict()
+        self._thread = threading.Thread(target=self._pump, name="backtest-progress", daemon=True)
+        self._thread.start()
+
+    def _pump(self):
+        while True:
+            try:
+                item = self.queue.get()
+            except (EOFError, OSError):
+                return
+            if item is None:
+                return
+            self._loop.call_soon_threadsafe(self._dispatch, *item)
+
+    def close(self):
+        self.queue.put(None)
+        self._thread.join(timeout=1)
+        self._manager.shutdown()
+
+
+class BacktestJobQueue:
+    """
+    Runs backtests off the event loop
+
+    Features:
+    - submit() returns immediately with a job id
+    - Parameter sweeps, optimizations and walk-forward analyses run as jobs
+      too (see ANALYSIS_KINDS), without the result cache or checkpoints;
+      cancelling one that is running discards its result once the worker
+      returns
+    - Market data is fetched on a small thread pool (blocking HTTP calls)
+    - Simulations run in a process pool, so CPU-bound work never holds
+      the event loop or the GIL of the API process
+    - Throttled progress reports stream back from the workers to
+      subscribers (see subscribe())
+    - Finished jobs are persisted to the backtest_results table
+    - Repeated backtests are answered from the result cache, skipping
+      both the download and the simulation
+    - Simulations checkpoint as they go; resubmitting a job that crashed or
+      was cancelled resumes from its last checkpoint
+    - Keeps the most recent finished jobs in memory for status/result lookups
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_finished_jobs: int = 200,
+        cache: Optional[BacktestCache] = None,
+    ):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_finished_jobs = max_finished_jobs
+        self.cache = cache
+        self.jobs: "OrderedDict[str, BacktestJob]" = OrderedDict()
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._channel: Optional[_ProgressChannel] = None
+        self._workers_lock = threading.Lock()
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="backtest-io")
+
+    def _start_workers(self, loop: asyncio.AbstractEventLoop):
+        """Start the worker processes and progress channel on first use"""
+        with self._workers_lock:
+            if self._process_pool is None:
+                self._channel = _ProgressChannel(loop, self._on_progress)
+                self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def submit(
+        self,
+        spec: BacktestJobSpec,
+        fetch_market_data: Callable[[], Dict[str, pd.DataFrame]],
+    ) -> BacktestJob:
+        """
+        Queue a backtest (must be called from the event loop)
+
+        Args:
+            spec: What to backtest
+            fetch_market_data: Blocking callable returning the market data
+
+        Returns:
+            The new job
+        """
+        job = BacktestJob(id=str(uuid.uuid4()), spec=spec)
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, fetch_market_data))
+        job.task.add_done_callback(lambda task: self._finish(job, task))
+        return job
+
+    def get(self, job_id: str) -> Optional[BacktestJob]:
+        return self.jobs.get(job_id)
+
+    def all_jobs(self) -> List[BacktestJob]:
+        return list(self.jobs.values())
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job that has not finished
+
+        A job still waiting for data or a worker is dropped when its task
+        next runs, which records the outcome. A simulation already running
+        in a worker stops at its next progress report; its partial result
+        is discarded.
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+
+        if job.status == "running" and job.future is not None:
+            # Stops the worker at its next progress report; the flag is cleared
+            # once the worker returns. Manager calls are IPC, so keep them off the
+            # loop, and only hook the clear onto the worker once the write is done
+            # so it cannot run first and leave the flag behind.
+            cancelled, future = self._channel.cancelled, job.future
+            flagged = self._io_pool.submit(cancelled.__setitem__, job.id, True)
+            flagged.add_done_callback(
+                lambda _: future.add_done_callback(lambda _: cancelled.pop(job.id, None))
+            )
+
+        if job.future is not None:
+            job.future.cancel()
+        if job.task is not None:
+            job.task.cancel()
+        return True
+
+    async def wait(self, job_id: str) -> BacktestJob:
+        """Wait for a job to finish"""
+        job = self.jobs[job_id]
+        if job.task is not None:
+            await asyncio.wait({job.task})
+        return job
+
+    async def _run(self, job: BacktestJob, fetch_market_data: Callable[[], Dict[str, pd.DataFrame]]):
+        """Drive one job through fetching, simulation and persistence"""
+        loop = asyncio.get_running_loop()
+        analysis = job.spec.kind in ANALYSIS_KINDS
+        try:
+            job.started_at = datetime.utcnow()
+
+            # Named by the inputs, so resubmitting an interrupted job resumes it
+            if not analysis:
+                key = await loop.run_in_executor(self._io_pool, job_cache_key, job.spec)
+                job.spec.checkpoint_path = os.path.join(CHECKPOINT_DIR, f"{key}.npz")
+
+            # A profiled job must run, and its timings should not be served later
+            cache_key = None
+            if self.cache is not None and not job.spec.profile and not analysis:
+                cache_key = key
+                cached = await loop.run_in_executor(self._io_pool, self.cache.get, cache_key)
+                if cached is not None:
+                    job.result = cached["result"]
+                    job.result_id = cached["result_id"]
+                    job.cached = True
+                    job.status = "completed"
+                    return
+
+            job.status = "fetching"
+            market_data = await loop.run_in_executor(self._io_pool, fetch_market_data)
+
+            await loop.run_in_executor(self._io_pool, self._start_workers, loop)
+            job.status = "running"
+            if analysis:
+                job.future = self._process_pool.submit(run_analysis_job, job.spec, market_data)
+            else:
+                job.future = self._process_pool.submit(
+                    run_backtest_job,
+                    job.spec,
+                    market_data,
+                    job.id,
+                    self._channel.queue,
+                    self._channel.cancelled,
+                )
+            result = await asyncio.wrap_future(job.future)
+
+            job.result_id = await loop.run_in_executor(
+                self._io_pool, save_analysis_result if analysis else save_backtest_result, job.spec, result
+            )
+            job.result = result
+            job.status = "completed"
+
+            if cache_key is not None:
+                try:
+                    await loop.run_in_executor(
+                        self._io_pool,
+                        self.cache.put,
+                        cache_key,
+                        {"result": result, "result_id": job.result_id},
+                    )
+                except Exception as e:
+                    print(f"Failed to cache backtest {job.id}: {e}")
+
+        except (asyncio.CancelledError, BacktestCancelled):
+            job.status = "cancelled"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+
+    def _finish(self, job: BacktestJob, task: asyncio.Task):
+        """Close out a job once its task is done (runs on the event loop)"""
+        if task.cancelled():
+            # Cancelled before _run's first step, so _run never saw it
+            job.status = "cancelled"
+        job.finished_at = datetime.utcnow()
+        job.future = None
+        self._publish_final(job)
+        self._evict()
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """
+        Follow a job's progress
+
+        Returns an asyncio.Queue that receives {"type": "progress", ...}
+        messages, then one message whose type is the final status, then
+        None. The latest known progress is delivered first.
+        """
+        job = self.jobs[job_id]
+        queue: asyncio.Queue = asyncio.Queue()
+
+        if job.progress is not None:
+            queue.put_nowait({"type": "progress", "job_id": job.id, **job.progress})
+
+        if job.finished:
+            queue.put_nowait({"type": job.status, **job.to_dict()})
+            queue.put_nowait(None)
+        else:
+            job.subscribers.add(queue)
+
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        job = self.jobs.get(job_id)
+        if job is not None:
+            job.subscribers.discard(queue)
+
+    def _on_progress(self, job_id: str, progress: Dict[str, Any]):
+        """Record a worker's progress report (runs on the event loop)"""
+        job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            return
+
+        job.progress = progress
+        message = {"type": "progress", "job_id": job_id, **progress}
+        for queue in job.subscribers:
+            queue.put_nowait(message)
+
+    def _publish_final(self, job: BacktestJob):
+        """Send the final status to subscribers and release them"""
+        message = {"type": job.status, **job.to_dict()}
+        for queue in job.subscribers:
+            queue.put_nowait(message)
+            queue.put_nowait(None)
+        job.subscribers.clear()
+
+    def _evict(self):
+        """Forget the oldest finished jobs beyond max_finished_jobs"""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job_id]
+
+    def shutdown(self):
+        """Cancel outstanding jobs and stop the worker pools"""
+        for job in list(self.jobs.values()):
+            if not job.finished:
+                self.cancel(job.id)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+        if self._channel is not None:
+            self._channel.close()
+            self._channel = None
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
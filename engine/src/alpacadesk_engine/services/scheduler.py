@@ -5,9 +5,11 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import pandas as pd
 
-from ..strategies.base import BaseStrategy, Signal
+from ..strategies.base import Bar, BaseStrategy, Signal, bars_from_frame
+from ..strategies.builder import RuleStrategy
 from ..strategies.momentum import MomentumBreakoutStrategy
 from ..strategies.mean_reversion import MeanReversionRSIStrategy
+from ..strategies.panel import BarPanel
 from ..brokers.alpaca import AlpacaBroker
 from .position_monitor import PositionMonitor
 
@@ -18,7 +20,10 @@ class StrategyScheduler:
 
     Features:
     - Evaluates strategies at configured intervals
-    - Fetches market data for analysis
+    - Fetches market data for analysis; in live mode, history is fetched
+      once to seed streaming indicators and each tick fetches only the
+      bars since; otherwise all symbols are evaluated in one batch pass
+      over a (bars x symbols) panel
     - Generates and executes trading signals
     - Tracks strategy performance
     """
@@ -38,6 +43,7 @@ class StrategyScheduler:
         symbols: List[str],
         parameters: Dict,
         interval_seconds: int = 60,
+        live: bool = True,
     ):
         """
         Add a strategy to the scheduler
@@ -48,12 +54,16 @@ class StrategyScheduler:
             symbols: List of symbols to trade
             parameters: Strategy-specific parameters
             interval_seconds: How often to evaluate the strategy (default: 60s)
+            live: Evaluate ticks incrementally when the strategy supports it,
+                instead of recomputing indicators over the full lookback
         """
         # Create strategy instance
         strategy = self._create_strategy(strategy_type, symbols, parameters)
 
         if strategy is None:
             raise ValueError(f"Unknown strategy type: {strategy_type}")
+        if isinstance(strategy, RuleStrategy):
+            strategy.program  # Compile now, so a malformed rule tree fails here rather than every tick
 
         self.strategies[strategy_id] = {
             "strategy": strategy,
@@ -61,6 +71,8 @@ class StrategyScheduler:
             "symbols": symbols,
             "parameters": parameters,
             "interval": interval_seconds,
+            "live": live and strategy.supports_live(),
+            "live_seeded": False,
             "enabled": False,
             "last_execution": None,
             "executions": 0,
@@ -75,6 +87,7 @@ class StrategyScheduler:
         strategy_map = {
             "momentum_breakout": MomentumBreakoutStrategy,
             "mean_reversion_rsi": MeanReversionRSIStrategy,
+            "custom_rules": RuleStrategy,
         }
 
         strategy_class = strategy_map.get(strategy_type)
@@ -196,13 +209,16 @@ class StrategyScheduler:
             print(f"Failed to get account info: {e}")
             portfolio_value = None  # Strategy will handle None gracefully
 
-        # Fetch market data for all symbols
-        market_data = await self._fetch_market_data(
-            config["symbols"], lookback_days=100
-        )
-
         # Generate signals with portfolio value for proper position sizing
-        signals: List[Signal] = strategy.analyze(market_data, portfolio_value)
+        if config["live"]:
+            signals = await self._analyze_live(strategy, config, portfolio_value)
+        else:
+            # Fetch market data for all symbols
+            market_data = await self._fetch_market_data(
+                config["symbols"], lookback_days=100
+            )
+            panel = BarPanel(market_data, config["symbols"])
+            signals: List[Signal] = strategy.analyze_batch(panel, portfolio_value)
 
         if signals:
             config["signals_generated"] += len(signals)
@@ -215,6 +231,58 @@ class StrategyScheduler:
                 except Exception as e:
                     print(f"Failed to execute signal for {signal.symbol}: {e}")
 
+    async def _analyze_live(
+        self, strategy: BaseStrategy, config: Dict, portfolio_value: Optional[float]
+    ) -> List[Signal]:
+        """
+        Evaluate a tick from streaming indicator state
+
+        The first tick fetches the usual lookback and seeds the strategy's
+        live state; later ticks fetch only the bars after each symbol's
+        last closed bar (normally just the one still forming).
+        """
+        if not config["live_seeded"]:
+            market_data = await self._fetch_market_data(config["symbols"], lookback_days=100)
+            strategy.seed_live(market_data)
+            config["live_seeded"] = True
+            new_bars = {symbol: bars_from_frame(df.iloc[-1:]) for symbol, df in market_data.items()}
+        else:
+            new_bars = await self._fetch_new_bars(strategy, config["symbols"], lookback_days=100)
+
+        return strategy.analyze_live(new_bars, portfolio_value)
+
+    async def _fetch_new_bars(
+        self, strategy: BaseStrategy, symbols: List[str], lookback_days: int = 100
+    ) -> Dict[str, List[Bar]]:
+        """
+        Fetch the bars after each symbol's live cursor
+
+        Symbols with no closed bar yet get the full lookback window.
+        """
+        new_bars = {}
+
+        end = datetime.utcnow()
+        for symbol in symbols:
+            cursor = strategy.live_cursor(symbol)
+            start = cursor.to_pydatetime() if cursor is not None else end - timedelta(days=lookback_days)
+            try:
+                bars = self.broker.get_bars(symbol, "1day", start, end)
+                new_bars[symbol] = [
+                    Bar(
+                        pd.Timestamp(bar["timestamp"]),
+                        bar["open"],
+                        bar["high"],
+                        bar["low"],
+                        bar["close"],
+                        bar["volume"],
+                    )
+                    for bar in bars
+                ]
+            except Exception as e:
+                print(f"Failed to fetch data for {symbol}: {e}")
+
+        return new_bars
+
     async def _fetch_market_data(
         self, symbols: List[str], lookback_days: int = 100
     ) -> Dict[str, pd.DataFrame]:
@@ -340,6 +408,7 @@ class StrategyScheduler:
                     "enabled": config["enabled"],
                     "symbols": config["symbols"],
                     "interval": config["interval"],
+                    "live": config["live"],
                     "last_execution": config["last_execution"].isoformat() if config["last_execution"] else None,
                     "executions": config["executions"],
                     "signals_generated": config["signals_generated"],
@@ -1,10 +1,15 @@
 """Base strategy class"""
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from typing import List, Dict, Any, NamedTuple, Optional, Sequence, Tuple
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
+from ..indicators.cache import BarIndicators
+from .panel import BarPanel
+
 
 class Signal:
     """Trading signal"""
@@ -25,6 +30,37 @@ class Signal:
         self.timestamp = datetime.utcnow()
 
 
+class Bar(NamedTuple):
+    """One OHLCV bar, as fed to live mode"""
+    timestamp: pd.Timestamp
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+def bars_from_frame(df: pd.DataFrame) -> List[Bar]:
+    """Rows of an OHLCV DataFrame (timestamp index) as Bars"""
+    columns = [df[name].tolist() for name in ("open", "high", "low", "close", "volume")]
+    return [Bar(*row) for row in zip(df.index, *columns)]
+
+
+@dataclass
+class LiveState:
+    """
+    Streaming indicator state for one symbol in live mode
+
+    indicators holds whatever the strategy's _live_indicators() returns,
+    updated with every closed bar. The bar being evaluated is never
+    committed, so it can be re-evaluated on every tick until it closes.
+    """
+    indicators: Any
+    bars: int = 0  # Closed bars committed so far
+    last_bar: Optional[Bar] = None  # Latest closed bar
+    cursor: Optional[pd.Timestamp] = None  # Its timestamp
+
+
 class BaseStrategy(ABC):
     """
     Abstract base class for trading strategies
@@ -33,13 +69,30 @@ class BaseStrategy(ABC):
     - analyze(): Generate trading signals based on market data
     - get_parameters(): Return strategy parameters
     - set_parameters(): Update strategy parameters
+
+    Strategies may also implement generate_signals() to let the backtest
+    engine evaluate the full history in one vectorized pass,
+    _batch_signals() to evaluate every symbol's latest bar at once with
+    analyze_batch(), and the _live_* hooks to let the scheduler evaluate
+    each tick incrementally with analyze_live().
     """
 
+    # Bump when signal logic changes; part of the backtest cache key
+    version = "1"
+
+    # Bar timeframe the strategy is evaluated on; part of the indicator cache key
+    timeframe = "1day"
+
+    # Whether analyze() goes through the shared indicator cache; backtests
+    # turn it off, as their day-by-day windows are never looked up again
+    shared_indicators = True
+
     def __init__(self, name: str, symbols: List[str], parameters: Dict[str, Any]):
         self.name = name
         self.symbols = symbols
         self.parameters = parameters
         self.enabled = False
+        self._live: Dict[str, LiveState] = {}
 
     @abstractmethod
     def analyze(
@@ -59,6 +112,198 @@ class BaseStrategy(ABC):
         """
         pass
 
+    def generate_signals(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute buy/sell signals for every row of one symbol's history
+
+        Row i must equal what analyze() would emit for this symbol if
+        df.iloc[:i + 1] were the latest market data. Buy takes precedence,
+        so a row is never both a buy and a sell.
+
+        Args:
+            df: OHLCV DataFrame for a single symbol, sorted by timestamp
+
+        Returns:
+            Tuple of (buy, sell) boolean arrays aligned with df rows
+
+        Raises:
+            NotImplementedError: If the strategy only supports analyze()
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support vectorized signals")
+
+    def warmup_bars(self) -> Optional[int]:
+        """
+        Bars of history generate_signals() needs before a row's signal is final
+
+        Lets the engine evaluate a long history in chunks, carrying only
+        this many earlier bars into each chunk. None means the whole
+        history is needed.
+        """
+        return None
+
+    def supports_vectorized(self) -> bool:
+        """Check if the strategy implements generate_signals()"""
+        return type(self).generate_signals is not BaseStrategy.generate_signals
+
+    def supports_batch(self) -> bool:
+        """Check if the strategy implements _batch_signals()"""
+        return type(self)._batch_signals is not BaseStrategy._batch_signals
+
+    def analyze_batch(self, panel: BarPanel, portfolio_value: Optional[float] = None) -> List[Signal]:
+        """
+        analyze() for all symbols at once, from a (bars x symbols) panel
+
+        Strategies implementing _batch_signals() compute their indicators
+        across the whole panel and evaluate their conditions as boolean
+        masks over symbols; only symbols that trigger are visited one by
+        one, to build their Signal. Other strategies fall back to
+        analyze() on the panel's frames.
+
+        Args:
+            panel: Bars of (at least) the strategy's symbols
+            portfolio_value: Current portfolio value for position sizing (optional)
+
+        Returns:
+            List of Signal objects, in the order analyze() would give them
+        """
+        panel = panel.subset(self.symbols)
+        if not self.supports_batch():
+            return self.analyze(panel.market_data(), portfolio_value)
+        if len(panel) == 0:
+            return []
+        return self._batch_signals(panel, portfolio_value)
+
+    def _batch_signals(self, panel: BarPanel, portfolio_value: Optional[float]) -> List[Signal]:
+        """
+        Signals for every column's latest bar, from masks across the panel
+
+        The panel's columns are the strategy's symbols in order, minus any
+        without market data; panel.lengths gives each one's history length.
+
+        Raises:
+            NotImplementedError: If the strategy only supports analyze()
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support batch analysis")
+
+    def _panel_signals(self, panel: BarPanel, candidates: np.ndarray, make_signal) -> List[Signal]:
+        """Signals from make_signal(symbol, column) for the columns where candidates is True"""
+        signals = []
+        for j in np.flatnonzero(candidates):
+            signal = make_signal(panel.symbols[j], j)
+            if signal is not None:
+                signals.append(signal)
+        return signals
+
+    def supports_live(self) -> bool:
+        """Check if the strategy implements the live-mode hooks"""
+        return type(self)._live_indicators is not BaseStrategy._live_indicators
+
+    def seed_live(self, market_data: Dict[str, pd.DataFrame]):
+        """
+        Start live mode from history, replacing any earlier live state
+
+        Every row but the last is committed as a closed bar; the last may
+        still be forming, so it is left for the first analyze_live() call.
+        This is the only pass over the full history.
+
+        Args:
+            market_data: Dictionary mapping symbols to DataFrame with OHLCV data
+        """
+        self._live = {}
+        for symbol in self.symbols:
+            state = LiveState(self._live_indicators())
+            df = market_data.get(symbol)
+            if df is not None and len(df) > 1:
+                self._commit_live(state, bars_from_frame(df.iloc[:-1]))
+            self._live[symbol] = state
+
+    def live_cursor(self, symbol: str) -> Optional[pd.Timestamp]:
+        """Timestamp of the last closed bar committed for symbol; None if there is none"""
+        state = self._live.get(symbol)
+        return state.cursor if state is not None else None
+
+    def analyze_live(
+        self,
+        new_bars: Dict[str, Sequence[Bar]],
+        portfolio_value: Optional[float] = None
+    ) -> List[Signal]:
+        """
+        Incremental analyze(): signals from streaming indicator state
+
+        Gives the same signals analyze() would for the full history, at a
+        cost per tick independent of the lookback.
+
+        Args:
+            new_bars: Dictionary mapping symbols to the bars after
+                live_cursor(symbol), oldest first; the last is the bar being
+                evaluated and any before it are committed as closed. Bars
+                at or before the cursor are ignored.
+            portfolio_value: Current portfolio value for position sizing (optional)
+
+        Returns:
+            List of Signal objects
+        """
+        signals = []
+
+        for symbol in self.symbols:
+            state = self._live.get(symbol)
+            bars = new_bars.get(symbol)
+            if state is None or not bars:
+                continue
+
+            if state.cursor is not None:
+                bars = [bar for bar in bars if bar.timestamp > state.cursor]
+                if not bars:
+                    continue
+
+            self._commit_live(state, bars[:-1])
+            signal = self._live_signal(symbol, state, bars[-1], portfolio_value)
+            if signal is not None:
+                signals.append(signal)
+
+        return signals
+
+    def _commit_live(self, state: LiveState, bars: Sequence[Bar]):
+        """Feed closed bars to a symbol's live state"""
+        for bar in bars:
+            self._live_update(state.indicators, bar)
+            state.bars += 1
+            state.last_bar = bar
+            state.cursor = bar.timestamp
+
+    def _live_indicators(self) -> Any:
+        """
+        Fresh streaming indicators for one symbol (indicators.streaming)
+
+        Raises:
+            NotImplementedError: If the strategy has no live mode
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support live mode")
+
+    def _live_update(self, indicators: Any, bar: Bar):
+        """Commit one closed bar to the indicators"""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support live mode")
+
+    def _live_signal(
+        self, symbol: str, state: LiveState, bar: Bar, portfolio_value: Optional[float]
+    ) -> Optional[Signal]:
+        """
+        Signal for the bar being evaluated, read from the indicators without committing it
+
+        state.bars + 1 is the length of the history analyze() would see.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support live mode")
+
+    def _bar_indicators(self, df: pd.DataFrame, symbol: Optional[str] = None) -> BarIndicators:
+        """
+        Indicator access for one symbol's bars through the shared indicator cache
+
+        Pass the symbol when df is that symbol's latest market data, so
+        strategies watching the same symbol share results; without it, or
+        with shared_indicators off, indicators are computed directly.
+        """
+        return BarIndicators(df, symbol if self.shared_indicators else None, self.timeframe)
+
     def _calculate_position_size(
         self,
         price: float,
@@ -1,10 +1,14 @@
 """Bollinger Band Bounce Strategy"""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 import numpy as np
 
-from .base import BaseStrategy, Signal
+from .base import Bar, BaseStrategy, LiveState, Signal
+from .panel import BarPanel
+from ..indicators.rolling import shift
+from ..indicators.streaming import Bollinger as StreamingBollinger
+from ..indicators.volatility import Bands, bollinger
 
 
 class BollingerBandStrategy(BaseStrategy):
@@ -50,72 +54,148 @@ class BollingerBandStrategy(BaseStrategy):
             if symbol not in market_data or market_data[symbol].empty:
                 continue
 
-            df = market_data[symbol].copy()
+            df = market_data[symbol]
 
-            # Calculate Bollinger Bands
-            period = self.parameters["bb_period"]
-            std_dev = self.parameters["bb_std_dev"]
+            # Need enough data
+            if len(df) < self.parameters["bb_period"] + 2:
+                continue
+
+            ind = self._indicators(df, symbol)
+            bands = [Bands(ind["sma"][i], ind["upper_band"][i], ind["lower_band"][i]) for i in (-2, -1)]
+            signal = self._signal(symbol, ind["close"][-2:], bands, portfolio_value)
+            if signal is not None:
+                signals.append(signal)
+
+        return signals
+
+    def _signal(
+        self,
+        symbol: str,
+        close: Tuple[float, float],
+        bands: Tuple[Bands, Bands],
+        portfolio_value: Optional[float],
+    ) -> Optional[Signal]:
+        """Band signal for the latest bar, given (previous, current) closes and bands"""
+        prev_close, current_close = close
+        prev_bands, current = bands
+
+        # Buy signal: bounce off lower band
+        if (
+            prev_close <= prev_bands.lower
+            and current_close > current.lower
+            and current_close < current.middle  # Still below middle
+        ):
+            try:
+                quantity = self._calculate_position_size(current_close, portfolio_value)
+            except ValueError as e:
+                print(f"Skipping signal for {symbol}: {e}")
+                return None
+
+            return Signal(
+                symbol=symbol,
+                action="buy",
+                quantity=quantity,
+                reason=f"Bollinger bounce: price bounced off lower band at {current.lower:.2f}",
+                metadata={
+                    "entry_price": current_close,
+                    "lower_band": current.lower,
+                    "upper_band": current.upper,
+                    "sma": current.middle,
+                },
+            )
+
+        # Sell signal: touch upper band
+        if current_close >= current.upper or (
+            prev_close < prev_bands.middle and current_close >= current.middle
+        ):
+            return Signal(
+                symbol=symbol,
+                action="sell",
+                quantity=0,  # Sell all
+                reason=f"Bollinger exit: price reached upper band or crossed SMA",
+                metadata={
+                    "exit_price": current_close,
+                    "upper_band": current.upper,
+                },
+            )
+
+        return None
+
+    def generate_signals(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate band bounce signals for the full history in one pass
+        """
+        ind = self._indicators(df)
+        ready = np.arange(len(df)) >= self.parameters["bb_period"] + 1
 
-            df["sma"] = df["close"].rolling(window=period).mean()
-            df["std"] = df["close"].rolling(window=period).std()
-            df["upper_band"] = df["sma"] + (df["std"] * std_dev)
-            df["lower_band"] = df["sma"] - (df["std"] * std_dev)
+        close, lower, upper, middle = ind["close"], ind["lower_band"], ind["upper_band"], ind["sma"]
+        prev_close = shift(close, 1)
 
+        buy = (prev_close <= shift(lower, 1)) & (close > lower) & (close < middle) & ready
+        sell = (
+            (close >= upper) | ((prev_close < shift(middle, 1)) & (close >= middle))
+        ) & ready & ~buy
+
+        return buy, sell
+
+    def warmup_bars(self) -> Optional[int]:
+        """Band window plus the previous bar for band crosses"""
+        return self.parameters["bb_period"] + 1
+
+    def _batch_signals(self, panel: BarPanel, portfolio_value: Optional[float]) -> List[Signal]:
+        """
+        Band masks across all symbols at once; only triggering symbols get a Signal
+        """
+        ready = panel.lengths >= self.parameters["bb_period"] + 2
+        if not ready.any():
+            return []
+
+        close = panel.close[-2:]
+        bands = bollinger(panel.close, self.parameters["bb_period"], self.parameters["bb_std_dev"])
+        prev, current = (Bands(*(band[i] for band in bands)) for i in (-2, -1))
+
+        buy = (close[0] <= prev.lower) & (close[1] > current.lower) & (close[1] < current.middle) & ready
+        sell = (
+            (close[1] >= current.upper) | ((close[0] < prev.middle) & (close[1] >= current.middle))
+        ) & ready & ~buy
+
+        return self._panel_signals(panel, buy | sell, lambda symbol, j: self._signal(
+            symbol, close[:, j], [Bands(*(band[j] for band in b)) for b in (prev, current)], portfolio_value
+        ))
+
+    def _indicators(self, df: pd.DataFrame, symbol: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Close with the Bollinger Bands and band width, as arrays aligned to df"""
+        ind = self._bar_indicators(df, symbol)
+        bands = ind.compute(bollinger, "close", self.parameters["bb_period"], self.parameters["bb_std_dev"])
+
+        return {
+            "close": ind.column("close"),
+            "sma": bands.middle,
+            "upper_band": bands.upper,
+            "lower_band": bands.lower,
             # Band width for volatility measure
-            df["band_width"] = (df["upper_band"] - df["lower_band"]) / df["sma"]
+            "band_width": (bands.upper - bands.lower) / bands.middle,
+        }
 
-            # Need enough data
-            if len(df) < period + 2:
-                continue
+    def _live_indicators(self) -> StreamingBollinger:
+        return StreamingBollinger(self.parameters["bb_period"], self.parameters["bb_std_dev"])
 
-            current = df.iloc[-1]
-            prev = df.iloc[-2]
-
-            # Buy signal: bounce off lower band
-            if (
-                prev["close"] <= prev["lower_band"]
-                and current["close"] > current["lower_band"]
-                and current["close"] < current["sma"]  # Still below middle
-            ):
-                try:
-                    quantity = self._calculate_position_size(current["close"], portfolio_value)
-                    signals.append(
-                        Signal(
-                            symbol=symbol,
-                            action="buy",
-                            quantity=quantity,
-                            reason=f"Bollinger bounce: price bounced off lower band at {current['lower_band']:.2f}",
-                            metadata={
-                                "entry_price": current["close"],
-                                "lower_band": current["lower_band"],
-                                "upper_band": current["upper_band"],
-                                "sma": current["sma"],
-                            },
-                        )
-                    )
-                except ValueError as e:
-                    print(f"Skipping signal for {symbol}: {e}")
-                    continue
-
-            # Sell signal: touch upper band
-            elif (
-                current["close"] >= current["upper_band"]
-                or (prev["close"] < prev["sma"] and current["close"] >= current["sma"])
-            ):
-                signals.append(
-                    Signal(
-                        symbol=symbol,
-                        action="sell",
-                        quantity=0,  # Sell all
-                        reason=f"Bollinger exit: price reached upper band or crossed SMA",
-                        metadata={
-                            "exit_price": current["close"],
-                            "upper_band": current["upper_band"],
-                        },
-                    )
-                )
+    def _live_update(self, indicators: StreamingBollinger, bar: Bar):
+        indicators.update(bar.close)
 
-        return signals
+    def _live_signal(
+        self, symbol: str, state: LiveState, bar: Bar, portfolio_value: Optional[float]
+    ) -> Optional[Signal]:
+        if state.bars + 1 < self.parameters["bb_period"] + 2:
+            return None
+
+        bands = state.indicators
+        return self._signal(
+            symbol,
+            (state.last_bar.close, bar.close),
+            (bands.value, bands.peek(bar.close)),
+            portfolio_value,
+        )
 
     def validate_parameters(self) -> bool:
         """Validate strategy parameters"""
@@ -0,0 +1,158 @@
+"""Custom strategies from visual-builder rule trees"""
+
+from typing import List, Dict, Any, Optional, Tuple
+import pandas as pd
+import numpy as np
+
+from .base import BaseStrategy, Signal
+from .panel import BarPanel
+from .rules import RuleProgram, compile_rules
+
+
+class RuleStrategy(BaseStrategy):
+    """
+    Custom Rule Strategy
+
+    Buys when the builder's entry conditions hold and sells the position
+    when its exit conditions hold. The rule tree (see strategies.rules)
+    is compiled once into a vectorized program, so evaluation costs about
+    as much as a hand-written vectorized strategy in backtests, batch
+    ticks and analyze() alike.
+
+    Parameters:
+    - rules: Builder rule tree with "entry", optional "exit" and
+      "not_in_position"
+    - name: Display name (default: Custom Rules)
+    - position_size_pct: Percentage of portfolio to allocate (default: 10)
+    - stop_loss_pct: Stop loss below entry, for the position monitor (optional)
+    - take_profit_pct: Take profit above entry, for the position monitor (optional)
+    - Any other key can be referenced from the tree as {"param": key}
+    """
+
+    def __init__(self, symbols: List[str], parameters: Dict[str, Any]):
+        default_params = {
+            "rules": {},
+            "name": "Custom Rules",
+            "position_size_pct": 10,
+        }
+        default_params.update(parameters)
+
+        super().__init__(
+            name=default_params["name"],
+            symbols=symbols,
+            parameters=default_params,
+        )
+        self._program: Optional[RuleProgram] = None
+
+    @property
+    def program(self) -> RuleProgram:
+        """
+        The compiled rules, built on first use
+
+        Raises:
+            ValueError: If the rule tree does not compile
+        """
+        if self._program is None:
+            self._program = compile_rules(self.parameters["rules"], self.parameters)
+        return self._program
+
+    def analyze(
+        self,
+        market_data: Dict[str, pd.DataFrame],
+        portfolio_value: Optional[float] = None
+    ) -> List[Signal]:
+        """
+        Generate trading signals from the compiled entry and exit rules
+        """
+        signals = []
+
+        for symbol in self.symbols:
+            if symbol not in market_data or market_data[symbol].empty:
+                continue
+
+            df = market_data[symbol]
+            ind = self._bar_indicators(df, symbol)
+            buy, sell = self.program.signals(ind)
+
+            signal = self._signal(symbol, buy[-1], sell[-1], ind.column("close")[-1], portfolio_value)
+            if signal is not None:
+                signals.append(signal)
+
+        return signals
+
+    def _signal(
+        self,
+        symbol: str,
+        buy: bool,
+        sell: bool,
+        close: float,
+        portfolio_value: Optional[float],
+    ) -> Optional[Signal]:
+        """Signal for the latest bar, given whether the entry or exit rules fired"""
+        if buy:
+            try:
+                quantity = self._calculate_position_size(close, portfolio_value)
+            except ValueError as e:
+                print(f"Skipping signal for {symbol}: {e}")
+                return None
+
+            metadata = {"entry_price": close}
+            if self.parameters.get("stop_loss_pct"):
+                metadata["stop_loss"] = close * (1 - self.parameters["stop_loss_pct"] / 100)
+            if self.parameters.get("take_profit_pct"):
+                metadata["take_profit"] = close * (1 + self.parameters["take_profit_pct"] / 100)
+
+            return Signal(
+                symbol=symbol,
+                action="buy",
+                quantity=quantity,
+                reason=f"{self.name}: entry rules met",
+                metadata=metadata,
+            )
+
+        if sell:
+            return Signal(
+                symbol=symbol,
+                action="sell",
+                quantity=0,  # Sell all
+                reason=f"{self.name}: exit rules met",
+                metadata={"exit_price": close},
+            )
+
+        return None
+
+    def generate_signals(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate the compiled rules over the full history in one pass
+        """
+        return self.program.signals(self._bar_indicators(df))
+
+    def warmup_bars(self) -> Optional[int]:
+        """Longest chain of indicator windows and bar offsets in the rules"""
+        return self.program.warmup_bars()
+
+    def _batch_signals(self, panel: BarPanel, portfolio_value: Optional[float]) -> List[Signal]:
+        """
+        Rule masks across all symbols at once; only triggering symbols get a Signal
+        """
+        buy, sell = self.program.panel_signals(panel)
+        buy, sell, close = buy[-1], sell[-1], panel.close[-1]
+
+        return self._panel_signals(panel, buy | sell, lambda symbol, j: self._signal(
+            symbol, buy[j], sell[j], close[j], portfolio_value
+        ))
+
+    def set_parameters(self, parameters: Dict[str, Any]):
+        """Update parameters; the rules are recompiled on next use"""
+        super().set_parameters(parameters)
+        self._program = None
+
+    def validate_parameters(self) -> bool:
+        """Validate strategy parameters"""
+        try:
+            self.program
+        except ValueError:
+            return False
+
+        pct = self.parameters["position_size_pct"]
+        return 0 < pct <= 100
@@ -1,10 +1,14 @@
 """Dual Moving Average Crossover Strategy"""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 import numpy as np
 
-from .base import BaseStrategy, Signal
+from .base import Bar, BaseStrategy, LiveState, Signal
+from .panel import BarPanel
+from ..indicators.moving_averages import sma
+from ..indicators.rolling import shift
+from ..indicators.streaming import SMA
 
 
 class DualMovingAverageStrategy(BaseStrategy):
@@ -50,69 +54,153 @@ class DualMovingAverageStrategy(BaseStrategy):
             if symbol not in market_data or market_data[symbol].empty:
                 continue
 
-            df = market_data[symbol].copy()
-
-            # Calculate moving averages
-            fast_ma = self.parameters["fast_ma"]
-            slow_ma = self.parameters["slow_ma"]
-            trend_ma = self.parameters["trend_ma"]
-
-            df["fast_ma"] = df["close"].rolling(window=fast_ma).mean()
-            df["slow_ma"] = df["close"].rolling(window=slow_ma).mean()
-            df["trend_ma"] = df["close"].rolling(window=trend_ma).mean()
+            df = market_data[symbol]
 
             # Need enough data
-            if len(df) < slow_ma + 1:
+            if len(df) < self.parameters["slow_ma"] + 1:
                 continue
 
-            current = df.iloc[-1]
-            prev = df.iloc[-2]
-
-            # Golden cross (buy signal)
-            if (
-                prev["fast_ma"] <= prev["slow_ma"]
-                and current["fast_ma"] > current["slow_ma"]
-                and current["close"] > current["trend_ma"]  # Trend filter
-            ):
-                try:
-                    quantity = self._calculate_position_size(current["close"], portfolio_value)
-                    signals.append(
-                        Signal(
-                            symbol=symbol,
-                            action="buy",
-                            quantity=quantity,
-                            reason=f"Golden cross: {fast_ma}MA crossed above {slow_ma}MA, price above {trend_ma}MA trend filter",
-                            metadata={
-                                "fast_ma": current["fast_ma"],
-                                "slow_ma": current["slow_ma"],
-                                "entry_price": current["close"],
-                            },
-                        )
-                    )
-                except ValueError as e:
-                    print(f"Skipping signal for {symbol}: {e}")
-                    continue
-
-            # Death cross (sell signal)
-            elif (
-                prev["fast_ma"] >= prev["slow_ma"]
-                and current["fast_ma"] < current["slow_ma"]
-            ):
-                signals.append(
-                    Signal(
-                        symbol=symbol,
-                        action="sell",
-                        quantity=0,  # Sell all
-                        reason=f"Death cross: {fast_ma}MA crossed below {slow_ma}MA",
-                        metadata={
-                            "fast_ma": current["fast_ma"],
-                            "slow_ma": current["slow_ma"],
-                        },
-                    )
-                )
+            ind = self._indicators(df, symbol)
+            signal = self._signal(
+                symbol,
+                ind["close"][-1],
+                ind["fast_ma"][-2:],
+                ind["slow_ma"][-2:],
+                ind["trend_ma"][-1],
+                portfolio_value,
+            )
+            if signal is not None:
+                signals.append(signal)
 
         return signals
 
+    def _signal(
+        self,
+        symbol: str,
+        close: float,
+        fast: Tuple[float, float],
+        slow: Tuple[float, float],
+        trend: float,
+        portfolio_value: Optional[float],
+    ) -> Optional[Signal]:
+        """Crossover signal for the latest bar, given (previous, current) moving averages"""
+        fast_ma = self.parameters["fast_ma"]
+        slow_ma = self.parameters["slow_ma"]
+        trend_ma = self.parameters["trend_ma"]
+        prev_fast, current_fast = fast
+        prev_slow, current_slow = slow
+
+        # Golden cross (buy signal)
+        if (
+            prev_fast <= prev_slow
+            and current_fast > current_slow
+            and close > trend  # Trend filter
+        ):
+            try:
+                quantity = self._calculate_position_size(close, portfolio_value)
+            except ValueError as e:
+                print(f"Skipping signal for {symbol}: {e}")
+                return None
+
+            return Signal(
+                symbol=symbol,
+                action="buy",
+                quantity=quantity,
+                reason=f"Golden cross: {fast_ma}MA crossed above {slow_ma}MA, price above {trend_ma}MA trend filter",
+                metadata={
+                    "fast_ma": current_fast,
+                    "slow_ma": current_slow,
+                    "entry_price": close,
+                },
+            )
+
+        # Death cross (sell signal)
+        if prev_fast >= prev_slow and current_fast < current_slow:
+            return Signal(
+                symbol=symbol,
+                action="sell",
+                quantity=0,  # Sell all
+                reason=f"Death cross: {fast_ma}MA crossed below {slow_ma}MA",
+                metadata={
+                    "fast_ma": current_fast,
+                    "slow_ma": current_slow,
+                },
+            )
+
+        return None
+
+    def generate_signals(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate crossover signals for the full history in one pass
+        """
+        ind = self._indicators(df)
+        ready = np.arange(len(df)) >= self.parameters["slow_ma"]
+
+        fast, slow = ind["fast_ma"], ind["slow_ma"]
+        prev_fast = shift(fast, 1)
+        prev_slow = shift(slow, 1)
+
+        buy = (prev_fast <= prev_slow) & (fast > slow) & (ind["close"] > ind["trend_ma"]) & ready
+        sell = (prev_fast >= prev_slow) & (fast < slow) & ready & ~buy
+
+        return buy, sell
+
+    def warmup_bars(self) -> Optional[int]:
+        """Longest moving average plus the previous bar for the crossover"""
+        p = self.parameters
+        return max(p["fast_ma"], p["slow_ma"], p["trend_ma"]) + 1
+
+    def _batch_signals(self, panel: BarPanel, portfolio_value: Optional[float]) -> List[Signal]:
+        """
+        Crossover masks across all symbols at once; only crossing symbols get a Signal
+        """
+        ready = panel.lengths >= self.parameters["slow_ma"] + 1
+        if not ready.any():
+            return []
+
+        close = panel.close
+        fast, slow, trend = (sma(close, self.parameters[name])[-2:] for name in ("fast_ma", "slow_ma", "trend_ma"))
+
+        buy = (fast[0] <= slow[0]) & (fast[1] > slow[1]) & (close[-1] > trend[1]) & ready
+        sell = (fast[0] >= slow[0]) & (fast[1] < slow[1]) & ready & ~buy
+
+        return self._panel_signals(panel, buy | sell, lambda symbol, j: self._signal(
+            symbol, close[-1, j], fast[:, j], slow[:, j], trend[1, j], portfolio_value
+        ))
+
+    def _indicators(self, df: pd.DataFrame, symbol: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Close with the three moving averages, as arrays aligned to df"""
+        ind = self._bar_indicators(df, symbol)
+        return {
+            "close": ind.column("close"),
+            "fast_ma": ind.compute(sma, "close", self.parameters["fast_ma"]),
+            "slow_ma": ind.compute(sma, "close", self.parameters["slow_ma"]),
+            "trend_ma": ind.compute(sma, "close", self.parameters["trend_ma"]),
+        }
+
+    def _live_indicators(self) -> Dict[str, Any]:
+        return {name: SMA(self.parameters[name]) for name in ("fast_ma", "slow_ma", "trend_ma")}
+
+    def _live_update(self, indicators: Dict[str, Any], bar: Bar):
+        for ma in indicators.values():
+            ma.update(bar.close)
+
+    def _live_signal(
+        self, symbol: str, state: LiveState, bar: Bar, portfolio_value: Optional[float]
+    ) -> Optional[Signal]:
+        if state.bars + 1 < self.parameters["slow_ma"] + 1:
+            return None
+
+        fast, slow, trend = (state.indicators[name] for name in ("fast_ma", "slow_ma", "trend_ma"))
+        return self._signal(
+            symbol,
+            bar.close,
+            (fast.value, fast.peek(bar.close)),
+            (slow.value, slow.peek(bar.close)),
+            trend.peek(bar.close),
+            portfolio_value,
+        )
+
     def validate_parameters(self) -> bool:
         """Validate strategy parameters"""
         required = ["fast_ma", "slow_ma", "trend_ma", "position_size_pct"]
@@ -1,10 +1,14 @@
 """Mean Reversion RSI Strategy"""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 import numpy as np
 
-from .base import BaseStrategy, Signal
+from .base import Bar, BaseStrategy, LiveState, Signal
+from .panel import BarPanel
+from ..indicators.momentum import rsi
+from ..indicators.moving_averages import sma
+from ..indicators.streaming import RSI, SMA
 
 
 class MeanReversionRSIStrategy(BaseStrategy):
@@ -19,6 +23,8 @@ class MeanReversionRSIStrategy(BaseStrategy):
     - rsi_oversold: Oversold threshold (default: 30)
     - rsi_overbought: Overbought threshold (default: 70)
     - ma_period: Moving average period for trend filter (default: 200)
+    - rsi_method: 'sma' for simple averages of gains and losses, or 'wilder'
+      for Wilder's smoothing (default: sma)
     - position_size_pct: Percentage of portfolio to allocate (default: 10)
     """
 
@@ -28,6 +34,7 @@ class MeanReversionRSIStrategy(BaseStrategy):
             "rsi_oversold": 30,
             "rsi_overbought": 70,
             "ma_period": 200,
+            "rsi_method": "sma",
             "position_size_pct": 10,
         }
         default_params.update(parameters)
@@ -52,73 +59,138 @@ class MeanReversionRSIStrategy(BaseStrategy):
             if symbol not in market_data or market_data[symbol].empty:
                 continue
 
-            df = market_data[symbol].copy()
-
-            # Calculate RSI
-            df["rsi"] = self._calculate_rsi(df["close"], self.parameters["rsi_period"])
-
-            # Calculate moving average
-            df["ma"] = df["close"].rolling(window=self.parameters["ma_period"]).mean()
+            df = market_data[symbol]
 
             # Current conditions
             if len(df) < self.parameters["ma_period"]:
                 continue
 
-            current = df.iloc[-1]
-
-            # Buy signal: RSI oversold + price above MA
-            if (
-                current["rsi"] < self.parameters["rsi_oversold"]
-                and current["close"] > current["ma"]
-            ):
-                try:
-                    quantity = self._calculate_position_size(current["close"], portfolio_value)
-                    signals.append(
-                        Signal(
-                            symbol=symbol,
-                            action="buy",
-                            quantity=quantity,
-                            reason=f"RSI oversold: {current['rsi']:.1f} < {self.parameters['rsi_oversold']}, price above {self.parameters['ma_period']}MA",
-                            metadata={
-                                "rsi": current["rsi"],
-                                "ma": current["ma"],
-                                "entry_price": current["close"],
-                            },
-                        )
-                    )
-                except ValueError as e:
-                    print(f"Skipping signal for {symbol}: {e}")
-                    continue
-
-            # Sell signal: RSI overbought (for existing positions)
-            elif current["rsi"] > self.parameters["rsi_overbought"]:
-                signals.append(
-                    Signal(
-                        symbol=symbol,
-                        action="sell",
-                        quantity=0,  # Sell all
-                        reason=f"RSI overbought: {current['rsi']:.1f} > {self.parameters['rsi_overbought']}",
-                        metadata={
-                            "rsi": current["rsi"],
-                        },
-                    )
-                )
+            ind = self._indicators(df, symbol)
+            signal = self._signal(symbol, ind["close"][-1], ind["rsi"][-1], ind["ma"][-1], portfolio_value)
+            if signal is not None:
+                signals.append(signal)
 
         return signals
 
-    def _calculate_rsi(self, prices: pd.Series, period: int) -> pd.Series:
+    def _signal(
+        self,
+        symbol: str,
+        close: float,
+        current_rsi: float,
+        ma: float,
+        portfolio_value: Optional[float],
+    ) -> Optional[Signal]:
+        """RSI signal for the latest bar, given its indicator values"""
+        # Buy signal: RSI oversold + price above MA
+        if current_rsi < self.parameters["rsi_oversold"] and close > ma:
+            try:
+                quantity = self._calculate_position_size(close, portfolio_value)
+            except ValueError as e:
+                print(f"Skipping signal for {symbol}: {e}")
+                return None
+
+            return Signal(
+                symbol=symbol,
+                action="buy",
+                quantity=quantity,
+                reason=f"RSI oversold: {current_rsi:.1f} < {self.parameters['rsi_oversold']}, price above {self.parameters['ma_period']}MA",
+                metadata={
+                    "rsi": current_rsi,
+                    "ma": ma,
+                    "entry_price": close,
+                },
+            )
+
+        # Sell signal: RSI overbought (for existing positions)
+        if current_rsi > self.parameters["rsi_overbought"]:
+            return Signal(
+                symbol=symbol,
+                action="sell",
+                quantity=0,  # Sell all
+                reason=f"RSI overbought: {current_rsi:.1f} > {self.parameters['rsi_overbought']}",
+                metadata={
+                    "rsi": current_rsi,
+                },
+            )
+
+        return None
+
+    def generate_signals(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate RSI mean reversion signals for the full history in one pass
+        """
+        ind = self._indicators(df)
+        ready = np.arange(len(df)) >= self.parameters["ma_period"] - 1
+
+        buy = (ind["rsi"] < self.parameters["rsi_oversold"]) & (ind["close"] > ind["ma"]) & ready
+        sell = (ind["rsi"] > self.parameters["rsi_overbought"]) & ready & ~buy
+
+        return buy, sell
+
+    def warmup_bars(self) -> Optional[int]:
         """
-        Calculate Relative Strength Index
+        Moving average window, or the RSI window plus its price change
+
+        Wilder's RSI smooths recursively over the whole history, so no
+        finite window reproduces it: None.
         """
-        delta = prices.diff()
+        if self.parameters["rsi_method"] == "wilder":
+            return None
+        return max(self.parameters["ma_period"], self.parameters["rsi_period"] + 1)
 
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    def _batch_signals(self, panel: BarPanel, portfolio_value: Optional[float]) -> List[Signal]:
+        """
+        RSI masks across all symbols at once; only triggering symbols get a Signal
+        """
+        ready = panel.lengths >= self.parameters["ma_period"]
+        if not ready.any():
+            return []
+
+        close = panel.close
+        current_rsi = rsi(close, self.parameters["rsi_period"], method=self.parameters["rsi_method"])[-1]
+        ma = sma(close, self.parameters["ma_period"])[-1]
+        close = close[-1]
+
+        buy = (current_rsi < self.parameters["rsi_oversold"]) & (close > ma) & ready
+        sell = (current_rsi > self.parameters["rsi_overbought"]) & ready & ~buy
+
+        return self._panel_signals(panel, buy | sell, lambda symbol, j: self._signal(
+            symbol, close[j], current_rsi[j], ma[j], portfolio_value
+        ))
+
+    def _indicators(self, df: pd.DataFrame, symbol: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Close with the RSI and trend MA, as arrays aligned to df"""
+        ind = self._bar_indicators(df, symbol)
+        return {
+            "close": ind.column("close"),
+            "rsi": ind.compute(rsi, "close", self.parameters["rsi_period"], method=self.parameters["rsi_method"]),
+            "ma": ind.compute(sma, "close", self.parameters["ma_period"]),
+        }
 
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
+    def _live_indicators(self) -> Dict[str, Any]:
+        return {
+            "rsi": RSI(self.parameters["rsi_period"], method=self.parameters["rsi_method"]),
+            "ma": SMA(self.parameters["ma_period"]),
+        }
 
-        return rsi
+    def _live_update(self, indicators: Dict[str, Any], bar: Bar):
+        indicators["rsi"].update(bar.close)
+        indicators["ma"].update(bar.close)
+
+    def _live_signal(
+        self, symbol: str, state: LiveState, bar: Bar, portfolio_value: Optional[float]
+    ) -> Optional[Signal]:
+        if state.bars + 1 < self.parameters["ma_period"]:
+            return None
+
+        indicators = state.indicators
+        return self._signal(
+            symbol,
+            bar.close,
+            indicators["rsi"].peek(bar.close),
+            indicators["ma"].peek(bar.close),
+            portfolio_value,
+        )
 
     def validate_parameters(self) -> bool:
         """Validate strategy parameters"""
@@ -153,4 +225,7 @@ class MeanReversionRSIStrategy(BaseStrategy):
         if self.parameters["ma_period"] < 50 or self.parameters["ma_period"] > 300:
             return False
 
+        if self.parameters["rsi_method"] not in ("sma", "wilder"):
+            return False
+
         return True
@@ -1,10 +1,14 @@
 """Momentum Breakout Strategy"""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 import numpy as np
 
-from .base import BaseStrategy, Signal
+from .base import Bar, BaseStrategy, LiveState, Signal
+from .panel import BarPanel
+from ..indicators.moving_averages import sma
+from ..indicators.rolling import rolling_max
+from ..indicators.streaming import SMA, RollingMax
 
 
 class MomentumBreakoutStrategy(BaseStrategy):
@@ -53,53 +57,141 @@ class MomentumBreakoutStrategy(BaseStrategy):
             if symbol not in market_data or market_data[symbol].empty:
                 continue
 
-            df = market_data[symbol].copy()
-
-            # Calculate indicators
+            df = market_data[symbol]
             lookback = self.parameters["lookback_period"]
 
-            # N-day high
-            df["high_n"] = df["high"].rolling(window=lookback).max()
-
-            # Average volume
-            df["avg_volume"] = df["volume"].rolling(window=lookback).mean()
-
             # Current conditions
             if len(df) < lookback + 1:
                 continue
 
-            current = df.iloc[-1]
-            prev = df.iloc[-2]
-
-            # Breakout condition: price breaks above N-day high
-            breakout = (
-                current["close"] > prev["high_n"]
-                and current["volume"] > self.parameters["volume_multiplier"] * current["avg_volume"]
+            ind = self._indicators(df, symbol)
+            signal = self._signal(
+                symbol,
+                ind["close"][-1],
+                ind["volume"][-1],
+                ind["high_n"][-2],
+                ind["avg_volume"][-1],
+                portfolio_value,
             )
-
-            if breakout:
-                try:
-                    quantity = self._calculate_position_size(current["close"], portfolio_value)
-                    signals.append(
-                        Signal(
-                            symbol=symbol,
-                            action="buy",
-                            quantity=quantity,
-                            reason=f"Momentum breakout: price {current['close']:.2f} > {lookback}d high {prev['high_n']:.2f}",
-                            metadata={
-                                "entry_price": current["close"],
-                                "stop_loss": current["close"] * (1 - self.parameters["stop_loss_pct"] / 100),
-                                "take_profit": current["close"] * (1 + self.parameters["take_profit_pct"] / 100),
-                            },
-                        )
-                    )
-                except ValueError as e:
-                    # Portfolio value not provided or invalid - skip signal
-                    print(f"Skipping signal for {symbol}: {e}")
-                    continue
+            if signal is not None:
+                signals.append(signal)
 
         return signals
 
+    def _signal(
+        self,
+        symbol: str,
+        close: float,
+        volume: float,
+        prev_high: float,
+        avg_volume: float,
+        portfolio_value: Optional[float],
+    ) -> Optional[Signal]:
+        """Breakout signal for the latest bar, given its indicator values"""
+        lookback = self.parameters["lookback_period"]
+
+        # Breakout condition: price breaks above N-day high
+        breakout = (
+            close > prev_high
+            and volume > self.parameters["volume_multiplier"] * avg_volume
+        )
+        if not breakout:
+            return None
+
+        try:
+            quantity = self._calculate_position_size(close, portfolio_value)
+        except ValueError as e:
+            # Portfolio value not provided or invalid - skip signal
+            print(f"Skipping signal for {symbol}: {e}")
+            return None
+
+        return Signal(
+            symbol=symbol,
+            action="buy",
+            quantity=quantity,
+            reason=f"Momentum breakout: price {close:.2f} > {lookback}d high {prev_high:.2f}",
+            metadata={
+                "entry_price": close,
+                "stop_loss": close * (1 - self.parameters["stop_loss_pct"] / 100),
+                "take_profit": close * (1 + self.parameters["take_profit_pct"] / 100),
+            },
+        )
+
+    def generate_signals(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate breakout signals for the full history in one pass
+        """
+        ind = self._indicators(df)
+        ready = np.arange(len(df)) >= self.parameters["lookback_period"]
+
+        buy = np.zeros(len(df), dtype=bool)
+        buy[1:] = (
+            (ind["close"][1:] > ind["high_n"][:-1])
+            & (ind["volume"][1:] > self.parameters["volume_multiplier"] * ind["avg_volume"][1:])
+        )
+        buy &= ready
+
+        return buy, np.zeros(len(df), dtype=bool)
+
+    def warmup_bars(self) -> Optional[int]:
+        """Lookback window plus the previous bar for the breakout level"""
+        return self.parameters["lookback_period"] + 1
+
+    def _batch_signals(self, panel: BarPanel, portfolio_value: Optional[float]) -> List[Signal]:
+        """
+        Breakout masks across all symbols at once; only breaking-out symbols get a Signal
+        """
+        lookback = self.parameters["lookback_period"]
+        ready = panel.lengths >= lookback + 1
+        if not ready.any():
+            return []
+
+        prev_high = rolling_max(panel.high, lookback)[-2]
+        avg_volume = sma(panel.volume, lookback)[-1]
+        close, volume = panel.close[-1], panel.volume[-1]
+
+        buy = (close > prev_high) & (volume > self.parameters["volume_multiplier"] * avg_volume) & ready
+
+        return self._panel_signals(panel, buy, lambda symbol, j: self._signal(
+            symbol, close[j], volume[j], prev_high[j], avg_volume[j], portfolio_value
+        ))
+
+    def _indicators(self, df: pd.DataFrame, symbol: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Close and volume with the breakout indicators, as arrays aligned to df"""
+        lookback = self.parameters["lookback_period"]
+        ind = self._bar_indicators(df, symbol)
+
+        return {
+            "close": ind.column("close"),
+            "volume": ind.column("volume"),
+            "high_n": ind.compute(rolling_max, "high", lookback),  # N-day high
+            "avg_volume": ind.compute(sma, "volume", lookback),
+        }
+
+    def _live_indicators(self) -> Dict[str, Any]:
+        lookback = self.parameters["lookback_period"]
+        return {"high_n": RollingMax(lookback), "avg_volume": SMA(lookback)}
+
+    def _live_update(self, indicators: Dict[str, Any], bar: Bar):
+        indicators["high_n"].update(bar.high)
+        indicators["avg_volume"].update(bar.volume)
+
+    def _live_signal(
+        self, symbol: str, state: LiveState, bar: Bar, portfolio_value: Optional[float]
+    ) -> Optional[Signal]:
+        if state.bars + 1 < self.parameters["lookback_period"] + 1:
+            return None
+
+        indicators = state.indicators
+        return self._signal(
+            symbol,
+            bar.close,
+            bar.volume,
+            indicators["high_n"].value,  # As of the previous bar
+            indicators["avg_volume"].peek(bar.volume),
+            portfolio_value,
+        )
+
     def validate_parameters(self) -> bool:
         """Validate strategy parameters"""
         required = [
@@ -0,0 +1,127 @@
+"""OHLCV bars of many symbols as (bars x symbols) matrices, for batch analysis"""
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+
+@lru_cache(maxsize=256)
+def _field_positions(columns: tuple) -> Tuple[int, ...]:
+    """Position of each of FIELDS among a frame's columns, -1 where missing"""
+    index = {name: i for i, name in enumerate(columns)}
+    return tuple(index.get(name, -1) for name in FIELDS)
+
+
+class BarPanel:
+    """
+    Each symbol's bar history as columns of (bars x symbols) float64 matrices
+
+    Rows are aligned on each symbol's own bars, newest last: row -1 holds
+    every symbol's latest bar and row -2 the one before it, whatever their
+    timestamps. This is the history analyze() sees per symbol, not a
+    calendar alignment like backtest.panel.PricePanel. Symbols with fewer
+    bars than the panel has rows are NaN-padded at the top, so indicators
+    from alpacadesk_engine.indicators computed along axis 0 equal the
+    per-symbol ones (to rounding).
+
+    All five field matrices are built together on first access, from one
+    to_numpy() per frame, and shared by every strategy reading the panel.
+    A field a frame lacks is NaN for that symbol.
+
+    Attributes:
+        symbols: Column order of the matrices
+        columns: Symbol -> column index
+        lengths: Bars per symbol; 0 for symbols with an empty frame
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], symbols: Optional[List[str]] = None):
+        """
+        Args:
+            frames: Dictionary mapping symbols to DataFrame with OHLCV data
+            symbols: Columns to include, in order (default: all of frames);
+                symbols without a frame are dropped
+        """
+        if symbols is None:
+            symbols = list(frames.keys())
+        self.symbols = [s for s in symbols if frames.get(s) is not None]
+        self.columns: Dict[str, int] = {symbol: j for j, symbol in enumerate(self.symbols)}
+        self.lengths = np.array([len(frames[s]) for s in self.symbols], dtype=np.intp)
+        self.rows = int(self.lengths.max()) if len(self.lengths) else 0
+        self._frames = {s: frames[s] for s in self.symbols}
+        self._fields: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def field(self, name: str) -> np.ndarray:
+        """One OHLCV field as a (bars x symbols) matrix, NaN before each symbol's first bar"""
+        if not self._fields:
+            self._build_fields()
+        return self._fields[name]
+
+    def _build_fields(self):
+        data = np.full((len(FIELDS), self.rows, len(self.symbols)), np.nan)
+
+        for j, symbol in enumerate(self.symbols):
+            length = self.lengths[j]
+            if not length:
+                continue
+
+            frame = self._frames[symbol]
+            try:
+                block = frame.to_numpy(dtype=np.float64)
+            except (TypeError, ValueError):
+                block = None  # Non-numeric extra columns; take the fields one by one
+
+            for k, position in enumerate(_field_positions(tuple(frame.columns))):
+                if position < 0:
+                    continue
+                column = block[:, position] if block is not None else frame.iloc[:, position].to_numpy(dtype=np.float64)
+                data[k, self.rows - length:, j] = column
+
+        self._fields = {name: data[k] for k, name in enumerate(FIELDS)}
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.field("open")
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.field("high")
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.field("low")
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.field("close")
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.field("volume")
+
+    def subset(self, symbols: List[str]) -> "BarPanel":
+        """
+        Panel of the given symbols only, in that order
+
+        Returns self when nothing changes. Fields already built are sliced
+        rather than rebuilt from the frames.
+        """
+        symbols = [s for s in symbols if s in self.columns]
+        if symbols == self.symbols:
+            return self
+
+        panel = BarPanel(self._frames, symbols)
+        index = [self.columns[s] for s in symbols]
+        for name, matrix in self._fields.items():
+            panel._fields[name] = matrix[self.rows - panel.rows:, index]
+        return panel
+
+    def market_data(self) -> Dict[str, pd.DataFrame]:
+        """The per-symbol frames, as analyze() takes them"""
+        return dict(self._frames)
@@ -0,0 +1,527 @@
+"""Compile visual-builder rule trees into vectorized NumPy programs
+
+A rule tree is the JSON the strategy builder saves for a custom strategy:
+
+    {
+        "entry": [
+            {"left": "close", "op": "is_above", "right": {"indicator": "sma", "period": 20}},
+            {"left": {"indicator": "rsi", "period": 14}, "op": "is_below", "right": 70},
+            {"left": "volume", "op": "is_above",
+             "right": {"indicator": "avg_volume", "period": 20, "times": 1.5}}
+        ],
+        "exit": {"left": {"indicator": "rsi", "period": 14}, "op": "crosses_above", "right": 70},
+        "not_in_position": true
+    }
+
+Conditions:
+    {"left": a, "op": op, "right": b}  op is is_above, is_below,
+        crosses_above, crosses_below or equals
+    {"left": a, "op": "is_between", "lower": b, "upper": c}  inclusive
+    {"all": [...]}, {"any": [...]}, {"not": condition}
+    [...]  shorthand for {"all": [...]}
+
+Operands:
+    a number, or {"param": name} to read it from the strategy parameters
+    a price field: "open", "high", "low", "close" or "volume", or
+        {"field": name}
+    {"indicator": name, <parameters>, "source": operand, "output": name}
+        source (default "close") only for single-input indicators; output
+        picks one series of a multi-output indicator (default the first)
+    any operand dict may add "times": k (scale by k) and "bars_ago": n
+        (the value n bars earlier)
+
+A condition is false until every operand it compares has a value, so
+NOT over a warming-up indicator does not fire either.
+
+compile_rules() turns a tree into a RuleProgram: a flat list of nodes in
+dependency order. Nodes are hash-consed on (operation, inputs, parameters)
+and conditions are put in canonical form (is_below(a, b) is is_above(b, a),
+AND/OR inputs are flattened and sorted), so a subexpression used more than
+once, like the same SMA in an entry and an exit condition or the shifted
+operands of two crossovers, is a single node computed once per evaluation.
+Evaluating is one pass over the list with NumPy, on one symbol's 1-D
+arrays or on a BarPanel's (bars x symbols) matrices.
+"""
+
+from functools import reduce
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from ..indicators.cache import BarIndicators
+from ..indicators.momentum import macd, mfi, roc, rsi, stochastic
+from ..indicators.moving_averages import ema, sma, wma
+from ..indicators.rolling import rolling_max, rolling_min, shift
+from ..indicators.trend import adx, aroon, parabolic_sar
+from ..indicators.volatility import atr, bollinger, keltner
+from ..indicators.volume import obv, vwap
+from .panel import FIELDS, BarPanel
+
+# Relative tolerance of the equals operator
+EQUALS_RTOL = 1e-9
+
+
+class IndicatorSpec(NamedTuple):
+    """How the compiler calls one indicator function"""
+    func: Callable
+    inputs: Tuple[str, ...]  # Price fields in func's argument order, or ("source",) for one operand
+    params: Dict[str, Any]  # Parameters after the inputs, in func's argument order, with defaults
+    outputs: Tuple[str, ...] = ()  # Series of a NamedTuple result; the first is the default
+    panel: bool = True  # Exact on a NaN-padded panel; otherwise evaluated per symbol
+    lookback: Optional[Callable[[Dict[str, Any]], int]] = None  # Bars per value; None if unbounded
+
+
+def _period(params: Dict[str, Any]) -> int:
+    return params["period"]
+
+
+INDICATORS: Dict[str, IndicatorSpec] = {
+    "sma": IndicatorSpec(sma, ("source",), {"period": 20}, lookback=_period),
+    "ema": IndicatorSpec(ema, ("source",), {"period": 20}),
+    "wma": IndicatorSpec(wma, ("source",), {"period": 20}, panel=False, lookback=_period),
+    "avg_volume": IndicatorSpec(sma, ("volume",), {"period": 20}, lookback=_period),
+    "highest": IndicatorSpec(rolling_max, ("source",), {"period": 20}, lookback=_period),
+    "lowest": IndicatorSpec(rolling_min, ("source",), {"period": 20}, lookback=_period),
+    "rsi": IndicatorSpec(
+        rsi, ("source",), {"period": 14, "method": "wilder"},
+        lookback=lambda p: p["period"] + 1 if p["method"] == "sma" else None,
+    ),
+    "macd": IndicatorSpec(
+        macd, ("source",), {"fast": 12, "slow": 26, "signal": 9}, outputs=("macd", "signal", "histogram")
+    ),
+    "stochastic": IndicatorSpec(
+        stochastic, ("high", "low", "close"), {"k_period": 14, "d_period": 3, "smooth_k": 1},
+        outputs=("k", "d"), lookback=lambda p: p["k_period"] + p["smooth_k"] + p["d_period"] - 2,
+    ),
+    "roc": IndicatorSpec(roc, ("source",), {"period": 10}, lookback=lambda p: p["period"] + 1),
+    "mfi": IndicatorSpec(
+        mfi, ("high", "low", "close", "volume"), {"period": 14}, panel=False, lookback=lambda p: p["period"] + 1
+    ),
+    "bollinger": IndicatorSpec(
+        bollinger, ("source",), {"period": 20, "std_dev": 2.0},
+        outputs=("middle", "upper", "lower"), lookback=_period,
+    ),
+    "atr": IndicatorSpec(atr, ("high", "low", "close"), {"period": 14}, panel=False),
+    "keltner": IndicatorSpec(
+        keltner, ("high", "low", "close"), {"period": 20, "multiplier": 2.0, "atr_period": 10},
+        outputs=("middle", "upper", "lower"), panel=False,
+    ),
+    "obv": IndicatorSpec(obv, ("close", "volume"), {}, panel=False),
+    "vwap": IndicatorSpec(
+        vwap, ("high", "low", "close", "volume"), {"period": None}, panel=False,
+        lookback=lambda p: p["period"],
+    ),
+    "adx": IndicatorSpec(adx, ("high", "low", "close"), {"period": 14}, outputs=("adx", "plus_di", "minus_di"), panel=False),
+    "aroon": IndicatorSpec(
+        aroon, ("high", "low"), {"period": 25}, outputs=("up", "down", "oscillator"),
+        lookback=lambda p: p["period"] + 1,
+    ),
+    "psar": IndicatorSpec(parabolic_sar, ("high", "low"), {"acceleration": 0.02, "maximum": 0.2}, panel=False),
+}
+
+# Parameters that only take these values
+_CHOICES = {("rsi", "method"): ("wilder", "sma")}
+
+_COMPARISONS = ("is_above", "is_below", "crosses_above", "crosses_below", "equals", "is_between")
+
+
+class Node(NamedTuple):
+    """One operation of a RuleProgram; args are indices of earlier nodes"""
+    op: str
+    args: Tuple[int, ...] = ()
+    params: Tuple = ()
+
+
+class RuleProgram:
+    """
+    A compiled rule tree
+
+    Attributes:
+        nodes: Operations in dependency order
+        entry: Node of the entry condition
+        exit: Node of the exit condition, or None if the tree has none
+        not_in_position: Suppress entries while the rules' own last entry
+            is more recent than their last exit
+        fields: Price fields the program reads
+    """
+
+    def __init__(self, nodes: List[Node], entry: int, exit: Optional[int], not_in_position: bool):
+        self.nodes = nodes
+        self.entry = entry
+        self.exit = exit
+        self.not_in_position = not_in_position
+        self.fields = sorted({node.params[0] for node in nodes if node.op == "field"})
+
+    def warmup_bars(self) -> Optional[int]:
+        """Bars of history behind a final signal; None if any part needs the whole history"""
+        if self.not_in_position:
+            return None  # The position state depends on every earlier signal
+
+        bars: List[Optional[int]] = []
+        for node in self.nodes:
+            inputs = [bars[arg] for arg in node.args]
+            if any(b is None for b in inputs):
+                bars.append(None)
+            elif node.op == "indicator":
+                spec = INDICATORS[node.params[0]]
+                window = spec.lookback(dict(node.params[1])) if spec.lookback else None
+                bars.append(None if window is None else max(inputs, default=1) + window - 1)
+            elif node.op == "shift":
+                bars.append(inputs[0] + node.params[0])
+            else:
+                bars.append(max(inputs, default=1))
+
+        tops = [bars[root] for root in (self.entry, self.exit) if root is not None]
+        return None if any(b is None for b in tops) else max(tops)
+
+    def signals(self, ind: BarIndicators) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Buy and sell masks for every bar of one symbol
+
+        Indicators of price fields go through ind, so with a symbol they
+        come from the shared indicator cache.
+        """
+        def indicator(spec: IndicatorSpec, node: Node, inputs: List[np.ndarray]):
+            if all(self.nodes[arg].op == "field" for arg in node.args):
+                names = tuple(self.nodes[arg].params[0] for arg in node.args)
+                return ind.compute(spec.func, names, *_arguments(node))
+            return spec.func(*inputs, *_arguments(node))
+
+        n = len(ind.df)
+        return self._signals(ind.column, indicator, (n,))
+
+    def panel_signals(self, panel: BarPanel) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Buy and sell masks for every row of a panel, as (bars x symbols) matrices
+
+        Indicators that are not exact on a NaN-padded panel are computed
+        per symbol over its own bars.
+        """
+        def indicator(spec: IndicatorSpec, node: Node, inputs: List[np.ndarray]):
+            params = _arguments(node)
+            if spec.panel:
+                return spec.func(*inputs, *params)
+
+            results = [None] * len(panel.symbols)
+            for j, length in enumerate(panel.lengths):
+                if length:
+                    results[j] = spec.func(*[x[len(panel) - length:, j] for x in inputs], *params)
+            return _stack(results, panel.lengths, len(panel))
+
+        return self._signals(panel.field, indicator, (len(panel), len(panel.symbols)))
+
+    def _signals(self, field: Callable, indicator: Callable, shape: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+        values = self._evaluate(field, indicator)
+        entry = np.broadcast_to(values[self.entry], shape)
+        exit = np.broadcast_to(values[self.exit], shape) if self.exit is not None else np.zeros(shape, dtype=bool)
+
+        buy = entry & ~_holding(entry, exit) if self.not_in_position else entry.copy()
+        return buy, exit & ~entry
+
+    def _evaluate(self, field: Callable, indicator: Callable) -> List[Any]:
+        """Every node's value, in order"""
+        values: List[Any] = []
+        for node in self.nodes:
+            args = [values[arg] for arg in node.args]
+            op = node.op
+
+            if op == "field":
+                value = field(node.params[0])
+            elif op == "const":
+                value = node.params[0]
+            elif op == "indicator":
+                value = indicator(INDICATORS[node.params[0]], node, args)
+            elif op == "output":
+                value = args[0][node.params[0]]
+            elif op == "times":
+                value = args[0] * node.params[0]
+            elif op == "shift":
+                value = shift(args[0], node.params[0])
+            elif op == "defined":
+                value = ~np.isnan(args[0])
+            elif op == "gt":
+                value = np.greater(*args)
+            elif op == "le":
+                value = np.less_equal(*args)
+            elif op == "eq":
+                value = np.isclose(*args, rtol=EQUALS_RTOL, atol=0.0)
+            elif op == "and":
+                value = reduce(np.logical_and, args)
+            elif op == "or":
+                value = reduce(np.logical_or, args)
+            elif op == "not":
+                value = np.logical_not(args[0])
+            else:
+                raise ValueError(f"Unknown rule operation: {op}")
+
+            values.append(value)
+        return values
+
+
+def _arguments(node: Node) -> Tuple:
+    """Parameter values of an indicator node, positionally (as the indicator cache keys them)"""
+    return tuple(value for _, value in node.params[1])
+
+
+def _holding(entry: np.ndarray, exit: np.ndarray) -> np.ndarray:
+    """
+    Whether the rules hold a position going into each bar
+
+    A position is held after an entry until a later exit (a bar meeting
+    both counts as an entry), so it is held going into bar t when the
+    last entry before t is more recent than the last exit before t.
+    """
+    rows = np.arange(len(entry)).reshape((-1,) + (1,) * (entry.ndim - 1))
+    last_entry = np.maximum.accumulate(np.where(entry, rows, -1), axis=0)
+    last_exit = np.maximum.accumulate(np.where(exit & ~entry, rows, -1), axis=0)
+    return shift(last_entry > last_exit, 1) == 1
+
+
+def _stack(results: List[Any], lengths: np.ndarray, rows: int) -> Any:
+    """Per-symbol indicator results as (bars x symbols) matrices, NaN-padded at the top"""
+    template = next((r for r in results if r is not None), None)
+    if isinstance(template, tuple):
+        parts = [_stack([r[i] if r is not None else None for r in results], lengths, rows) for i in range(len(template))]
+        return type(template)(*parts)
+
+    out = np.full((rows, len(results)), np.nan)
+    for j, result in enumerate(results):
+        if result is not None:
+            out[rows - lengths[j]:, j] = result
+    return out
+
+
+class _Compiler:
+    """Builds the node list of one rule tree, sharing identical subexpressions"""
+
+    def __init__(self, parameters: Dict[str, Any]):
+        self.parameters = parameters
+        self.nodes: List[Node] = []
+        self.ids: Dict[Node, int] = {}
+
+    def add(self, op: str, args: Tuple[int, ...] = (), params: Tuple = ()) -> int:
+        node = Node(op, tuple(args), params)
+        index = self.ids.get(node)
+        if index is None:
+            index = self.ids[node] = len(self.nodes)
+            self.nodes.append(node)
+        return index
+
+    # Conditions
+
+    def condition(self, tree: Any, path: str) -> int:
+        """Compile a condition, ANDed with every operand it compares having a value"""
+        operands: List[int] = []
+        root = self._condition(tree, path, operands)
+        defined = [self.add("defined", (x,)) for x in sorted(set(operands))]
+        return self._logical("and", [root] + defined)
+
+    def _condition(self, tree: Any, path: str, operands: List[int]) -> int:
+        if isinstance(tree, list):
+            tree = {"all": tree}
+        if not isinstance(tree, dict):
+            raise ValueError(f"{path}: expected a condition object")
+
+        for key in ("all", "any"):
+            if key in tree:
+                children = tree[key]
+                if not isinstance(children, list) or not children:
+                    raise ValueError(f"{path}.{key}: expected a non-empty list of conditions")
+                return self._logical(
+                    "and" if key == "all" else "or",
+                    [self._condition(c, f"{path}.{key}[{i}]", operands) for i, c in enumerate(children)],
+                )
+
+        if "not" in tree:
+            inner = self._condition(tree["not"], f"{path}.not", operands)
+            node = self.nodes[inner]
+            return node.args[0] if node.op == "not" else self.add("not", (inner,))
+
+        op = tree.get("op")
+        if op not in _COMPARISONS:
+            raise ValueError(f"{path}.op: unknown operator {op!r}; expected one of {', '.join(_COMPARISONS)}")
+
+        left = self.operand(tree.get("left"), f"{path}.left")
+        if op == "is_between":
+            lower = self.operand(tree.get("lower"), f"{path}.lower")
+            upper = self.operand(tree.get("upper"), f"{path}.upper")
+            self._compared(operands, left, lower, upper)
+            return self._logical("and", [self.add("le", (lower, left)), self.add("le", (left, upper))])
+
+        right = self.operand(tree.get("right"), f"{path}.right")
+        if op == "is_above":
+            self._compared(operands, left, right)
+            return self.add("gt", (left, right))
+        if op == "is_below":
+            self._compared(operands, left, right)
+            return self.add("gt", (right, left))
+        if op == "equals":
+            self._compared(operands, left, right)
+            return self.add("eq", tuple(sorted((left, right))))
+
+        # Crossovers compare the previous bar too
+        prev_left, prev_right = self._shifted(left, 1), self._shifted(right, 1)
+        self._compared(operands, left, right, prev_left, prev_right)
+        if op == "crosses_above":
+            return self._logical("and", [self.add("le", (prev_left, prev_right)), self.add("gt", (left, right))])
+        return self._logical("and", [self.add("le", (prev_right, prev_left)), self.add("gt", (right, left))])
+
+    def _compared(self, operands: List[int], *nodes: int):
+        operands.extend(n for n in nodes if self.nodes[n].op != "const")
+
+    def _logical(self, op: str, children: List[int]) -> int:
+        """AND/OR with nested same-op inputs flattened and duplicates dropped"""
+        flat = set()
+        for child in children:
+            node = self.nodes[child]
+            flat.update(node.args if node.op == op else (child,))
+        if len(flat) == 1:
+            return flat.pop()
+        return self.add(op, tuple(sorted(flat)))
+
+    # Operands
+
+    def operand(self, tree: Any, path: str) -> int:
+        if tree is None:
+            raise ValueError(f"{path}: missing operand")
+        if isinstance(tree, str):
+            if tree not in FIELDS:
+                raise ValueError(f"{path}: unknown price field {tree!r}")
+            return self.add("field", params=(tree,))
+
+        if not isinstance(tree, dict) or "param" in tree:
+            return self.add("const", params=(float(self.number(tree, path)),))
+
+        if "indicator" in tree:
+            node = self._indicator(tree, path)
+        elif "field" in tree:
+            node = self.operand(tree["field"], f"{path}.field")
+        else:
+            raise ValueError(f"{path}: expected a number, price field or indicator")
+
+        bars_ago = self.number(tree.get("bars_ago", 0), f"{path}.bars_ago", integer=True, minimum=0)
+        node = self._shifted(node, bars_ago)
+
+        if "times" in tree:
+            times = float(self.number(tree["times"], f"{path}.times"))
+            if self.nodes[node].op == "const":
+                node = self.add("const", params=(self.nodes[node].params[0] * times,))
+            elif times != 1.0:
+                node = self.add("times", (node,), (times,))
+        return node
+
+    def _shifted(self, node: int, bars: int) -> int:
+        if bars == 0 or self.nodes[node].op == "const":
+            return node
+        inner = self.nodes[node]
+        if inner.op == "shift":
+            return self.add("shift", inner.args, (inner.params[0] + bars,))
+        return self.add("shift", (node,), (bars,))
+
+    def _indicator(self, tree: Dict[str, Any], path: str) -> int:
+        name = tree["indicator"]
+        spec = INDICATORS.get(name)
+        if spec is None:
+            raise ValueError(f"{path}.indicator: unknown indicator {name!r}")
+
+        allowed = set(spec.params) | {"indicator", "output", "times", "bars_ago"}
+        if spec.inputs == ("source",):
+            allowed.add("source")
+        unknown = sorted(set(tree) - allowed)
+        if unknown:
+            raise ValueError(f"{path}: unknown key(s) for {name}: {', '.join(unknown)}")
+
+        params = []
+        for key, default in spec.params.items():
+            value = tree.get(key, default)
+            where = f"{path}.{key}"
+            if (name, key) in _CHOICES:
+                if value not in _CHOICES[(name, key)]:
+                    raise ValueError(f"{where}: expected one of {', '.join(_CHOICES[(name, key)])}")
+            elif value is not None:
+                integer = default is None or isinstance(default, int)
+                value = self.number(value, where, integer=integer, minimum=1 if integer else None)
+            params.append((key, value))
+
+        if spec.inputs == ("source",):
+            inputs = (self.operand(tree.get("source", "close"), f"{path}.source"),)
+            if self.nodes[inputs[0]].op == "const":
+                raise ValueError(f"{path}.source: expected a price field or indicator")
+        else:
+            inputs = tuple(self.add("field", params=(f,)) for f in spec.inputs)
+        node = self.add("indicator", inputs, (name, tuple(params)))
+
+        output = tree.get("output")
+        if spec.outputs:
+            output = spec.outputs[0] if output is None else output
+            if output not in spec.outputs:
+                raise ValueError(f"{path}.output: expected one of {', '.join(spec.outputs)}")
+            node = self.add("output", (node,), (spec.outputs.index(output),))
+        elif output is not None:
+            raise ValueError(f"{path}.output: {name} has a single output")
+        return node
+
+    def number(self, value: Any, path: str, integer: bool = False, minimum: Optional[float] = None):
+        """A literal number or {"param": name} from the parameters, validated"""
+        if isinstance(value, dict) and set(value) == {"param"}:
+            name = value["param"]
+            if name not in self.parameters:
+                raise ValueError(f"{path}: unknown parameter {name!r}")
+            value = self.parameters[name]
+
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not np.isfinite(value):
+            raise ValueError(f"{path}: expected a number")
+        if integer:
+            if value != int(value):
+                raise ValueError(f"{path}: expected a whole number")
+            value = int(value)
+        if minimum is not None and value < minimum:
+            raise ValueError(f"{path}: must be at least {minimum}")
+        return value
+
+
+def compile_rules(rules: Dict[str, Any], parameters: Optional[Dict[str, Any]] = None) -> RuleProgram:
+    """
+    Compile a builder rule tree
+
+    Args:
+        rules: Tree with an "entry" condition and optionally an "exit"
+            condition and a "not_in_position" flag
+        parameters: Values for {"param": name} references
+
+    Returns:
+        RuleProgram evaluating the tree
+
+    Raises:
+        ValueError: If the tree is malformed; the message names the
+            offending part, e.g. "entry.all[1].right: unknown indicator 'smaa'"
+    """
+    if not isinstance(rules, dict) or "entry" not in rules:
+        raise ValueError("Rules need an entry condition")
+    unknown = sorted(set(rules) - {"entry", "exit", "not_in_position"})
+    if unknown:
+        raise ValueError(f"Unknown rule keys: {', '.join(unknown)}")
+
+    compiler = _Compiler(parameters or {})
+    entry = compiler.condition(rules["entry"], "entry")
+    exit = compiler.condition(rules["exit"], "exit") if rules.get("exit") is not None else None
+
+    nodes, (entry, exit) = _prune(compiler.nodes, (entry, exit))
+    return RuleProgram(nodes, entry, exit, bool(rules.get("not_in_position", False)))
+
+
+def _prune(nodes: List[Node], roots: Tuple[Optional[int], ...]) -> Tuple[List[Node], Tuple[Optional[int], ...]]:
+    """Drop nodes the roots do not depend on (left behind by simplification), renumbering the rest"""
+    used = set(r for r in roots if r is not None)
+    for index in range(len(nodes) - 1, -1, -1):
+        if index in used:
+            used.update(nodes[index].args)
+
+    renumber: Dict[int, int] = {}
+    kept = []
+    for index, node in enumerate(nodes):
+        if index in used:
+            renumber[index] = len(kept)
+            kept.append(node._replace(args=tuple(renumber[arg] for arg in node.args)))
+
+    return kept, tuple(renumber[r] if r is not None else None for r in roots)
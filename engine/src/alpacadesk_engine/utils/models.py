@@ -1,6 +1,6 @@
 """Database models"""
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import json
@@ -94,6 +94,9 @@ class BacktestResult(Base):
     # Equity curve (stored as JSON)
     equity_curve = Column(Text, nullable=False)
 
+    # BacktestProfile of a profiled run (stored as JSON)
+    profile = Column(Text, nullable=True)
+
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationship
@@ -107,6 +110,61 @@ class BacktestResult(Base):
         """Set equity curve as JSON"""
         self.equity_curve = json.dumps(curve_list)
 
+    def get_profile(self):
+        """Parse profile from JSON"""
+        return json.loads(self.profile) if self.profile else None
+
+    def set_profile(self, profile):
+        """Set profile as JSON"""
+        self.profile = json.dumps(profile)
+
+
+class AnalysisResult(Base):
+    """
+    Stored parameter sweep, optimization and walk-forward results
+    """
+    __tablename__ = "analysis_results"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String, nullable=False)  # sweep, optimize or walk_forward
+    strategy_type = Column(String, nullable=False)
+    symbols = Column(Text, nullable=False)  # JSON array
+    start_date = Column(DateTime, nullable=False)
+    end_date = Column(DateTime, nullable=False)
+    initial_capital = Column(Float, nullable=False)
+
+    # Fixed strategy parameters and analysis settings, e.g. param_grid (stored as JSON)
+    parameters = Column(Text, nullable=False)
+    options = Column(Text, nullable=False)
+
+    # Response payload of the analysis (stored as JSON)
+    result = Column(Text, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def get_result_dict(self):
+        """Parse result from JSON"""
+        return json.loads(self.result)
+
+    def set_result_dict(self, result):
+        """Set result as JSON"""
+        self.result = json.dumps(result)
+
+
+class BacktestCacheEntry(Base):
+    """
+    Cached backtest output keyed by a hash of its inputs
+    """
+    __tablename__ = "backtest_cache"
+
+    key = Column(String, primary_key=True)  # SHA-256 of strategy, parameters, data, settings
+    payload = Column(LargeBinary, nullable=False)  # zlib-compressed JSON
+    size_bytes = Column(Integer, nullable=False)
+    hits = Column(Integer, default=0)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, index=True)
+
 
 class Order(Base):
     """
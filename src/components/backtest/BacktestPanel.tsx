@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 import { backtestService } from '../../services/backtestService';
-import { BacktestRequest, BacktestResult } from '../../types';
+import { BacktestProgress, BacktestRequest, BacktestResult } from '../../types';
 import EquityChart from '../charts/EquityChart';
 import './BacktestPanel.css';
 
@@ -18,6 +18,7 @@ const BacktestPanel: React.FC = () => {
   const [initialCapital, setInitialCapital] = useState(100000);
 
   const [result, setResult] = useState<BacktestResult | null>(null);
+  const [progress, setProgress] = useState<BacktestProgress | null>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
 
@@ -25,6 +26,7 @@ const BacktestPanel: React.FC = () => {
     setError('');
     setLoading(true);
     setResult(null);
+    setProgress(null);
 
     try {
       const symbolsArray = symbols.split(',').map((s) => s.trim());
@@ -38,12 +40,13 @@ const BacktestPanel: React.FC = () => {
         initialCapital,
       };
 
-      const backtestResult = await backtestService.runBacktest(request);
+      const backtestResult = await backtestService.runBacktestWithProgress(request, setProgress);
       setResult(backtestResult);
     } catch (err: any) {
       setError(err.message || 'Backtest failed');
     } finally {
       setLoading(false);
+      setProgress(null);
     }
   };
 
@@ -143,9 +146,39 @@ const BacktestPanel: React.FC = () => {
           >
             {loading ? 'Running Backtest...' : 'Run Backtest'}
           </button>
+
+          {loading && progress && (
+            <div className="backtest-progress">
+              <div className="progress-bar">
+                <div className="progress-fill" style={{ width: `${progress.percent}%` }} />
+              </div>
+              <div className="progress-stats">
+                {progress.percent.toFixed(0)}% · {progress.date?.split('T')[0]} · Return{' '}
+                {progress.total_return.toFixed(2)}% · Drawdown {progress.max_drawdown.toFixed(2)}% ·{' '}
+                {progress.total_trades} trades
+              </div>
+            </div>
+          )}
         </div>
       </div>
 
+      {loading && progress && progress.equity_curve.length > 1 && (
+        <div className="equity-chart-container card">
+          <div className="card-header">Equity Curve (in progress)</div>
+          <div className="card-body">
+            <EquityChart
+              data={progress.equity_curve.map((point) => ({
+                date: point.date,
+                equity: point.equity,
+                profitLoss: point.equity - initialCapital,
+                profitLossPct: ((point.equity - initialCapital) / initialCapital) * 100,
+              }))}
+              height={400}
+            />
+          </div>
+        </div>
+      )}
+
       {result && (
         <div className="backtest-results">
           <div className="metrics-grid">
@@ -1,5 +1,12 @@
 import axios from 'axios';
-import { BacktestRequest, BacktestResult } from '../types';
+import {
+  BacktestProgress,
+  BacktestRequest,
+  BacktestResult,
+  EquityPage,
+  MonteCarloRequest,
+  MonteCarloResult,
+} from '../types';
 
 const API_BASE_URL = 'http://localhost:8765';
 
@@ -13,6 +20,88 @@ class BacktestService {
     }
   }
 
+  async runMonteCarlo(request: MonteCarloRequest): Promise<MonteCarloResult> {
+    try {
+      const response = await axios.post(`${API_BASE_URL}/api/backtest/monte-carlo`, request);
+      return response.data;
+    } catch (error: any) {
+      throw new Error(error.response?.data?.detail || 'Failed to run Monte Carlo analysis');
+    }
+  }
+
+  async runBacktestWithProgress(
+    request: BacktestRequest,
+    onProgress: (progress: BacktestProgress) => void
+  ): Promise<BacktestResult> {
+    const jobId = await this.submitBacktest(request);
+    const status = await this.streamBacktest(jobId, onProgress);
+
+    if (status !== 'completed') {
+      throw new Error(`Backtest ${status}`);
+    }
+
+    return this.getJobResult(jobId);
+  }
+
+  async submitBacktest(request: BacktestRequest): Promise<string> {
+    try {
+      const response = await axios.post(`${API_BASE_URL}/api/backtest/jobs`, request);
+      return response.data.job_id;
+    } catch (error: any) {
+      throw new Error(error.response?.data?.detail || 'Failed to submit backtest');
+    }
+  }
+
+  streamBacktest(jobId: string, onProgress: (progress: BacktestProgress) => void): Promise<string> {
+    // Resolves with the final job status once the server closes the stream
+    return new Promise((resolve, reject) => {
+      const ws = new WebSocket(`${API_BASE_URL.replace(/^http/, 'ws')}/api/backtest/jobs/${jobId}/ws`);
+
+      ws.onmessage = (event) => {
+        const message = JSON.parse(event.data);
+        if (message.type === 'progress') {
+          onProgress(message);
+        } else if (message.type === 'error') {
+          reject(new Error(message.message));
+        } else {
+          resolve(message.type);
+        }
+      };
+      ws.onerror = () => reject(new Error('Lost connection to backtest progress stream'));
+    });
+  }
+
+  async getJobResult(jobId: string, maxPoints?: number): Promise<BacktestResult> {
+    try {
+      const response = await axios.get(`${API_BASE_URL}/api/backtest/jobs/${jobId}/result`, {
+        params: { max_points: maxPoints },
+      });
+      return response.data;
+    } catch (error: any) {
+      throw new Error(error.response?.data?.detail || 'Failed to get backtest result');
+    }
+  }
+
+  async getJobEquity(jobId: string, offset = 0, limit = 5000): Promise<EquityPage> {
+    // Full-resolution equity curve, one page at a time
+    try {
+      const response = await axios.get(`${API_BASE_URL}/api/backtest/jobs/${jobId}/equity`, {
+        params: { offset, limit },
+      });
+      return response.data;
+    } catch (error: any) {
+      throw new Error(error.response?.data?.detail || 'Failed to get equity curve');
+    }
+  }
+
+  async cancelBacktest(jobId: string): Promise<void> {
+    try {
+      await axios.post(`${API_BASE_URL}/api/backtest/jobs/${jobId}/cancel`);
+    } catch (error: any) {
+      throw new Error(error.response?.data?.detail || 'Failed to cancel backtest');
+    }
+  }
+
   async getTemplates(): Promise<any> {
     try {
       const response = await axios.get(`${API_BASE_URL}/api/backtest/templates`);
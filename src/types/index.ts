@@ -57,6 +57,43 @@ export interface BacktestRequest {
   startDate: string;
   endDate: string;
   initialCapital?: number;
+  timeframe?: '1day' | '1min' | '5min' | '15min' | '1hour';
+  profile?: boolean;
+  max_points?: number | null;  // Equity points returned (default 5000, null for every point)
+}
+
+export interface MonteCarloRequest extends BacktestRequest {
+  resamples?: number;
+  blockSize?: number;
+  seed?: number;
+}
+
+// Monte Carlo distributions from /api/backtest/monte-carlo (wire field names)
+export interface MonteCarloDistribution {
+  mean: number;
+  std: number;
+  p5: number;
+  p25: number;
+  median: number;
+  p75: number;
+  p95: number;
+}
+
+export interface MonteCarloSummary {
+  method: 'trades' | 'block_bootstrap';
+  resamples: number;
+  path_length: number;
+  block_size: number | null;
+  total_return: MonteCarloDistribution;
+  max_drawdown: MonteCarloDistribution;
+  sharpe_ratio: MonteCarloDistribution;
+  probability_of_loss: number;
+}
+
+export interface MonteCarloResult {
+  metrics: Record<string, number>;
+  trades: MonteCarloSummary | null;
+  block_bootstrap: MonteCarloSummary | null;
 }
 
 export interface BacktestResult {
@@ -74,6 +111,31 @@ export interface BacktestResult {
   maxConsecutiveWins: number;
   maxConsecutiveLosses: number;
   equityCurve: EquityPoint[];
+  equityPoints: number;  // Points in the full-resolution curve
+  profile?: BacktestProfile | null;
+}
+
+// Page of a full-resolution equity curve from /api/backtest/jobs/{jobId}/equity (wire field names)
+export interface EquityPage {
+  total: number;
+  offset: number;
+  limit: number;
+  equity_curve: EquityPoint[];
+}
+
+// Engine phase profile of a run requested with profile: true (wire field names)
+export interface PhaseStats {
+  calls: number;
+  seconds: number;
+  allocated_bytes: number;
+}
+
+export interface BacktestProfile {
+  total_seconds: number;
+  other_seconds: number;
+  phases: Record<string, PhaseStats>;
+  strategies: Record<string, Record<string, PhaseStats>>;
+  peak_traced_bytes: number | null;
 }
 
 export interface EquityPoint {
@@ -83,6 +145,22 @@ export interface EquityPoint {
   profitLossPct: number;
 }
 
+// Progress message streamed from /api/backtest/jobs/{jobId}/ws (wire field names)
+export interface BacktestProgress {
+  type: 'progress';
+  job_id: string;
+  percent: number;
+  day: number;
+  total_days: number;
+  date: string | null;
+  equity: number;
+  total_return: number;
+  max_drawdown: number;
+  total_trades: number;
+  win_rate: number;
+  equity_curve: { date: string; equity: number }[];
+}
+
 export interface PortfolioHistory {
   timestamp: number[];
   equity: number[];